@@ -1,5 +1,11 @@
+import numpy as np
 import pandas as pd
 from signal_generator import SignalGenerator
+from signal_reasons import reason_text
+from trade_log import TradeLog
+
+NANOSECONDS_PER_DAY = 86_400_000_000_000
+TRADING_DAYS_PER_YEAR = 242  # IDX sessions per year, for annualising daily figures
 
 class Backtester:
     def __init__(self, initial_capital=10000000, entry_level_confidence = 65):
@@ -7,156 +13,182 @@ class Backtester:
         self.entry_level_confidence = entry_level_confidence
         self.signal_generator = SignalGenerator()
     
-    def run_backtest(self, data):
-        # ... (Initialization and setup remains the same) ...
-        capital = self.initial_capital
-        position = 0
-        entry_price = 0
-        entry_date = None
-        entry_confidence = 0
-        trades = []
-
-        max_hold_days = 10
-        take_profit_pct = 3.0
-        stop_loss_pct = 1.5
-
+    def run_backtest(self, data, take_profit_pct=3.0, stop_loss_pct=1.5, max_hold_days=10, signals=None):
         # Note: Starting index changed to 100 for proper indicator calc (53 is too low for SMA100, etc.)
         start_index = 100 
         if len(data) < start_index: return [], self.initial_capital
-        
+
+        # Signals for every bar computed once; bar i trades on the signal of bar i-1 (no lookahead)
+        if signals is None:
+            signals = self.signal_generator.generate_signals(data)
+
+        return self.simulate_fixed_exits(
+            data, signals, take_profit_pct, stop_loss_pct, max_hold_days, self.entry_level_confidence
+        )[0]
+
+    def simulate_fixed_exits(self, data, signals, take_profit_pct, stop_loss_pct, max_hold_days, entry_level_confidence,
+                             start_index=100):
+        """
+        Fixed-percentage exit backtest over precomputed generate_signals arrays.
+        Every parameter may be a scalar or a list; lists are simulated side by side,
+        one configuration per element, in a single pass over the bars.
+        Returns a list of (TradeLog, final_capital), one per configuration.
+        """
+        take_profit_pct, stop_loss_pct, max_hold_days, entry_level_confidence = (
+            np.broadcast_arrays(*[np.atleast_1d(np.asarray(p, dtype=object))
+                                  for p in (take_profit_pct, stop_loss_pct, max_hold_days, entry_level_confidence)]))
+        # Keep the plain Python values for exit-reason text, float arrays for the maths
+        tp_labels, sl_labels, hold_labels = take_profit_pct.tolist(), stop_loss_pct.tolist(), max_hold_days.tolist()
+        tp = take_profit_pct.astype(float)
+        sl = stop_loss_pct.astype(float)
+        hold_limit = max_hold_days.astype(float)
+        entry_threshold = entry_level_confidence.astype(float)
+        configs = len(tp)
+
+        if len(data) < start_index:
+            return [(TradeLog(), self.initial_capital) for _ in range(configs)]
+
+        dates = data.index.tolist()  # Timestamps for the trade log (cheaper to index than the DatetimeIndex)
+        # Nanosecond stamps, so hold time is (exit - entry) // 1 day exactly like Timedelta.days
+        stamps = data.index.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        opens = data['Open'].to_numpy(dtype=float)
+        closes = data['Close'].to_numpy(dtype=float)
+        signal, confidence = signals['signal'], signals['confidence']
+
+        capital = np.full(configs, float(self.initial_capital))
+        position = np.zeros(configs, dtype=np.int64)
+        entry_price = np.zeros(configs)
+        entry_bar = np.zeros(configs, dtype=np.int64)
+        entry_confidence = np.zeros(configs, dtype=np.int64)
+        trades = [TradeLog() for _ in range(configs)]
+
         # Using the correct starting index for stability (was 53, changed to 100)
-        for i in range(start_index, len(data)): 
+        for i in range(start_index, len(data)):
             # Signal is based on previous close data
-            past_data = data.iloc[:i] 
-            current_date = data.index[i]
-            current_open = data['Open'].iloc[i]
-            current_close = data['Close'].iloc[i]
-
-            # === Generate signal (no lookahead) ===
-            signal, reason, confidence, _, indicator_values = self.signal_generator.generate_signal(past_data)
+            prev = i - 1
+            current_close = closes[i]
 
             # === EXIT LOGIC ===
-            if position > 0:
-                take_profit_price = entry_price * (1 + take_profit_pct / 100)
-                stop_loss_price = entry_price * (1 - stop_loss_pct / 100)
-
-                exit_trade = False
-                exit_reason = ""
-                
-                # --- Primary C-to-C Exits ---
-                if current_close >= take_profit_price:
-                    exit_trade = True
-                    exit_reason = f"Take Profit ({take_profit_pct}%)"
-                elif current_close <= stop_loss_price:
-                    exit_trade = True
-                    exit_reason = f"Stop Loss ({stop_loss_pct}%)"
-                elif (current_date - entry_date).days >= max_hold_days:
-                    exit_trade = True
-                    exit_reason = f"Max Hold ({max_hold_days} days)"
-                # --- Bearish Signal Exit (CHANGE IS HERE: 60 -> 50) ---
-                elif signal == "SELL" and confidence >= 50: 
-                    exit_trade = True
-                    exit_reason = "Bearish signal exit (Aggressive 50%)"
-
-                if exit_trade:
-                    exit_price = current_close
-                    pnl = (exit_price - entry_price) * position
-                    pnl_pct = (exit_price - entry_price) / entry_price * 100
-
-                    trades.append({
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'shares': position,
-                        'pnl': pnl,
-                        'pnl_pct': pnl_pct,
-                        'type': 'LONG',
-                        'exit_reason': exit_reason,
-                        'hold_days': (current_date - entry_date).days,
-                        'entry_confidence': entry_confidence,
-                        'entry_signal': reason
-                    })
-
-                    capital += pnl
-                    position = 0
-                    entry_price = 0
-                    entry_date = None
-                    entry_confidence = 0
+            holding = position > 0
+            if holding.any():
+                take_profit_price = entry_price * (1 + tp / 100)
+                stop_loss_price = entry_price * (1 - sl / 100)
+
+                # --- Primary C-to-C Exits, then the bearish signal exit (60 -> 50) ---
+                hit_take_profit = holding & (current_close >= take_profit_price)
+                hit_stop_loss = holding & ~hit_take_profit & (current_close <= stop_loss_price)
+                hit_max_hold = holding & ~hit_take_profit & ~hit_stop_loss & ((stamps[i] - stamps[entry_bar]) // NANOSECONDS_PER_DAY >= hold_limit)
+                bearish_exit = signal[prev] == "SELL" and confidence[prev] >= 50
+                hit_signal = holding & ~hit_take_profit & ~hit_stop_loss & ~hit_max_hold & bearish_exit
+
+                exiting = np.flatnonzero(hit_take_profit | hit_stop_loss | hit_max_hold | hit_signal)
+                if len(exiting):
+                    # Every configuration exiting on this bar logs the same signal reason
+                    entry_signal = reason_text(signal[prev], signals['buy_confidence'][prev], signals['sell_confidence'][prev],
+                                               signals['reason_codes'][prev], signals['rsi'][prev])
+                for k in exiting:
+                    if hit_take_profit[k]:
+                        exit_reason = f"Take Profit ({tp_labels[k]}%)"
+                    elif hit_stop_loss[k]:
+                        exit_reason = f"Stop Loss ({sl_labels[k]}%)"
+                    elif hit_max_hold[k]:
+                        exit_reason = f"Max Hold ({hold_labels[k]} days)"
+                    else:
+                        exit_reason = "Bearish signal exit (Aggressive 50%)"
+
+                    pnl = self._record_trade(trades[k], dates, entry_bar[k], i, entry_price[k], current_close,
+                                             position[k], entry_confidence[k], exit_reason, entry_signal)
+                    capital[k] += pnl
+                    position[k] = 0
+                    entry_price[k] = 0
+                    entry_confidence[k] = 0
 
             # === ENTRY LOGIC ===
-            if position == 0 and signal == "BUY" and confidence >= self.entry_level_confidence:
-                if confidence >= 75:
-                    position_size = 0.8
-                else:
-                    position_size = 0.6
-
-                max_shares = int((capital * position_size) / current_open)
-                if max_shares > 0:
-                    position = max_shares
-                    entry_price = current_open  # Execute at next open
-                    entry_date = current_date
-                    entry_confidence = confidence
+            if signal[prev] == "BUY":
+                entering = (position == 0) & (confidence[prev] >= entry_threshold)
+                if entering.any():
+                    position_size = 0.8 if confidence[prev] >= 75 else 0.6
+                    max_shares = np.floor((capital * position_size) / opens[i]).astype(np.int64)
+                    entering &= max_shares > 0
+                    position[entering] = max_shares[entering]
+                    entry_price[entering] = opens[i]  # Execute at next open
+                    entry_bar[entering] = i
+                    entry_confidence[entering] = confidence[prev]
 
         # Close open positions at end (same as original logic)
-        if position > 0:
-            exit_price = data['Close'].iloc[-1]
-            pnl = (exit_price - entry_price) * position
-            pnl_pct = (exit_price - entry_price) / entry_price * 100
-
-            trades.append({
-                'entry_date': entry_date,
-                'exit_date': data.index[-1],
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'shares': position,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'type': 'LONG',
-                'exit_reason': 'End of backtest period',
-                'hold_days': (data.index[-1] - entry_date).days,
-                'entry_confidence': entry_confidence,
-                'entry_signal': 'Forced exit'
-            })
-
-            capital += pnl
+        last = len(data) - 1
+        for k in np.flatnonzero(position > 0):
+            capital[k] += self._record_trade(trades[k], dates, entry_bar[k], last, entry_price[k], closes[last],
+                                             position[k], entry_confidence[k], 'End of backtest period', 'Forced exit')
 
-        return trades, capital
+        return [(trades[k], capital[k]) for k in range(configs)]
+
+    def _record_trade(self, trades, dates, entry_bar, exit_bar, entry_price, exit_price, shares,
+                      entry_confidence, exit_reason, entry_signal, **extra):
+        """Append one closed LONG trade to a TradeLog; returns its P&L"""
+        entry_date = dates[entry_bar]
+        exit_date = dates[exit_bar]
+        pnl = (exit_price - entry_price) * shares
+
+        trades.append(
+            entry_date=entry_date,
+            exit_date=exit_date,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            shares=shares,
+            pnl=pnl,
+            pnl_pct=(exit_price - entry_price) / entry_price * 100,
+            type='LONG',
+            exit_reason=exit_reason,
+            hold_days=(exit_date - entry_date).days,
+            entry_confidence=entry_confidence,
+            entry_signal=entry_signal,
+            **extra
+        )
+        return pnl
 
     
-    def calculate_performance(self, trades):
-        if not trades:
+    def calculate_performance(self, trades, equity=None):
+        """
+        Trade statistics; with the equity_curve of the same backtest the
+        calculate_risk_metrics figures are included too
+        """
+        if not len(trades):
             return {}
         
-        df_trades = pd.DataFrame(trades)
-        winning_trades = df_trades[df_trades['pnl'] > 0]
-        losing_trades = df_trades[df_trades['pnl'] < 0]
-        breakeven_trades = df_trades[df_trades['pnl'] == 0]
-        
-        total_trades = len(df_trades)
-        win_rate = len(winning_trades) / total_trades * 100 if total_trades > 0 else 0
-        total_pnl = df_trades['pnl'].sum()
-        
+        # Whole columns of the trade log (a list of trade dicts is converted once)
+        trades = TradeLog.from_records(trades)
+        pnl = trades.column('pnl')
+        pnl_pct = trades.column('pnl_pct')
+        hold_days = trades.column('hold_days')
+        entry_confidence = trades.column('entry_confidence')
+        winning = pnl > 0
+        losing = pnl < 0
+
+        total_trades = len(trades)
+        win_rate = winning.sum() / total_trades * 100 if total_trades > 0 else 0
+        total_pnl = pnl.sum()
+
         # Calculate additional metrics
-        avg_win = winning_trades['pnl_pct'].mean() if len(winning_trades) > 0 else 0
-        avg_loss = losing_trades['pnl_pct'].mean() if len(losing_trades) > 0 else 0
-        avg_hold_days = df_trades['hold_days'].mean() if total_trades > 0 else 0
-        
-        profit_factor = abs(winning_trades['pnl'].sum() / losing_trades['pnl'].sum()) if len(losing_trades) > 0 else float('inf')
-        
+        avg_win = pnl_pct[winning].mean() if winning.any() else 0
+        avg_loss = pnl_pct[losing].mean() if losing.any() else 0
+        avg_hold_days = hold_days.mean() if total_trades > 0 else 0
+
+        profit_factor = abs(pnl[winning].sum() / pnl[losing].sum()) if losing.any() else float('inf')
+
         # Calculate max drawdown
-        cumulative_pnl = df_trades['pnl'].cumsum()
-        running_max = cumulative_pnl.cummax()
+        cumulative_pnl = pnl.cumsum()
+        running_max = np.maximum.accumulate(cumulative_pnl)
         drawdown = (cumulative_pnl - running_max)
-        max_drawdown = abs(drawdown.min()) if not drawdown.empty else 0
-        
+        max_drawdown = abs(drawdown.min()) if len(drawdown) else 0
+
         # Exit reason analysis
-        exit_reasons = df_trades['exit_reason'].value_counts()
-        
+        exit_reasons = pd.Series(trades.column('exit_reason')).value_counts()
+
         # Confidence analysis
-        high_confidence_trades = df_trades[df_trades['entry_confidence'] >= 70]
-        high_confidence_win_rate = len(high_confidence_trades[high_confidence_trades['pnl'] > 0]) / len(high_confidence_trades) * 100 if len(high_confidence_trades) > 0 else 0
-        
+        high_confidence = entry_confidence >= 70
+        high_confidence_win_rate = (winning & high_confidence).sum() / high_confidence.sum() * 100 if high_confidence.any() else 0
+
         return {
             'total_trades': total_trades,
             'win_rate': win_rate,
@@ -166,171 +198,243 @@ class Backtester:
             'avg_win_pct': avg_win,
             'avg_loss_pct': avg_loss,
             'profit_factor': profit_factor,
-            'best_trade_pct': df_trades['pnl_pct'].max() if total_trades > 0 else 0,
-            'worst_trade_pct': df_trades['pnl_pct'].min() if total_trades > 0 else 0,
+            'best_trade_pct': pnl_pct.max() if total_trades > 0 else 0,
+            'worst_trade_pct': pnl_pct.min() if total_trades > 0 else 0,
             'max_drawdown': max_drawdown,
             'max_drawdown_pct': (max_drawdown / self.initial_capital) * 100,
             'avg_hold_days': avg_hold_days,
-            'avg_confidence': df_trades['entry_confidence'].mean() if total_trades > 0 else 0,
+            'avg_confidence': entry_confidence.mean() if total_trades > 0 else 0,
             'high_confidence_win_rate': high_confidence_win_rate,
             'exit_reasons': exit_reasons.to_dict(),
-            'winning_trades_count': len(winning_trades),
-            'losing_trades_count': len(losing_trades),
-            'breakeven_trades_count': len(breakeven_trades)
+            'winning_trades_count': int(winning.sum()),
+            'losing_trades_count': int(losing.sum()),
+            'breakeven_trades_count': int(total_trades - winning.sum() - losing.sum()),
+            **(self.calculate_risk_metrics(equity) if equity is not None else {})
+        }
+
+    def equity_curve(self, data, trades):
+        """
+        Daily mark-to-market equity of a backtest on data: initial capital plus realized P&L
+        plus open positions marked at each close. Built with difference arrays and cumulative
+        sums (a trade holds from its entry bar until its exit bar), so no per-bar loop.
+        Returns a DataFrame indexed like data with 'equity', 'shares' held after the close
+        and 'exposure' (position value / equity).
+        """
+        trades = TradeLog.from_records(trades)
+        n = len(data)
+        entry_bar = data.index.get_indexer(trades.column('entry_date'))
+        exit_bar = data.index.get_indexer(trades.column('exit_date'))
+        # get_indexer gives -1 for a date data doesn't have; np.add.at would book it on the last bar
+        missing = (entry_bar < 0) | (exit_bar < 0)
+        if missing.any():
+            raise ValueError(f"{int(missing.sum())} trade(s) enter or exit on dates not in data "
+                             f"(trade log from a different or sliced frame?)")
+        shares = trades.column('shares').astype(float)
+        cost = shares * trades.column('entry_price')
+
+        # +at entry / -at exit, summed up: shares and cost basis held at every bar
+        shares_delta = np.zeros(n + 1)
+        cost_delta = np.zeros(n + 1)
+        realized = np.zeros(n)
+        np.add.at(shares_delta, entry_bar, shares)
+        np.add.at(shares_delta, exit_bar, -shares)
+        np.add.at(cost_delta, entry_bar, cost)
+        np.add.at(cost_delta, exit_bar, -cost)
+        np.add.at(realized, exit_bar, trades.column('pnl'))
+        held_shares = np.cumsum(shares_delta[:n])
+        held_cost = np.cumsum(cost_delta[:n])
+
+        position_value = held_shares * data['Close'].to_numpy(dtype=float)
+        equity = self.initial_capital + np.cumsum(realized) + position_value - held_cost
+        return pd.DataFrame({
+            'equity': equity,
+            'shares': held_shares.round().astype(np.int64),
+            'exposure': position_value / equity
+        }, index=data.index)
+
+    @staticmethod
+    def calculate_risk_metrics(equity, risk_free_rate=0.0):
+        """
+        Risk figures from an equity_curve DataFrame (one row per session): mark-to-market
+        drawdown depth and duration, annualised volatility, Sharpe and Sortino ratios
+        (risk_free_rate is annual) and the share of sessions with a position open
+        """
+        values = equity['equity'].to_numpy(dtype=float)
+        if len(values) < 2:
+            return {}
+
+        returns = values[1:] / values[:-1] - 1
+        excess = returns - risk_free_rate / TRADING_DAYS_PER_YEAR
+        annualise = np.sqrt(TRADING_DAYS_PER_YEAR)
+        volatility = returns.std(ddof=1)
+        downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2))
+
+        running_max = np.maximum.accumulate(values)
+        drawdown = values / running_max - 1
+        # Sessions since the last equity high, at every bar
+        bars = np.arange(len(values))
+        since_peak = bars - np.maximum.accumulate(np.where(drawdown == 0, bars, 0))
+
+        return {
+            'equity_max_drawdown_pct': -drawdown.min() * 100,
+            'max_drawdown_duration': int(since_peak.max()),
+            'volatility_pct': volatility * annualise * 100,
+            'sharpe_ratio': excess.mean() / volatility * annualise if volatility > 0 else 0,
+            'sortino_ratio': excess.mean() / downside * annualise if downside > 0 else 0,
+            'time_in_market_pct': np.mean(equity['exposure'].to_numpy() > 0) * 100
         }
     
-    def run_backtest_dynamic_stop(self, data):
+    def run_backtest_dynamic_stop(self, data, signals=None, frame=None, max_hold_days=10):
+        """
+        Backtest with indicator-based exits (calculate_dynamic_stop_loss / _take_profit).
+        Signals and exit levels are precomputed arrays, so the loop runs once per trade:
+        each trade scans the bars up to its max-hold date for the first exit at once.
+        Trades match running generate_signal and the scalar exit methods on every prefix.
+        """
+        start_index = 52  # Start from 52 for Ichimoku
         capital = self.initial_capital
-        position = 0
-        entry_price = 0
-        entry_date = None
-        entry_confidence = 0
-        trades = []
-        
-        # DAILY DATA PARAMETERS
-        max_hold_days = 10  # 10-day max hold for daily data
-        
-        for i in range(52, len(data)):  # Start from 52 for Ichimoku
-            current_data = data.iloc[:i+1]
-            current_date = data.index[i]
-            current_price = data['Close'].iloc[i]
-            
-            # Generate signal
-            signal, reason, confidence, _, indicator_values = self.signal_generator.generate_signal(current_data)
-            
-            # EXIT LOGIC: For daily data with dynamic stops AND take profits
-            if position > 0:
-                current_pnl_pct = (current_price - entry_price) / entry_price * 100
-                
-                # DYNAMIC STOP LOSS AND TAKE PROFIT FROM INDICATORS
-                stop_loss_price = self.calculate_dynamic_stop_loss(entry_price, current_price, indicator_values)
-                take_profit_1, take_profit_2, take_profit_3 = self.calculate_dynamic_take_profit(entry_price, indicator_values)
-                
-                exit_trade = False
-                exit_reason = ""
-                exit_target = ""
-                
-                # Exit conditions for daily data with multiple take profit targets
-                if current_price >= take_profit_3:
-                    exit_trade = True
-                    exit_reason = "Take Profit Target 3"
-                    exit_target = "3"
-                elif current_price >= take_profit_2:
-                    exit_trade = True
-                    exit_reason = "Take Profit Target 2"
-                    exit_target = "2"
-                elif current_price >= take_profit_1:
-                    exit_trade = True
-                    exit_reason = "Take Profit Target 1"
-                    exit_target = "1"
-                elif current_price <= stop_loss_price:
-                    # Calculate actual stop loss percentage for reporting
-                    actual_stop_pct = (stop_loss_price - entry_price) / entry_price * 100
-                    exit_trade = True
-                    exit_reason = f"Dynamic Stop Loss ({actual_stop_pct:.1f}%)"
-                    exit_target = "SL"
-                elif (current_date - entry_date).days >= max_hold_days:
-                    exit_trade = True
-                    exit_reason = f"Max Hold ({max_hold_days} days)"
-                    exit_target = "TIME"
-                
-                # Optional: Exit if signal turns bearish (for daily data)
-                hold_days = (current_date - entry_date).days
-                if hold_days >= 1 and signal == "SELL" and confidence >= 60:
-                    exit_trade = True
-                    exit_reason = "Bearish signal exit"
-                    exit_target = "SIGNAL"
-                
-                if exit_trade:
-                    exit_price = current_price
-                    pnl = (exit_price - entry_price) * position
-                    pnl_pct = (exit_price - entry_price) / entry_price * 100
-                    
-                    # Calculate which take profit target was hit
-                    tp_pct_hit = 0
-                    if exit_target == "1":
-                        tp_pct_hit = (take_profit_1 - entry_price) / entry_price * 100
-                    elif exit_target == "2":
-                        tp_pct_hit = (take_profit_2 - entry_price) / entry_price * 100
-                    elif exit_target == "3":
-                        tp_pct_hit = (take_profit_3 - entry_price) / entry_price * 100
-                    
-                    trade = {
-                        'entry_date': entry_date,
-                        'exit_date': current_date,
-                        'entry_price': entry_price,
-                        'exit_price': exit_price,
-                        'shares': position,
-                        'pnl': pnl,
-                        'pnl_pct': pnl_pct,
-                        'type': 'LONG',
-                        'exit_reason': exit_reason,
-                        'exit_target': exit_target,
-                        'target_pct': tp_pct_hit,
-                        'hold_days': (current_date - entry_date).days,
-                        'entry_confidence': entry_confidence,
-                        'entry_signal': reason,
-                        'stop_loss_used': stop_loss_price,
-                        'take_profit_1': take_profit_1,
-                        'take_profit_2': take_profit_2,
-                        'take_profit_3': take_profit_3
-                    }
-                    trades.append(trade)
-                    
-                    capital += pnl
-                    position = 0
-                    entry_price = 0
-                    entry_date = None
-                    entry_confidence = 0
-            
-            # ENTRY LOGIC: Only enter if no position and BUY signal with configurable confidence
-            if position == 0 and signal == "BUY" and confidence >= self.entry_level_confidence:
-                # Position sizing based on signal strength
-                if confidence >= 75:
-                    position_size = 0.8  # 80% for high confidence
-                elif confidence >= self.entry_level_confidence:
-                    position_size = 0.6  # 60% for base confidence level
-                else:
-                    continue  # Skip if below entry_level_confidence
-                
-                max_shares = int((capital * position_size) / current_price)
-                
-                if max_shares > 0:
-                    position = max_shares
-                    entry_price = current_price
-                    entry_date = current_date
-                    entry_confidence = confidence
-                    # Store entry details
-                    # print(f"📈 ENTRY: {current_date.strftime('%Y-%m-%d')} | Price: {current_price:,.0f} | Confidence: {confidence}% | Required: {self.entry_level_confidence}%")
-        
-        # Close any open position at the end of backtest period
-        if position > 0:
-            exit_price = data['Close'].iloc[-1]
-            pnl = (exit_price - entry_price) * position
-            pnl_pct = (exit_price - entry_price) / entry_price * 100
-            
-            trade = {
-                'entry_date': entry_date,
-                'exit_date': data.index[-1],
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'shares': position,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct,
-                'type': 'LONG',
-                'exit_reason': 'End of backtest period',
-                'exit_target': 'FORCED',
-                'target_pct': 0,
-                'hold_days': (data.index[-1] - entry_date).days,
-                'entry_confidence': entry_confidence,
-                'entry_signal': 'Forced exit'
-            }
-            trades.append(trade)
-            
-            capital += pnl
-        
+        trades = TradeLog({'exit_target': object, 'target_pct': float, 'stop_loss_used': float,
+                           'take_profit_1': float, 'take_profit_2': float, 'take_profit_3': float})
+        n = len(data)
+        if n <= start_index:
+            return trades, capital
+
+        if frame is None:
+            frame = self.signal_generator.registry.get(data, 'indicator_frame')
+        if signals is None:
+            signals = self.signal_generator.generate_signals(data, frame=frame)
+
+        dates = data.index.tolist()
+        stamps = data.index.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        closes = data['Close'].to_numpy(dtype=float)
+        signal, confidence = signals['signal'], signals['confidence']
+        is_bearish = (signal == "SELL") & (confidence >= 60)
+        # ENTRY LOGIC: BUY signal with configurable confidence, filled at that bar's close
+        entry_bars = np.flatnonzero((signal == "BUY") & (confidence >= self.entry_level_confidence))
+        entry_bars = entry_bars[entry_bars >= start_index]
+
+        i = start_index
+        while True:
+            # Next bar (this one included: a bar can exit and re-enter) with an entry signal and affordable shares
+            k = np.searchsorted(entry_bars, i)
+            entry_bar = None
+            for candidate in entry_bars[k:]:
+                candidate_confidence = confidence[candidate]
+                # Position sizing based on signal strength: 80% for high confidence, 60% for base level
+                position_size = 0.8 if candidate_confidence >= 75 else 0.6
+                shares = int((capital * position_size) / closes[candidate])
+                if shares > 0:
+                    entry_bar = candidate
+                    break
+            if entry_bar is None:
+                break
+
+            entry_price = closes[entry_bar]
+            entry_confidence = confidence[entry_bar]
+            # Max hold forces an exit on the first bar max_hold_days after entry, so no bar past it matters
+            last_bar = min(np.searchsorted(stamps, stamps[entry_bar] + max_hold_days * NANOSECONDS_PER_DAY), n - 1)
+            bars = slice(entry_bar + 1, last_bar + 1)
+            window_closes = closes[bars]
+            held_days = (stamps[bars] - stamps[entry_bar]) // NANOSECONDS_PER_DAY
+
+            # DYNAMIC STOP LOSS AND TAKE PROFIT FROM INDICATORS
+            stop_loss, take_profit_1, take_profit_2, take_profit_3 = self.dynamic_exit_levels(frame, entry_price, bars)
+            hit_tp3 = window_closes >= take_profit_3
+            hit_tp2 = window_closes >= take_profit_2
+            hit_tp1 = window_closes >= take_profit_1
+            hit_stop = window_closes <= stop_loss
+            hit_time = held_days >= max_hold_days
+            # Bearish signal exit (for daily data) overrides every other exit reason
+            hit_signal = (held_days >= 1) & is_bearish[bars]
+            exits = np.flatnonzero(hit_tp3 | hit_tp2 | hit_tp1 | hit_stop | hit_time | hit_signal)
+
+            if not len(exits):
+                # Close any open position at the end of backtest period
+                capital += self._record_trade(trades, dates, entry_bar, n - 1, entry_price, closes[-1], shares,
+                                              entry_confidence, 'End of backtest period', 'Forced exit',
+                                              exit_target='FORCED', target_pct=0)
+                break
+
+            j = exits[0]
+            exit_bar = entry_bar + 1 + j
+            targets = {"1": take_profit_1[j], "2": take_profit_2[j], "3": take_profit_3[j]}
+            if hit_signal[j]:
+                exit_reason, exit_target = "Bearish signal exit", "SIGNAL"
+            elif hit_tp3[j]:
+                exit_reason, exit_target = "Take Profit Target 3", "3"
+            elif hit_tp2[j]:
+                exit_reason, exit_target = "Take Profit Target 2", "2"
+            elif hit_tp1[j]:
+                exit_reason, exit_target = "Take Profit Target 1", "1"
+            elif hit_stop[j]:
+                # Calculate actual stop loss percentage for reporting
+                actual_stop_pct = (stop_loss[j] - entry_price) / entry_price * 100
+                exit_reason, exit_target = f"Dynamic Stop Loss ({actual_stop_pct:.1f}%)", "SL"
+            else:
+                exit_reason, exit_target = f"Max Hold ({max_hold_days} days)", "TIME"
+
+            # Calculate which take profit target was hit
+            tp_pct_hit = (targets[exit_target] - entry_price) / entry_price * 100 if exit_target in targets else 0
+            entry_signal = reason_text(signal[exit_bar], signals['buy_confidence'][exit_bar],
+                                       signals['sell_confidence'][exit_bar], signals['reason_codes'][exit_bar],
+                                       signals['rsi'][exit_bar])
+            capital += self._record_trade(trades, dates, entry_bar, exit_bar, entry_price, closes[exit_bar], shares,
+                                          entry_confidence, exit_reason, entry_signal,
+                                          exit_target=exit_target, target_pct=tp_pct_hit,
+                                          stop_loss_used=stop_loss[j], take_profit_1=take_profit_1[j],
+                                          take_profit_2=take_profit_2[j], take_profit_3=take_profit_3[j])
+            i = exit_bar
+
         return trades, capital
 
+    def dynamic_exit_levels(self, frame, entry_price, bars=slice(None)):
+        """
+        calculate_dynamic_stop_loss and calculate_dynamic_take_profit for every bar of an
+        IndicatorFrame (or the `bars` slice of it) at once, for a position opened at entry_price.
+        Returns (stop_loss, take_profit_1, take_profit_2, take_profit_3) arrays.
+        """
+        def level(name):
+            return frame.array(name)[bars]
+
+        fib_levels = np.column_stack([level(f'fib_{int(fib*1000)}') for fib in frame.FIB_LEVELS])
+        atr = level('atr')
+
+        with np.errstate(invalid='ignore'):
+            # ===== STOP LOSS: lowest candidate (inf = candidate missing), clamped to 2-8% below entry =====
+            def strongest_below(values):
+                # Highest level under entry (ignores NaN/0 like the scalar truthiness checks)
+                values = np.where((values > 0) & (values < entry_price), values, -np.inf)
+                return values.max(axis=1)
+
+            bb_support, volume_support = level('bb_support'), level('volume_support')
+            ma_support = strongest_below(np.column_stack([level(name) for name in ['sma_20', 'sma_50', 'ema_20', 'ema_50']]))
+            fib_support = strongest_below(fib_levels)
+            stop_loss_candidates = np.column_stack([
+                np.where(bb_support > 0, bb_support * 0.995, np.inf),
+                np.where(volume_support > 0, volume_support * 0.995, np.inf),
+                np.where(ma_support > -np.inf, ma_support * 0.99, np.inf),
+                np.where(atr > 0, entry_price - (atr * 1.5), np.inf),
+                np.where(fib_support > -np.inf, fib_support * 0.995, np.inf)
+            ])
+            # No candidate leaves inf, which the clamp turns into the 2% fallback stop
+            stop_loss = np.minimum(np.maximum(stop_loss_candidates.min(axis=1), entry_price * 0.92), entry_price * 0.98)
+
+            # ===== TAKE PROFIT: three nearest resistances above entry blended with volatility targets =====
+            resistance_levels = np.column_stack([level('bb_resistance'), level('volume_resistance'),
+                                                 level('cloud_top'), fib_levels])
+            resistance_levels = np.sort(np.where(resistance_levels > entry_price, resistance_levels, np.inf), axis=1)[:, :3]
+            atr_ratio = (atr / entry_price)[:, None]
+            # Base profit percentages based on volatility (high / medium / low)
+            base_targets = np.select([atr_ratio > 0.03, atr_ratio > 0.015],
+                                     [np.array([0.04, 0.07, 0.10]), np.array([0.03, 0.05, 0.08])],
+                                     np.array([0.02, 0.04, 0.06]))
+            blended_pct = ((resistance_levels - entry_price) / entry_price + base_targets) / 2
+            take_profits = np.where(np.isfinite(resistance_levels), entry_price * (1 + blended_pct),
+                                    entry_price * (1 + base_targets))
+            take_profits = np.minimum(take_profits, entry_price * 1.15)  # Max 15% target
+
+        return stop_loss, take_profits[:, 0], take_profits[:, 1], take_profits[:, 2]
+
     def calculate_dynamic_stop_loss(self, entry_price, current_price, indicator_values):
         """Calculate dynamic stop loss based on multiple indicators"""
         stop_loss_candidates = []
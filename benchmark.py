@@ -0,0 +1,189 @@
+"""
+Benchmarks for the indicator, signal, backtest and chart paths on seeded synthetic
+IDX data (synthetic_data.generate_ohlcv: IDX tick grid, auto-rejection limits, 100-share lots).
+
+    python benchmark.py                                  # default scales
+    python benchmark.py --scales 1x1 100x5 1000x20       # tickers x years
+    python benchmark.py --output after.json --compare before.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from synthetic_data import generate_ohlcv, symbol_seed
+from technical_indicators import TechnicalIndicators
+from volume_profile import VolumeProfileCalculator
+from signal_generator import SignalGenerator
+from backtester import Backtester
+from indicator_registry import default_registry
+
+SESSIONS_PER_YEAR = 242
+DEFAULT_SCALES = ['1x1', '10x2', '100x5', '1000x20']
+# Chart rendering costs about the same per ticker at any history length, so a few tickers are enough
+CHART_TICKERS = 5
+
+def build_universe(tickers, years, seed=0, end='2025-12-31'):
+    """Seeded synthetic universe of `tickers` series, `years` of sessions each"""
+    bars = years * SESSIONS_PER_YEAR
+    universe = {}
+    for k in range(tickers):
+        symbol = f'SYN{k:04d}'
+        start_price = [150, 480, 1800, 4500, 9000][k % 5]
+        universe[symbol] = generate_ohlcv(bars, start_price=start_price, seed=symbol_seed(symbol, seed), end=end)
+    return universe
+
+def benchmark_cases(chart_dir):
+    """(name, setup(data) -> args, run(*args), max_tickers) for every benchmarked path"""
+    signal_gen = SignalGenerator()
+    backtester = Backtester(entry_level_confidence=50)
+
+    def fresh(data):
+        # New frame object per call, so the shared indicator registry can't serve cached results
+        default_registry.clear()
+        return (data.copy(),)
+
+    def trading_plan_args(data):
+        return ("BUY", data['Close'].iloc[-1], signal_gen.generate_signal(data).indicator_values)
+
+    def chart_args(data):
+        # Imported here: matplotlib/prettytable are only needed for the chart cases
+        from report_generator import ReportGenerator
+        trades, _ = backtester.run_backtest(data)
+        default_registry.clear()
+        return (ReportGenerator(), trades)
+
+    cases = [
+        ('TechnicalIndicators.calculate_rsi', fresh, TechnicalIndicators.calculate_rsi, None),
+        ('TechnicalIndicators.calculate_sma', fresh, lambda data: TechnicalIndicators.calculate_sma(data, 50), None),
+        ('TechnicalIndicators.calculate_ema', fresh, lambda data: TechnicalIndicators.calculate_ema(data, 50), None),
+        ('TechnicalIndicators.calculate_macd', fresh, TechnicalIndicators.calculate_macd, None),
+        ('TechnicalIndicators.calculate_stochastic', fresh, TechnicalIndicators.calculate_stochastic, None),
+        ('TechnicalIndicators.calculate_atr', fresh, TechnicalIndicators.calculate_atr, None),
+        ('TechnicalIndicators.calculate_atr_series', fresh, TechnicalIndicators.calculate_atr_series, None),
+        ('TechnicalIndicators.calculate_fibonacci_levels', fresh, TechnicalIndicators.calculate_fibonacci_levels, None),
+        ('TechnicalIndicators.calculate_ichimoku_cloud', fresh, TechnicalIndicators.calculate_ichimoku_cloud, None),
+        ('TechnicalIndicators.calculate_ichimoku_series', fresh, TechnicalIndicators.calculate_ichimoku_series, None),
+        ('TechnicalIndicators.calculate_adx', fresh, TechnicalIndicators.calculate_adx, None),
+        ('VolumeProfileCalculator.calculate_volume_profile', fresh, VolumeProfileCalculator.calculate_volume_profile, None),
+        ('SignalGenerator.generate_signal', fresh, signal_gen.generate_signal, None),
+        ('SignalGenerator.generate_trading_plan', trading_plan_args, signal_gen.generate_trading_plan, None),
+        ('Backtester.run_backtest', fresh, backtester.run_backtest, None),
+        ('Backtester.run_backtest_dynamic_stop', fresh, backtester.run_backtest_dynamic_stop, None),
+        ('ReportGenerator.generate_pnl_graph', chart_args,
+         lambda report_gen, trades: report_gen.generate_pnl_graph(trades, 'SYN', save_path=chart_dir), CHART_TICKERS),
+        ('ReportGenerator.generate_simple_pnl_graph', chart_args,
+         lambda report_gen, trades: report_gen.generate_simple_pnl_graph(trades, 'SYN', save_path=chart_dir), CHART_TICKERS),
+    ]
+    return cases
+
+def run_case(setup, run, universe, max_tickers=None):
+    """
+    Total and per-ticker wall time of run over the universe (setup is not timed), and the
+    peak traced memory of one call (tracemalloc slows code down, so it gets its own pass)
+    """
+    datasets = list(universe.values())[:max_tickers]
+    seconds = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for data in datasets:
+            args = setup(data)
+            started = time.perf_counter()
+            run(*args)
+            seconds += time.perf_counter() - started
+
+        args = setup(datasets[0])
+        tracemalloc.start()
+        run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'tickers': len(datasets),
+        'seconds': seconds,
+        'per_ticker_ms': seconds / len(datasets) * 1000,
+        'peak_memory_mb': peak / 2 ** 20
+    }
+
+def parse_scale(scale):
+    tickers, years = scale.lower().split('x')
+    return int(tickers), int(years)
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+    }
+
+def run_benchmarks(scales, cases_filter=None, seed=0):
+    chart_dir = tempfile.mkdtemp(prefix='idx_benchmark_charts_')
+    results = []
+    try:
+        cases = benchmark_cases(chart_dir)
+        if cases_filter:
+            cases = [case for case in cases if any(text in case[0] for text in cases_filter)]
+        for scale in scales:
+            tickers, years = parse_scale(scale)
+            started = time.perf_counter()
+            universe = build_universe(tickers, years, seed)
+            print(f"📦 {scale}: {tickers} tickers x {years}y ({years * SESSIONS_PER_YEAR} bars) "
+                  f"generated in {time.perf_counter() - started:.1f}s")
+            for name, setup, run, max_tickers in cases:
+                result = run_case(setup, run, universe, max_tickers)
+                result.update({'scale': scale, 'case': name, 'bars': years * SESSIONS_PER_YEAR})
+                results.append(result)
+                print(f"   {name:<50} {result['per_ticker_ms']:>10.2f} ms/ticker "
+                      f"{result['seconds']:>9.2f}s total {result['peak_memory_mb']:>8.1f} MB peak")
+    finally:
+        shutil.rmtree(chart_dir, ignore_errors=True)
+    return results
+
+def compare(results, baseline):
+    """Print per-ticker time and peak memory against a previous JSON run"""
+    previous = {(r['scale'], r['case']): r for r in baseline['results']}
+    print(f"\n📊 Compared with {baseline['environment'].get('commit')} ({baseline['environment'].get('timestamp')}):")
+    for result in results:
+        before = previous.get((result['scale'], result['case']))
+        if before is None:
+            continue
+        speedup = before['per_ticker_ms'] / result['per_ticker_ms'] if result['per_ticker_ms'] else float('inf')
+        print(f"   {result['scale']:<8} {result['case']:<50} {speedup:>6.2f}x faster | "
+              f"memory {before['peak_memory_mb']:.1f} -> {result['peak_memory_mb']:.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicator, signal, backtest and chart paths")
+    parser.add_argument('--scales', nargs='+', default=DEFAULT_SCALES, help="TICKERSxYEARS, e.g. 1x1 100x5")
+    parser.add_argument('--cases', nargs='+', help="Only run cases whose name contains one of these")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    parser.add_argument('--compare', help="Previous JSON output to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.cases, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'seed': args.seed, 'results': results}, f, indent=2)
+    print(f"\n✅ Results saved: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
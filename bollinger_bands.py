@@ -33,9 +33,14 @@ class BollingerBandsCalculator:
         return current_lower, current_upper, current_middle
     
     @staticmethod
-    def calculate_bollinger_squeeze(data, window=20, num_std=2):
-        """Detect Bollinger Band Squeeze (low volatility period)"""
-        lower, upper, middle = BollingerBandsCalculator.calculate_bollinger_bands(data, window, num_std)
+    def calculate_bollinger_squeeze(data, window=20, num_std=2, bands=None):
+        """
+        Detect Bollinger Band Squeeze (low volatility period)
+        bands: (lower, upper, middle) already computed for data, to skip recalculating them
+        """
+        if bands is None:
+            bands = BollingerBandsCalculator.calculate_bollinger_bands(data, window, num_std)
+        lower, upper, middle = bands
         
         if not all([lower, upper, middle]):
             return False
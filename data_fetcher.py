@@ -1,42 +1,125 @@
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
+from data_providers import YFinanceProvider
 
 class DataFetcher:
+    # Provider used when fetch_stock_data is not given one (see data_providers)
+    default_provider = YFinanceProvider()
+
     @staticmethod
-    def fetch_stock_data(stock_code, period="2y"):
-        """Fetch stock data for Indonesian stocks with comprehensive parameters"""
+    def fetch_stock_data(stock_code, period="2y", cache=None, provider=None):
+        """
+        Fetch stock data for Indonesian stocks with comprehensive parameters.
+        With an OHLCVCache only the bars after the last cached date are downloaded
+        and the requested period is served from the cache.
+        """
         if not stock_code.endswith('.JK'):
             stock_code += '.JK'
+        provider = provider or DataFetcher.default_provider
+
+        if cache is not None and provider.cacheable:
+            return DataFetcher._fetch_cached(stock_code, period, cache, provider)
         
         try:
-            # Download with all explicit parameters to avoid warnings
-            stock_data = yf.download(
-                tickers=stock_code,
-                period=period,
-                interval="1d",
-                auto_adjust=True,       # Adjusted for splits and dividends
-                prepost=False,          # No pre/post market data
-                repair=True,            # Fix common data errors
-                keepna=False,           # Remove NA values
-                progress=False,
-                actions=True,           # Include dividends and splits
-                threads=True,           # Use threading for faster download
-                proxy=None              # No proxy
-            )
-            
-            # Ensure we have the basic OHLCV columns
-            if stock_data.empty:
-                raise Exception(f"No data returned for {stock_code}")
-                
-            # Rename columns if they have multi-index (common in newer yfinance)
-            if isinstance(stock_data.columns, pd.MultiIndex):
-                stock_data.columns = stock_data.columns.droplevel(1)
-            
-            return stock_data
-            
+            return provider.fetch(stock_code, period=period)
         except Exception as e:
             raise Exception(f"Failed to fetch data for {stock_code}: {str(e)}")
+
+    @staticmethod
+    def _fetch_cached(stock_code, period, cache, provider):
+        """Serve period from the cache, downloading only what it is missing"""
+        cached = cache.load(stock_code)
+
+        try:
+            if cached is None or cached.empty or not cache.covers(stock_code, period):
+                # Cache can't serve this period yet: one full download, then deltas from here on
+                new_data = provider.fetch(stock_code, period=period)
+                cached = cache.append(stock_code, new_data, covered_from=cache.period_start(period))
+            else:
+                # Overlap a settled cached bar (and the last one, it may have been a partial session)
+                start = cache.delta_start(cached)
+                new_data = provider.fetch(stock_code, start=start.strftime('%Y-%m-%d'))
+                if cache.adjustment_changed(cached, new_data):
+                    # A split/dividend re-adjusted the history: replace it instead of mixing bases
+                    cached = provider.fetch(stock_code, period=period).sort_index()
+                    cache.save(stock_code, cached, covered_from=cache.period_start(period))
+                else:
+                    cached = cache.append(stock_code, new_data)
+        except Exception as e:
+            if cached is None or cached.empty:
+                raise Exception(f"Failed to fetch data for {stock_code}: {str(e)}")
+            print(f"⚠️  Warning: could not update {stock_code} ({str(e)}), using cached data")
+
+        return cache.slice_period(cached, period)
+    
+    @staticmethod
+    def fetch_many(stock_codes, period="2y", chunk_size=50, cache=None, provider=None):
+        """
+        Fetch a whole universe with one batched request per chunk of tickers.
+        Returns ({stock_code: data}, {stock_code: error message}); a failing ticker
+        is reported in the second dict instead of aborting the batch.
+        """
+        provider = provider or DataFetcher.default_provider
+        symbols = {code: code if code.endswith('.JK') else code + '.JK' for code in stock_codes}
+        use_cache = cache is not None and provider.cacheable
+
+        # Split tickers into "needs the full period" and "only needs new bars"
+        full_download, cached_data = [], {}
+        for symbol in symbols.values():
+            cached = cache.load(symbol) if use_cache else None
+            if cached is not None and not cached.empty and cache.covers(symbol, period):
+                cached_data[symbol] = cached
+            else:
+                full_download.append(symbol)
+
+        results, errors = {}, {}
+        for chunk in DataFetcher._chunks(full_download, chunk_size):
+            frames, failures = provider.fetch_many(chunk, period=period)
+            errors.update(failures)
+            for symbol, data in frames.items():
+                if use_cache:
+                    data = cache.append(symbol, data, covered_from=cache.period_start(period))
+                results[symbol] = data
+
+        rebased = []
+        for chunk in DataFetcher._chunks(list(cached_data), chunk_size):
+            # Start from the oldest delta start in the chunk so every ticker overlaps a settled bar
+            start = min(cache.delta_start(cached_data[symbol]) for symbol in chunk)
+            frames, failures = provider.fetch_many(chunk, start=start.strftime('%Y-%m-%d'))
+            for symbol in chunk:
+                if symbol in frames and cache.adjustment_changed(cached_data[symbol], frames[symbol]):
+                    rebased.append(symbol)
+                elif symbol in frames:
+                    results[symbol] = cache.append(symbol, frames[symbol])
+                else:
+                    print(f"⚠️  Warning: could not update {symbol} ({failures.get(symbol)}), using cached data")
+                    results[symbol] = cached_data[symbol]
+
+        # A split/dividend re-adjusted these histories: full re-download replaces the cached bars
+        for chunk in DataFetcher._chunks(rebased, chunk_size):
+            frames, failures = provider.fetch_many(chunk, period=period)
+            for symbol in chunk:
+                if symbol in frames:
+                    results[symbol] = frames[symbol].sort_index()
+                    cache.save(symbol, results[symbol], covered_from=cache.period_start(period))
+                else:
+                    print(f"⚠️  Warning: could not re-download {symbol} after a split/dividend "
+                          f"({failures.get(symbol)}), using cached data")
+                    results[symbol] = cached_data[symbol]
+
+        stock_data, failed = {}, {}
+        for code, symbol in symbols.items():
+            if symbol in results:
+                data = results[symbol]
+                stock_data[code] = cache.slice_period(data, period) if use_cache else data
+            else:
+                failed[code] = f"Failed to fetch data for {symbol}: {errors.get(symbol, 'unknown error')}"
+        return stock_data, failed
+
+    @staticmethod
+    def _chunks(items, size):
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
     
     @staticmethod
     def validate_data(stock_data, stock_code):
@@ -0,0 +1,193 @@
+import os
+from abc import ABC, abstractmethod
+import pandas as pd
+from ohlcv_cache import OHLCVCache
+from synthetic_data import generate_ohlcv, symbol_seed
+
+try:
+    import yfinance as yf
+except ImportError:  # Offline / air-gapped nodes only use the file or synthetic providers
+    yf = None
+
+class DataProvider(ABC):
+    """
+    Source of daily OHLCV frames. fetch() takes either a yfinance-style period
+    ('1y', '2y', 'max', ...) or a start date and returns a DataFrame indexed by
+    date with at least Open/High/Low/Close/Volume columns.
+    """
+    # Whether DataFetcher should keep an OHLCVCache of this source (remote sources only)
+    cacheable = False
+
+    @abstractmethod
+    def fetch(self, symbol, period=None, start=None):
+        """Daily OHLCV frame of symbol for a yfinance-style period or from a start date"""
+
+    def fetch_many(self, symbols, period=None, start=None):
+        """
+        Fetch several symbols; returns ({symbol: frame}, {symbol: error message}).
+        One failing symbol never aborts the rest. Sources that support batched
+        requests override this.
+        """
+        frames, failures = {}, {}
+        for symbol in symbols:
+            try:
+                frames[symbol] = self.fetch(symbol, period=period, start=start)
+            except Exception as e:
+                failures[symbol] = str(e)
+        return frames, failures
+
+    @staticmethod
+    def _restrict(data, period=None, start=None):
+        """Trim a full history to period/start the same way yfinance would"""
+        if start is not None:
+            start = pd.Timestamp(start)
+            if data.index.tz is not None:
+                start = start.tz_localize(data.index.tz)
+            return data[data.index >= start]
+        if period is not None:
+            return OHLCVCache.slice_period(data, period)
+        return data
+
+
+class YFinanceProvider(DataProvider):
+    """Live Yahoo Finance download (the original DataFetcher behaviour)"""
+    cacheable = True
+
+    def fetch(self, symbol, period=None, start=None):
+        if yf is None:
+            raise Exception("yfinance is not installed; use LocalFileProvider or SyntheticProvider")
+
+        date_range = {'start': start} if start is not None else {'period': period or '2y'}
+
+        # Download with all explicit parameters to avoid warnings
+        stock_data = yf.download(
+            tickers=symbol,
+            interval="1d",
+            auto_adjust=True,       # Adjusted for splits and dividends
+            prepost=False,          # No pre/post market data
+            repair=True,            # Fix common data errors
+            keepna=False,           # Remove NA values
+            progress=False,
+            actions=True,           # Include dividends and splits
+            threads=True,           # Use threading for faster download
+            proxy=None,             # No proxy
+            **date_range
+        )
+        
+        # Ensure we have the basic OHLCV columns
+        if stock_data.empty:
+            raise Exception(f"No data returned for {symbol}")
+            
+        # Rename columns if they have multi-index (common in newer yfinance)
+        if isinstance(stock_data.columns, pd.MultiIndex):
+            stock_data.columns = stock_data.columns.droplevel(1)
+        
+        return stock_data
+
+    def fetch_many(self, symbols, period=None, start=None):
+        """One batched yf.download for all symbols, split into per-ticker frames"""
+        if yf is None:
+            raise Exception("yfinance is not installed; use LocalFileProvider or SyntheticProvider")
+        if len(symbols) == 1:
+            return super().fetch_many(symbols, period, start)
+
+        date_range = {'start': start} if start is not None else {'period': period or '2y'}
+        try:
+            batch = yf.download(
+                tickers=list(symbols),
+                interval="1d",
+                auto_adjust=True,
+                prepost=False,
+                repair=True,
+                keepna=False,
+                progress=False,
+                actions=True,
+                threads=True,
+                proxy=None,
+                group_by='ticker',      # Columns become (ticker, field)
+                **date_range
+            )
+        except Exception as e:
+            return {}, {symbol: str(e) for symbol in symbols}
+
+        frames, failures = {}, {}
+        available = set(batch.columns.get_level_values(0)) if isinstance(batch.columns, pd.MultiIndex) else set()
+        for symbol in symbols:
+            if symbol not in available:
+                failures[symbol] = f"No data returned for {symbol}"
+                continue
+            # Tickers trade on different days; drop the rows that only exist for the others
+            stock_data = batch[symbol].dropna(how='all')
+            if stock_data.empty:
+                failures[symbol] = f"No data returned for {symbol}"
+            else:
+                frames[symbol] = stock_data
+        return frames, failures
+
+
+class LocalFileProvider(DataProvider):
+    """
+    Reads <directory>/<symbol>.parquet or <symbol>.csv (with or without the .JK
+    suffix), e.g. a nightly data drop copied onto an offline node.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _find(self, symbol):
+        names = [symbol]
+        if symbol.endswith('.JK'):
+            names.append(symbol[:-3])
+        for name in names:
+            for extension in ('parquet', 'csv'):
+                path = os.path.join(self.directory, f"{name}.{extension}")
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def fetch(self, symbol, period=None, start=None):
+        path = self._find(symbol)
+        if path is None:
+            raise Exception(f"No local data file for {symbol} in {self.directory}")
+
+        if path.endswith('.parquet'):
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_csv(path, index_col=0, parse_dates=True)
+
+        data = self._restrict(data.sort_index(), period, start)
+        if data.empty:
+            raise Exception(f"No data returned for {symbol}")
+        return data
+
+
+class SyntheticProvider(DataProvider):
+    """Deterministic IDX-like random data for network-free runs and benchmarks"""
+    def __init__(self, seed=0, history_bars=2600, end=None, start_price=None):
+        self.seed = seed
+        self.history_bars = history_bars
+        self.end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end).normalize()
+        self.start_price = start_price
+
+    def fetch(self, symbol, period=None, start=None):
+        seed = symbol_seed(symbol, self.seed)
+        start_price = self.start_price or 200 + seed % 9800
+        data = generate_ohlcv(self.history_bars, start_price=start_price, seed=seed, end=self.end)
+        data = self._restrict(data, period, start)
+        if data.empty:
+            raise Exception(f"No data returned for {symbol}")
+        return data
+
+
+def provider_from_spec(spec):
+    """
+    Build a provider from a short spec string, e.g. for an environment variable:
+    'yfinance', 'local:/data/idx_drop' or 'synthetic' / 'synthetic:42'.
+    """
+    name, _, argument = (spec or 'yfinance').partition(':')
+    if name == 'yfinance':
+        return YFinanceProvider()
+    if name == 'local':
+        return LocalFileProvider(argument)
+    if name == 'synthetic':
+        return SyntheticProvider(seed=int(argument) if argument else 0)
+    raise ValueError(f"Unknown data provider: {spec}")
@@ -0,0 +1,523 @@
+"""
+Differential checks of the fast paths against the reference implementation.
+
+The reference is the bar-by-bar code every fast path replaced: generate_signal run on
+each prefix data.iloc[:i+1], and the original run_backtest / run_backtest_dynamic_stop
+loops fed with those per-prefix signals. IndicatorFrame, generate_signals,
+generate_signal_live, the streaming indicators, PanelIndicators and the precomputed-
+signal backtests are compared with it value by value (indicator values, signals,
+confidences, reason text and codes, trades). The full-history fast paths are also
+recomputed on truncated histories: a value at bar i that changes when the bars after i
+are dropped is a lookahead leak.
+
+    python equivalence_check.py                                # synthetic datasets
+    python equivalence_check.py --datasets 8 --bars 600
+    python equivalence_check.py --data-dir /data/idx_drop      # recorded CSV/Parquet files too
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from numbers import Number
+import numpy as np
+from synthetic_data import generate_ohlcv, symbol_seed
+from data_providers import LocalFileProvider
+from indicator_registry import IndicatorRegistry
+from indicator_frame import IndicatorFrame
+from signal_generator import SignalGenerator
+from signal_reasons import reason_text, reason_conditions
+from volume_profile import VolumeProfileCalculator
+from backtester import Backtester
+from panel_indicators import build_panel, PanelCompaction, PanelIndicators
+from streaming_indicators import (StreamingSMA, StreamingEMA, StreamingRSI, StreamingMACD, StreamingStochastic,
+                                  StreamingATR, StreamingBollinger, StreamingIchimoku)
+
+# Bin widths the rolling volume profile's lookahead check runs with
+VOLUME_PROFILE_TICKS_PER_BIN = (1, 3)
+
+CHECKS = ['indicator_frame', 'signals', 'live', 'streaming', 'panel', 'backtest', 'lookahead']
+# (rtol, atol) per check. Fast paths reorder float sums (rolling windows, Welford variance,
+# EMA recursions), so values agree to rounding rather than bit for bit. Variance-based
+# values get more room (streaming, and the panel's PANEL_STD_FIELDS)
+TOLERANCES = {
+    'indicator_frame': (1e-9, 1e-9),
+    'signals': (0, 0),
+    'live': (1e-9, 1e-9),
+    'streaming': (1e-7, 1e-7),
+    'panel': (1e-9, 1e-9),
+    'backtest': (1e-9, 1e-6),
+    'lookahead': (0, 0),
+}
+# generate_signal_live drops EMA history: its EMA/MACD values may differ by tolerance x price
+LIVE_EMA_FIELDS = ('ema_5', 'ema_10', 'ema_20', 'ema_50', 'macd', 'macd_signal', 'macd_histogram')
+# Panel fields built on a rolling std, and their rtol: pandas' online rolling std leaves
+# ~1e-8 x price of residue where the exact std is 0 (flat stretches)
+PANEL_STD_FIELDS = ('bb_support', 'bb_resistance', 'bb_squeeze')
+PANEL_STD_RTOL = 1e-7
+
+def _missing(value):
+    """None and NaN both mean "not available" to the signal rules"""
+    return value is None or (isinstance(value, (float, np.floating)) and math.isnan(value))
+
+def _same(reference, fast, rtol, atol):
+    if _missing(reference) or _missing(fast):
+        return _missing(reference) and _missing(fast)
+    numeric = (Number, np.number, np.bool_)
+    if not isinstance(reference, numeric) or not isinstance(fast, numeric):
+        return reference == fast
+    reference, fast = float(reference), float(fast)
+    if math.isinf(reference) or math.isinf(fast):
+        return reference == fast
+    return abs(reference - fast) <= atol + rtol * abs(reference)
+
+def _flatten(values, prefix=''):
+    """Nested indicator_values dict as {'ichimoku.tenkan_sen': ..., 'fib_levels.fib_236': ...}"""
+    flat = {}
+    for name, value in values.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{prefix}{name}.'))
+        else:
+            flat[f'{prefix}{name}'] = value
+    return flat
+
+
+class DifferentialReport:
+    """Comparison and mismatch counts per check, with the first few mismatches of each"""
+    def __init__(self, examples=5):
+        self.examples = examples
+        self.compared = Counter()
+        self.mismatches = Counter()
+        self.samples = defaultdict(list)
+
+    def _mismatch(self, check, dataset, where, reference, fast):
+        self.mismatches[check] += 1
+        if len(self.samples[check]) < self.examples:
+            self.samples[check].append(f"{dataset} {where}: reference={reference!r} fast={fast!r}")
+
+    def compare(self, check, dataset, where, reference, fast, rtol=None, atol=None):
+        default_rtol, default_atol = TOLERANCES[check]
+        rtol = default_rtol if rtol is None else rtol
+        atol = default_atol if atol is None else atol
+        self.compared[check] += 1
+        if _same(reference, fast, rtol, atol):
+            return True
+        self._mismatch(check, dataset, where, reference, fast)
+        return False
+
+    def compare_values(self, check, dataset, where, reference, fast, atol_overrides=None):
+        """Every key of two indicator_values dicts (nested dicts flattened)"""
+        reference, fast = _flatten(reference), _flatten(fast)
+        atol_overrides = atol_overrides or {}
+        for name in reference.keys() | fast.keys():
+            if name not in reference or name not in fast:
+                self._mismatch(check, dataset, f"{where} {name}", reference.get(name, '<absent>'),
+                               fast.get(name, '<absent>'))
+                self.compared[check] += 1
+                continue
+            self.compare(check, dataset, f"{where} {name}", reference[name], fast[name],
+                         atol=atol_overrides.get(name))
+
+    def compare_arrays(self, check, dataset, name, reference, fast, rtol=None):
+        """Element-wise comparison of two equally long columns; reports the first differing position"""
+        default_rtol, atol = TOLERANCES[check]
+        rtol = default_rtol if rtol is None else rtol
+        reference, fast = np.asarray(reference), np.asarray(fast)
+        if reference.dtype.kind in 'fiub' and fast.dtype.kind in 'fiub':
+            reference, fast = reference.astype(float), fast.astype(float)
+            both_missing = np.isnan(reference) & np.isnan(fast)
+            with np.errstate(invalid='ignore'):
+                same = both_missing | (reference == fast) | (np.abs(reference - fast) <= atol + rtol * np.abs(reference))
+        else:
+            same = reference == fast
+        self.compared[check] += len(reference)
+        different = np.flatnonzero(~same)
+        if len(different):
+            first = different[0]
+            self.mismatches[check] += len(different) - 1
+            self._mismatch(check, dataset, f"bar {first} {name} ({len(different)} bars differ)",
+                           reference[first], fast[first])
+
+    @property
+    def passed(self):
+        return not sum(self.mismatches.values())
+
+    def print_summary(self):
+        print("\n📋 Equivalence summary:")
+        for check in CHECKS:
+            if not self.compared[check]:
+                continue
+            status = "✅" if not self.mismatches[check] else "❌"
+            print(f"   {status} {check:<16} {self.compared[check]:>10,} compared {self.mismatches[check]:>8,} mismatched")
+            for sample in self.samples[check]:
+                print(f"        {sample}")
+
+
+# ===== REFERENCE IMPLEMENTATION =====
+
+def reference_signals(signal_gen, data):
+    """
+    generate_signal(data.iloc[:i+1]) for every bar i, and the calculate_indicator_values
+    it scored ({} before bar 99; served from the registry entries generate_signal filled)
+    """
+    results, values = [], []
+    for i in range(len(data)):
+        prefix = data.iloc[:i + 1]
+        results.append(signal_gen.generate_signal(prefix))
+        values.append(signal_gen.calculate_indicator_values(prefix) if len(prefix) >= 100 else {})
+    return results, values
+
+def reference_run_backtest(backtester, data, reference, take_profit_pct=3.0, stop_loss_pct=1.5, max_hold_days=10):
+    """The original run_backtest loop; bar i trades on reference[i-1] (generate_signal of data.iloc[:i])"""
+    capital = backtester.initial_capital
+    position = 0
+    entry_price = 0
+    entry_date = None
+    entry_confidence = 0
+    trades = []
+
+    start_index = 100
+    if len(data) < start_index:
+        return trades, capital
+
+    for i in range(start_index, len(data)):
+        current_date = data.index[i]
+        current_open = data['Open'].iloc[i]
+        current_close = data['Close'].iloc[i]
+        signal, reason, confidence, _, _ = reference[i - 1]
+
+        if position > 0:
+            exit_reason = None
+            if current_close >= entry_price * (1 + take_profit_pct / 100):
+                exit_reason = f"Take Profit ({take_profit_pct}%)"
+            elif current_close <= entry_price * (1 - stop_loss_pct / 100):
+                exit_reason = f"Stop Loss ({stop_loss_pct}%)"
+            elif (current_date - entry_date).days >= max_hold_days:
+                exit_reason = f"Max Hold ({max_hold_days} days)"
+            elif signal == "SELL" and confidence >= 50:
+                exit_reason = "Bearish signal exit (Aggressive 50%)"
+
+            if exit_reason:
+                pnl = (current_close - entry_price) * position
+                trades.append({
+                    'entry_date': entry_date, 'exit_date': current_date,
+                    'entry_price': entry_price, 'exit_price': current_close, 'shares': position,
+                    'pnl': pnl, 'pnl_pct': (current_close - entry_price) / entry_price * 100, 'type': 'LONG',
+                    'exit_reason': exit_reason, 'hold_days': (current_date - entry_date).days,
+                    'entry_confidence': entry_confidence, 'entry_signal': reason
+                })
+                capital += pnl
+                position = 0
+
+        if position == 0 and signal == "BUY" and confidence >= backtester.entry_level_confidence:
+            position_size = 0.8 if confidence >= 75 else 0.6
+            max_shares = int((capital * position_size) / current_open)
+            if max_shares > 0:
+                position = max_shares
+                entry_price = current_open
+                entry_date = current_date
+                entry_confidence = confidence
+
+    if position > 0:
+        exit_price = data['Close'].iloc[-1]
+        pnl = (exit_price - entry_price) * position
+        trades.append({
+            'entry_date': entry_date, 'exit_date': data.index[-1],
+            'entry_price': entry_price, 'exit_price': exit_price, 'shares': position,
+            'pnl': pnl, 'pnl_pct': (exit_price - entry_price) / entry_price * 100, 'type': 'LONG',
+            'exit_reason': 'End of backtest period', 'hold_days': (data.index[-1] - entry_date).days,
+            'entry_confidence': entry_confidence, 'entry_signal': 'Forced exit'
+        })
+        capital += pnl
+
+    return trades, capital
+
+def reference_run_backtest_dynamic_stop(backtester, data, reference, max_hold_days=10):
+    """The original run_backtest_dynamic_stop loop; bar i uses reference[i] and the scalar exit methods"""
+    capital = backtester.initial_capital
+    position = 0
+    entry_price = 0
+    entry_date = None
+    entry_confidence = 0
+    trades = []
+
+    for i in range(52, len(data)):
+        current_date = data.index[i]
+        current_price = data['Close'].iloc[i]
+        signal, reason, confidence, _, indicator_values = reference[i]
+
+        if position > 0:
+            stop_loss_price = backtester.calculate_dynamic_stop_loss(entry_price, current_price, indicator_values)
+            take_profit_1, take_profit_2, take_profit_3 = backtester.calculate_dynamic_take_profit(
+                entry_price, indicator_values)
+
+            exit_reason, exit_target = None, ""
+            if current_price >= take_profit_3:
+                exit_reason, exit_target = "Take Profit Target 3", "3"
+            elif current_price >= take_profit_2:
+                exit_reason, exit_target = "Take Profit Target 2", "2"
+            elif current_price >= take_profit_1:
+                exit_reason, exit_target = "Take Profit Target 1", "1"
+            elif current_price <= stop_loss_price:
+                actual_stop_pct = (stop_loss_price - entry_price) / entry_price * 100
+                exit_reason, exit_target = f"Dynamic Stop Loss ({actual_stop_pct:.1f}%)", "SL"
+            elif (current_date - entry_date).days >= max_hold_days:
+                exit_reason, exit_target = f"Max Hold ({max_hold_days} days)", "TIME"
+
+            hold_days = (current_date - entry_date).days
+            if hold_days >= 1 and signal == "SELL" and confidence >= 60:
+                exit_reason, exit_target = "Bearish signal exit", "SIGNAL"
+
+            if exit_reason:
+                targets = {"1": take_profit_1, "2": take_profit_2, "3": take_profit_3}
+                pnl = (current_price - entry_price) * position
+                trades.append({
+                    'entry_date': entry_date, 'exit_date': current_date,
+                    'entry_price': entry_price, 'exit_price': current_price, 'shares': position,
+                    'pnl': pnl, 'pnl_pct': (current_price - entry_price) / entry_price * 100, 'type': 'LONG',
+                    'exit_reason': exit_reason, 'exit_target': exit_target,
+                    'target_pct': (targets[exit_target] - entry_price) / entry_price * 100 if exit_target in targets else 0,
+                    'hold_days': hold_days, 'entry_confidence': entry_confidence, 'entry_signal': reason,
+                    'stop_loss_used': stop_loss_price, 'take_profit_1': take_profit_1,
+                    'take_profit_2': take_profit_2, 'take_profit_3': take_profit_3
+                })
+                capital += pnl
+                position = 0
+
+        if position == 0 and signal == "BUY" and confidence >= backtester.entry_level_confidence:
+            position_size = 0.8 if confidence >= 75 else 0.6
+            max_shares = int((capital * position_size) / current_price)
+            if max_shares > 0:
+                position = max_shares
+                entry_price = current_price
+                entry_date = current_date
+                entry_confidence = confidence
+
+    if position > 0:
+        exit_price = data['Close'].iloc[-1]
+        pnl = (exit_price - entry_price) * position
+        trades.append({
+            'entry_date': entry_date, 'exit_date': data.index[-1],
+            'entry_price': entry_price, 'exit_price': exit_price, 'shares': position,
+            'pnl': pnl, 'pnl_pct': (exit_price - entry_price) / entry_price * 100, 'type': 'LONG',
+            'exit_reason': 'End of backtest period', 'exit_target': 'FORCED', 'target_pct': 0,
+            'hold_days': (data.index[-1] - entry_date).days,
+            'entry_confidence': entry_confidence, 'entry_signal': 'Forced exit'
+        })
+        capital += pnl
+
+    return trades, capital
+
+
+# ===== CHECKS =====
+
+def check_indicator_frame(report, name, reference_values, frame):
+    """IndicatorFrame.values_at(i) against calculate_indicator_values(data.iloc[:i+1])"""
+    for i in range(99, len(reference_values)):
+        report.compare_values('indicator_frame', name, f"bar {i}", reference_values[i], frame.values_at(i))
+
+def check_signals(report, name, reference, signals):
+    """generate_signals arrays (signal, confidence, reason codes rendered as text) against generate_signal"""
+    for i, (signal, reason, confidence, conditions, _) in enumerate(reference):
+        report.compare('signals', name, f"bar {i} signal", signal, signals['signal'][i])
+        report.compare('signals', name, f"bar {i} confidence", confidence, signals['confidence'][i])
+        codes, rsi = signals['reason_codes'][i], signals['rsi'][i]
+        report.compare('signals', name, f"bar {i} reason", reason,
+                       reason_text(signals['signal'][i], signals['buy_confidence'][i],
+                                   signals['sell_confidence'][i], codes, rsi))
+        report.compare('signals', name, f"bar {i} reason conditions", conditions, reason_conditions(codes, rsi))
+
+def check_live(report, name, data, reference, signal_gen, stride):
+    """generate_signal_live on every stride-th prefix (and the full history) against generate_signal"""
+    bars = sorted(set(range(99, len(data), stride)) | {len(data) - 1})
+    for i in bars:
+        signal, reason, confidence, conditions, values = signal_gen.generate_signal_live(data.iloc[:i + 1])
+        ref_signal, ref_reason, ref_confidence, ref_conditions, ref_values = reference[i]
+        report.compare('live', name, f"bar {i} signal", ref_signal, signal)
+        report.compare('live', name, f"bar {i} confidence", ref_confidence, confidence)
+        report.compare('live', name, f"bar {i} reason", ref_reason, reason)
+        if ref_values:
+            ema_atol = signal_gen.LIVE_EMA_TOLERANCE * data['Close'].iloc[i]
+            report.compare_values('live', name, f"bar {i}", ref_values, values,
+                                  atol_overrides={field: ema_atol for field in LIVE_EMA_FIELDS})
+
+def check_streaming(report, name, data, reference_values):
+    """Streaming indicator state fed one bar at a time against the per-prefix indicator values"""
+    sma = {window: StreamingSMA(window) for window in IndicatorFrame.SMA_WINDOWS}
+    ema = {window: StreamingEMA(window) for window in IndicatorFrame.EMA_WINDOWS}
+    rsi, macd, stochastic = StreamingRSI(), StreamingMACD(), StreamingStochastic()
+    atr, bollinger, ichimoku = StreamingATR(), StreamingBollinger(), StreamingIchimoku()
+
+    bars = zip(data['High'].to_numpy(dtype=float), data['Low'].to_numpy(dtype=float),
+               data['Close'].to_numpy(dtype=float))
+    for i, (high, low, close) in enumerate(bars):
+        values = {f'sma_{window}': state.update(close) for window, state in sma.items()}
+        values.update({f'ema_{window}': state.update(close) for window, state in ema.items()})
+        values['rsi'] = rsi.update(close)
+        values['macd'], values['macd_signal'], values['macd_histogram'] = macd.update(close)
+        values['stochastic_k'], values['stochastic_d'] = stochastic.update(high, low, close)
+        values['atr'] = atr.update(high, low, close)
+        values['bb_support'], values['bb_resistance'], values['bb_middle'] = bollinger.update(close)
+        values['bb_squeeze'] = bollinger.squeeze
+        values['ichimoku'] = ichimoku.update(high, low, close)
+
+        ref_values = reference_values[i]
+        if ref_values:
+            report.compare_values('streaming', name, f"bar {i}",
+                                  {field: ref_values[field] for field in values}, values)
+
+def check_backtests(report, name, data, reference, backtester):
+    """run_backtest and run_backtest_dynamic_stop trades against the original loops on reference signals"""
+    runs = [
+        ('run_backtest', reference_run_backtest(backtester, data, reference), backtester.run_backtest(data)),
+        ('run_backtest_dynamic_stop', reference_run_backtest_dynamic_stop(backtester, data, reference),
+         backtester.run_backtest_dynamic_stop(data)),
+    ]
+    for method, (ref_trades, ref_capital), (trades, capital) in runs:
+        report.compare('backtest', name, f"{method} trade count", len(ref_trades), len(trades))
+        for k, (ref_trade, trade) in enumerate(zip(ref_trades, trades)):
+            for field, value in ref_trade.items():
+                report.compare('backtest', name, f"{method} trade {k} {field}", value, trade.get(field))
+        report.compare('backtest', name, f"{method} final capital", ref_capital, capital)
+
+def check_panel(report, datasets, registry):
+    """PanelIndicators over the whole universe against each ticker's IndicatorFrame columns"""
+    dates, tickers, panel = build_panel(datasets)
+    high, low, close = panel['High'], panel['Low'], panel['Close']
+    compaction = PanelCompaction(close)
+    results = {f'sma_{window}': PanelIndicators.calculate_sma(close, window, compaction)
+               for window in IndicatorFrame.SMA_WINDOWS}
+    results.update({f'ema_{window}': PanelIndicators.calculate_ema(close, window, compaction)
+                    for window in IndicatorFrame.EMA_WINDOWS})
+    results['rsi'] = PanelIndicators.calculate_rsi(close, compaction=compaction)
+    results['macd'], results['macd_signal'], results['macd_histogram'] = \
+        PanelIndicators.calculate_macd(close, compaction)
+    results['stochastic_k'], results['stochastic_d'] = \
+        PanelIndicators.calculate_stochastic(high, low, close, compaction=compaction)
+    results['atr'] = np.nan_to_num(PanelIndicators.calculate_atr(high, low, close, compaction=compaction), nan=0.0)
+    lower, upper, middle = PanelIndicators.calculate_bollinger_bands(close, compaction=compaction)
+    results['bb_support'], results['bb_resistance'], results['bb_middle'] = lower, upper, middle
+    results['bb_squeeze'] = PanelIndicators.calculate_bollinger_squeeze(lower, upper, middle)
+    for component, values in PanelIndicators.calculate_ichimoku_cloud(high, low, close, compaction).items():
+        if component != 'chikou_span':  # Not causal by definition; the frame never stores it
+            results[component] = values
+
+    for j, ticker in enumerate(tickers):
+        rows = dates.isin(datasets[ticker].index)
+        frame = registry.get(datasets[ticker], 'indicator_frame')
+        for field, values in results.items():
+            report.compare_arrays('panel', ticker, field, frame.array(field), values[rows, j],
+                                  rtol=PANEL_STD_RTOL if field in PANEL_STD_FIELDS else None)
+
+def check_lookahead(report, name, data, cuts):
+    """
+    Recompute IndicatorFrame, generate_signals and the rolling volume profile series on
+    data.iloc[:cut+1]; bars up to cut must not change
+    """
+    signal_gen = SignalGenerator(registry=IndicatorRegistry())
+    full_frame = IndicatorFrame(data, registry=signal_gen.registry)
+    full_signals = signal_gen.generate_signals(data, frame=full_frame)
+    full_profiles = {ticks: VolumeProfileCalculator.calculate_volume_profile_series(data, ticks_per_bin=ticks)
+                     for ticks in VOLUME_PROFILE_TICKS_PER_BIN}
+    for cut in cuts:
+        truncated = data.iloc[:cut + 1]
+        frame = IndicatorFrame(truncated, registry=signal_gen.registry)
+        signals = signal_gen.generate_signals(truncated, frame=frame)
+        for field in frame.columns.columns:
+            report.compare_arrays('lookahead', name, f"{field} (cut at {cut})",
+                                  frame.array(field), full_frame.array(field)[:cut + 1])
+        for field, values in signals.items():
+            report.compare_arrays('lookahead', name, f"{field} (cut at {cut})",
+                                  values, full_signals[field][:cut + 1])
+        for ticks, full_profile in full_profiles.items():
+            profile = VolumeProfileCalculator.calculate_volume_profile_series(truncated, ticks_per_bin=ticks)
+            for field in profile.columns:
+                report.compare_arrays('lookahead', name, f"rolling {field} x{ticks} ticks (cut at {cut})",
+                                      profile[field].to_numpy(), full_profile[field].to_numpy()[:cut + 1])
+
+
+# ===== DATASETS =====
+
+def synthetic_datasets(count, bars, seed=0, end='2025-12-31'):
+    """
+    Seeded generate_ohlcv histories plus edge cases: a late listing (shorter history
+    on the shared calendar), a three-week suspension gap and a flat untraded stretch
+    (zero range and zero volume, the divide-by-zero paths of Stochastic and volume rules)
+    """
+    datasets = {}
+    for k in range(count):
+        symbol = f'SYN{k:02d}'
+        start_price = [150, 480, 1800, 4500, 9000][k % 5]
+        datasets[symbol] = generate_ohlcv(bars, start_price=start_price, seed=symbol_seed(symbol, seed), end=end)
+
+    base = generate_ohlcv(bars, start_price=1000, seed=symbol_seed('EDGE', seed), end=end)
+    middle = bars // 2
+    datasets['LATE_LISTING'] = base.iloc[bars // 3:]
+    datasets['SUSPENDED'] = base.drop(base.index[middle:middle + 15])
+    flat = base.copy()
+    flat.iloc[middle:middle + 20, :4] = base['Close'].iloc[middle - 1]
+    flat.iloc[middle:middle + 20, 4] = 0
+    datasets['FLAT_UNTRADED'] = flat
+    return datasets
+
+def recorded_datasets(directory):
+    """Every <symbol>.csv / <symbol>.parquet in directory, read through LocalFileProvider"""
+    provider = LocalFileProvider(directory)
+    symbols = sorted({os.path.splitext(file)[0] for file in os.listdir(directory)
+                      if file.endswith(('.csv', '.parquet'))})
+    return {symbol: provider.fetch(symbol) for symbol in symbols}
+
+
+def run_checks(datasets, checks=CHECKS, live_stride=10, lookahead_cuts=5, entry_level_confidence=50):
+    report = DifferentialReport()
+    reference_gen = SignalGenerator(registry=IndicatorRegistry())
+    signal_gen = SignalGenerator(registry=IndicatorRegistry())
+    backtester = Backtester(entry_level_confidence=entry_level_confidence)
+
+    for name, data in datasets.items():
+        started = time.perf_counter()
+        reference, reference_values = reference_signals(reference_gen, data)
+        frame = signal_gen.registry.get(data, 'indicator_frame')
+
+        if 'indicator_frame' in checks:
+            check_indicator_frame(report, name, reference_values, frame)
+        if 'signals' in checks:
+            check_signals(report, name, reference, signal_gen.generate_signals(data, frame=frame))
+        if 'live' in checks:
+            check_live(report, name, data, reference, signal_gen, live_stride)
+        if 'streaming' in checks:
+            check_streaming(report, name, data, reference_values)
+        if 'backtest' in checks:
+            check_backtests(report, name, data, reference, backtester)
+        if 'lookahead' in checks and len(data) > 100:
+            cuts = np.unique(np.linspace(99, len(data) - 2, lookahead_cuts).astype(int))
+            check_lookahead(report, name, data, cuts)
+        print(f"   {name:<16} {len(data):>5} bars checked in {time.perf_counter() - started:.1f}s")
+
+    if 'panel' in checks:
+        check_panel(report, datasets, signal_gen.registry)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the fast paths against the per-prefix reference implementation")
+    parser.add_argument('--datasets', type=int, default=4, help="Number of plain synthetic histories")
+    parser.add_argument('--bars', type=int, default=400, help="Bars per synthetic history")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help="Directory of recorded <symbol>.csv / .parquet files to check as well")
+    parser.add_argument('--checks', nargs='+', choices=CHECKS, default=CHECKS)
+    parser.add_argument('--live-stride', type=int, default=10, help="Check generate_signal_live on every Nth prefix")
+    parser.add_argument('--lookahead-cuts', type=int, default=5, help="Truncation points per dataset")
+    args = parser.parse_args()
+
+    datasets = synthetic_datasets(args.datasets, args.bars, args.seed)
+    if args.data_dir:
+        datasets.update(recorded_datasets(args.data_dir))
+
+    print(f"🔍 Checking {len(datasets)} datasets: {', '.join(args.checks)}")
+    report = run_checks(datasets, args.checks, args.live_stride, args.lookahead_cuts)
+    report.print_summary()
+    return 0 if report.passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
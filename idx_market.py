@@ -0,0 +1,78 @@
+import numpy as np
+
+# IDX price fractions (tick sizes) by price band: (lower bound, tick)
+TICK_SIZE_BANDS = [(0, 1), (200, 2), (500, 5), (2000, 10), (5000, 25)]
+
+# Auto-rejection limits (max daily move vs previous close) by price band: (lower bound, fraction)
+AUTO_REJECTION_BANDS = [(0, 0.35), (200, 0.25), (5000, 0.20)]
+
+MIN_PRICE = 50  # Lowest price on the regular board
+
+# Grid position of each band's lower bound, counting every IDX price level from 0
+_BAND_OFFSETS = np.concatenate([[0], np.cumsum([(TICK_SIZE_BANDS[i + 1][0] - lower) // tick
+                                               for i, (lower, tick) in enumerate(TICK_SIZE_BANDS[:-1])])])
+
+def tick_size(price):
+    """IDX tick size for a price (scalar or array)"""
+    price = np.asarray(price, dtype=float)
+    ticks = np.full(price.shape, TICK_SIZE_BANDS[0][1], dtype=float)
+    for lower, tick in TICK_SIZE_BANDS[1:]:
+        ticks = np.where(price >= lower, tick, ticks)
+    return ticks if ticks.ndim else float(ticks)
+
+def round_to_tick(price, direction='nearest'):
+    """Snap a price (scalar or array) onto the IDX tick grid"""
+    price = np.asarray(price, dtype=float)
+    ticks = tick_size(price)
+    if direction == 'down':
+        snapped = np.floor(price / ticks) * ticks
+    elif direction == 'up':
+        snapped = np.ceil(price / ticks) * ticks
+    else:
+        snapped = np.round(price / ticks) * ticks
+    snapped = np.maximum(snapped, MIN_PRICE)
+    return snapped if snapped.ndim else float(snapped)
+
+def auto_rejection_limit(previous_close):
+    """Max fractional daily move allowed from previous_close (scalar or array)"""
+    previous_close = np.asarray(previous_close, dtype=float)
+    limits = np.full(previous_close.shape, AUTO_REJECTION_BANDS[0][1], dtype=float)
+    for lower, limit in AUTO_REJECTION_BANDS[1:]:
+        limits = np.where(previous_close > lower, limit, limits)
+    return limits if limits.ndim else float(limits)
+
+def price_grid(low, high):
+    """Every valid IDX price between low and high (inclusive), respecting the tick bands"""
+    levels = []
+    for i, (lower, tick) in enumerate(TICK_SIZE_BANDS):
+        upper = TICK_SIZE_BANDS[i + 1][0] if i + 1 < len(TICK_SIZE_BANDS) else np.inf
+        band_low = max(low, lower)
+        band_high = min(high, upper - tick) if np.isfinite(upper) else high
+        if band_low > band_high:
+            continue
+        start = np.ceil(band_low / tick) * tick
+        levels.append(np.arange(start, band_high + tick / 2, tick))
+    return np.concatenate(levels) if levels else np.array([], dtype=float)
+
+def tick_index(price):
+    """
+    Position of a price (scalar or array) on the whole IDX price grid, counting levels
+    from 0. Prices on the grid map to whole numbers; prices between two levels fall
+    between them, so floor/ceil give the level below/above.
+    """
+    price = np.asarray(price, dtype=float)
+    band = np.searchsorted([lower for lower, _ in TICK_SIZE_BANDS], price, side='right') - 1
+    band = np.maximum(band, 0)
+    lowers = np.array([lower for lower, _ in TICK_SIZE_BANDS], dtype=float)[band]
+    ticks = np.array([tick for _, tick in TICK_SIZE_BANDS], dtype=float)[band]
+    index = _BAND_OFFSETS[band] + (price - lowers) / ticks
+    return index if index.ndim else float(index)
+
+def tick_price(index):
+    """Price of a whole grid position (scalar or array); inverse of tick_index"""
+    index = np.asarray(index, dtype=np.int64)
+    band = np.searchsorted(_BAND_OFFSETS, index, side='right') - 1
+    lowers = np.array([lower for lower, _ in TICK_SIZE_BANDS], dtype=float)[band]
+    ticks = np.array([tick for _, tick in TICK_SIZE_BANDS], dtype=float)[band]
+    price = lowers + (index - _BAND_OFFSETS[band]) * ticks
+    return price if price.ndim else float(price)
@@ -0,0 +1,216 @@
+from collections.abc import Mapping
+import pandas as pd
+import numpy as np
+from volume_profile import VolumeProfileCalculator
+from indicator_registry import default_registry, indicator
+
+class IndicatorFrame:
+    """
+    Every indicator used by SignalGenerator computed once as a full-length column.
+    Row i only depends on bars 0..i, so values_at(i) returns exactly what
+    SignalGenerator.calculate_indicator_values(data.iloc[:i+1]) would (no lookahead).
+    """
+    SMA_WINDOWS = [5, 10, 20, 50, 100]
+    EMA_WINDOWS = [5, 10, 20, 50]
+    FIB_LEVELS = [0.236, 0.382, 0.5, 0.618, 0.786]
+
+    def __init__(self, data, volume_period=20, bb_window=20, bb_num_std=2, fib_period=60, registry=None):
+        self.registry = registry if registry is not None else default_registry
+        self.volume_period = volume_period
+        self.fib_period = fib_period
+        self.columns = self._build(data, bb_window, bb_num_std)
+        self._arrays = {name: self.columns[name].to_numpy() for name in self.columns.columns}
+
+    def __len__(self):
+        return len(self.columns)
+
+    def array(self, name):
+        """Column `name` as a float NumPy array (shared, do not modify)"""
+        return self._arrays[name]
+
+    def _build(self, data, bb_window, bb_num_std):
+        close = data['Close']
+        high = data['High']
+        low = data['Low']
+        frame = pd.DataFrame(index=data.index)
+        frame['current_price'] = close
+
+        # ===== TREND & MOMENTUM (already causal, one pass each; shared through the registry) =====
+        registry = self.registry
+        frame['rsi'] = registry.get(data, 'rsi')
+        for window in self.SMA_WINDOWS:
+            frame[f'sma_{window}'] = registry.get(data, 'sma', window=window)
+        for window in self.EMA_WINDOWS:
+            frame[f'ema_{window}'] = registry.get(data, 'ema', window=window)
+
+        frame['macd'] = registry.get(data, 'macd')
+        frame['macd_signal'] = registry.get(data, 'macd_signal')
+        frame['macd_histogram'] = registry.get(data, 'macd_histogram')
+
+        stochastic_k, stochastic_d = registry.get(data, 'stochastic')
+        frame['stochastic_k'] = stochastic_k.values
+        frame['stochastic_d'] = stochastic_d.values
+
+        # ===== BOLLINGER BANDS (same position adjustments as calculate_bollinger_bands) =====
+        with registry.profiler.measure('indicator', 'indicator_frame.bollinger_bands'):
+            sma = close.rolling(window=bb_window).mean()
+            std = close.rolling(window=bb_window).std()
+            upper = sma + (std * bb_num_std)
+            lower = sma - (std * bb_num_std)
+            lower = lower.where(~(lower > close), close * 0.98)
+            upper = upper.where(~((upper != 0) & (upper < close)), close * 1.02)
+            frame['bb_support'] = lower
+            frame['bb_resistance'] = upper
+            frame['bb_middle'] = sma
+            bands_valid = lower.notna() & upper.notna() & sma.notna() & (lower != 0) & (upper != 0) & (sma != 0)
+            frame['bb_squeeze'] = bands_valid & ((upper - lower) / sma < 0.04)
+
+        # ===== VOLUME =====
+        volume = data['Volume'].to_numpy(dtype=float)
+        frame['current_volume'] = volume
+        frame['avg_volume'] = self._trailing_mean(volume, 20)
+
+        with registry.profiler.measure('indicator', 'indicator_frame.volume_profile'):
+            supports, resistances, pocs = self._volume_profile_columns(data)
+        frame['volume_support'] = supports
+        frame['volume_resistance'] = resistances
+        frame['poc'] = pocs
+
+        # ===== ATR (calculate_atr returns 0 until the window is filled) =====
+        frame['atr'] = registry.get(data, 'atr_series').fillna(0)
+
+        # ===== ICHIMOKU =====
+        ichimoku = registry.get(data, 'ichimoku_series')
+        for name in ['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'cloud_top', 'cloud_bottom',
+                     'tk_cross_bullish', 'tk_cross_bearish']:
+            frame[name] = ichimoku[name]
+
+        # ===== FIBONACCI (swing over the trailing fib_period bars) =====
+        with registry.profiler.measure('indicator', 'indicator_frame.fibonacci_levels'):
+            swing_high = high.rolling(self.fib_period, min_periods=1).max()
+            swing_low = low.rolling(self.fib_period, min_periods=1).min()
+            total_range = swing_high - swing_low
+            for level in self.FIB_LEVELS:
+                frame[f'fib_{int(level*1000)}'] = np.round(swing_high - (total_range * level), 2)
+
+        return frame
+
+    @staticmethod
+    def _trailing_mean(values, window):
+        """Mean of the last `window` values at every bar, skipping NaN like Series.mean()"""
+        padded = np.concatenate([np.full(window - 1, np.nan), values])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+        counts = np.sum(~np.isnan(windows), axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, np.nansum(windows, axis=1) / counts, np.nan)
+
+    def _volume_profile_columns(self, data):
+        """Volume profile of the trailing window ending at each bar"""
+        n = len(data)
+        supports = np.full(n, np.nan)
+        resistances = np.full(n, np.nan)
+        pocs = np.full(n, np.nan)
+        highs = data['High'].to_numpy(dtype=float)
+        lows = data['Low'].to_numpy(dtype=float)
+        volumes = data['Volume'].to_numpy(dtype=float)
+        closes = data['Close'].to_numpy()
+
+        for i in range(n):
+            start = max(0, i - self.volume_period + 1)
+            support, resistance, poc = VolumeProfileCalculator.calculate_volume_profile_arrays(
+                highs[start:i + 1], lows[start:i + 1], volumes[start:i + 1], closes[i])
+            supports[i] = np.nan if support is None else support
+            resistances[i] = np.nan if resistance is None else resistance
+            pocs[i] = np.nan if poc is None else poc
+
+        return supports, resistances, pocs
+
+    # Keys of values_at, in calculate_indicator_values layout
+    VALUE_NAMES = (
+        ['current_price', 'rsi'] +
+        [f'sma_{window}' for window in SMA_WINDOWS] +
+        [f'ema_{window}' for window in EMA_WINDOWS] +
+        ['macd', 'macd_signal', 'macd_histogram', 'stochastic_k', 'stochastic_d',
+         'current_volume', 'avg_volume', 'atr',
+         'volume_support', 'volume_resistance', 'poc', 'bb_support', 'bb_resistance', 'bb_middle',
+         'bb_squeeze', 'ichimoku', 'fib_levels']
+    )
+    VALUE_SET = frozenset(VALUE_NAMES)
+    # Levels that are None rather than NaN when not available
+    OPTIONAL_LEVELS = frozenset(['volume_support', 'volume_resistance', 'poc', 'bb_support', 'bb_resistance', 'bb_middle'])
+
+    def value_at(self, i, name):
+        """One values_at(i) entry, without building the rest of the row"""
+        if name in self.OPTIONAL_LEVELS:
+            value = self._arrays[name][i]
+            return None if np.isnan(value) else value
+        if name == 'bb_squeeze':
+            return bool(self._arrays['bb_squeeze'][i])
+        if name == 'ichimoku':
+            return self._ichimoku_at(i)
+        if name == 'fib_levels':
+            return {f'fib_{int(level*1000)}': self._arrays[f'fib_{int(level*1000)}'][i] for level in self.FIB_LEVELS}
+        return self._arrays[name][i]
+
+    def _ichimoku_at(self, i):
+        if i + 1 < 52:
+            return None
+        arrays = self._arrays
+        current_price = arrays['current_price'][i]
+        senkou_span_a = arrays['senkou_span_a'][i]
+        senkou_span_b = arrays['senkou_span_b'][i]
+        cloud_top = arrays['cloud_top'][i]
+        cloud_bottom = arrays['cloud_bottom'][i]
+        return {
+            'tenkan_sen': arrays['tenkan_sen'][i],
+            'kijun_sen': arrays['kijun_sen'][i],
+            'senkou_span_a': senkou_span_a,
+            'senkou_span_b': senkou_span_b,
+            'chikou_span': np.nan,  # Close 26 bars after bar i is never known at bar i
+            'cloud_top': cloud_top,
+            'cloud_bottom': cloud_bottom,
+            'cloud_bullish': senkou_span_a > senkou_span_b,
+            'price_above_cloud': current_price > cloud_top,
+            'price_below_cloud': current_price < cloud_bottom,
+            'price_in_cloud': cloud_bottom <= current_price <= cloud_top,
+            'tk_cross_bullish': bool(arrays['tk_cross_bullish'][i]),
+            'tk_cross_bearish': bool(arrays['tk_cross_bearish'][i]),
+            'valid': True
+        }
+
+    def values_at(self, i):
+        """Indicator values for the bar at position i, in calculate_indicator_values layout"""
+        return {name: self.value_at(i, name) for name in self.VALUE_NAMES}
+
+    def row(self, i):
+        """values_at(i) as a read-through FrameRow: entries are read from the columns on access"""
+        return FrameRow(self, i)
+
+
+class FrameRow(Mapping):
+    """
+    Bar i of an IndicatorFrame as a read-only mapping with values_at(i)'s keys and
+    values. Holds only the frame and the position, so a SignalResult scored from it
+    keeps no per-bar dict alive.
+    """
+    __slots__ = ('frame', 'i')
+
+    def __init__(self, frame, i):
+        self.frame = frame
+        self.i = i
+
+    def __getitem__(self, name):
+        if name not in self.frame.VALUE_SET:
+            raise KeyError(name)
+        return self.frame.value_at(self.i, name)
+
+    def __iter__(self):
+        return iter(self.frame.VALUE_NAMES)
+
+    def __len__(self):
+        return len(self.frame.VALUE_NAMES)
+
+
+@indicator('indicator_frame')
+def _indicator_frame(registry, data, volume_period=20, bb_window=20, bb_num_std=2, fib_period=60):
+    return IndicatorFrame(data, volume_period, bb_window, bb_num_std, fib_period, registry=registry)
@@ -0,0 +1,156 @@
+import inspect
+import weakref
+from collections import OrderedDict
+from technical_indicators import TechnicalIndicators
+from bollinger_bands import BollingerBandsCalculator
+from volume_profile import VolumeProfileCalculator
+from profiler import default_profiler
+
+# name -> (compute function, signature used to fill in default params)
+INDICATORS = {}
+
+def indicator(name):
+    """Register compute(registry, data, **params) under name; dependencies go through registry.get"""
+    def register(compute):
+        INDICATORS[name] = (compute, inspect.signature(compute))
+        return compute
+    return register
+
+
+class IndicatorRegistry:
+    """
+    Memo of indicator results keyed by (data identity, indicator, params).
+    Each series is computed once per DataFrame and shared by every caller;
+    indicators built on others (EMA -> MACD -> signal line) fetch their inputs
+    from the registry too. Least recently used entries are evicted beyond
+    max_entries. Frames are identified by object identity, so treat a frame as
+    read-only once indicators have been requested for it. Every computation (not
+    cache hits) is measured by the profiler under ('indicator', name).
+    """
+    def __init__(self, max_entries=256, profiler=None):
+        self.max_entries = max_entries
+        self.profiler = profiler if profiler is not None else default_profiler
+        self.entries = OrderedDict()  # key -> (weakref to data, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _key(self, data, name, params):
+        if name not in INDICATORS:
+            raise KeyError(f"Unknown indicator: {name}")
+        compute, signature = INDICATORS[name]
+        bound = signature.bind(self, data, **params)
+        bound.apply_defaults()
+        # Skip the registry and data arguments; the rest (defaults included) identify the result
+        arguments = list(bound.arguments.items())[2:]
+        return (id(data), name, tuple(arguments)), bound
+
+    def get(self, data, name, **params):
+        """Cached value of indicator `name` for data, computing it (and its dependencies) on a miss"""
+        key, bound = self._key(data, name, params)
+        entry = self.entries.get(key)
+        # id() can be reused once a frame is garbage collected, so confirm it is the same object
+        if entry is not None and entry[0]() is data:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        compute = INDICATORS[name][0]
+        with self.profiler.measure('indicator', name):
+            value = compute(*bound.args, **bound.kwargs)
+        self.entries[key] = (weakref.ref(data), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'hit_rate': self.hits / lookups * 100 if lookups else 0
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+# Shared by SignalGenerator, Backtester and ReportGenerator unless one is passed in
+default_registry = IndicatorRegistry()
+
+# ===== INDICATORS =====
+
+@indicator('rsi')
+def _rsi(registry, data, window=14):
+    return TechnicalIndicators.calculate_rsi(data, window)
+
+@indicator('sma')
+def _sma(registry, data, window):
+    return TechnicalIndicators.calculate_sma(data, window)
+
+@indicator('ema')
+def _ema(registry, data, window):
+    return TechnicalIndicators.calculate_ema(data, window)
+
+@indicator('macd')
+def _macd(registry, data, fast=12, slow=26):
+    return registry.get(data, 'ema', window=fast) - registry.get(data, 'ema', window=slow)
+
+@indicator('macd_signal')
+def _macd_signal(registry, data, fast=12, slow=26, signal=9):
+    return registry.get(data, 'macd', fast=fast, slow=slow).ewm(span=signal, adjust=False).mean()
+
+@indicator('macd_histogram')
+def _macd_histogram(registry, data, fast=12, slow=26, signal=9):
+    macd = registry.get(data, 'macd', fast=fast, slow=slow)
+    return macd - registry.get(data, 'macd_signal', fast=fast, slow=slow, signal=signal)
+
+@indicator('stochastic')
+def _stochastic(registry, data, k_period=14, d_period=3):
+    return TechnicalIndicators.calculate_stochastic(data, k_period, d_period)
+
+@indicator('bollinger_bands')
+def _bollinger_bands(registry, data, window=20, num_std=2):
+    return BollingerBandsCalculator.calculate_bollinger_bands(data, window, num_std)
+
+@indicator('bollinger_squeeze')
+def _bollinger_squeeze(registry, data, window=20, num_std=2):
+    bands = registry.get(data, 'bollinger_bands', window=window, num_std=num_std)
+    return BollingerBandsCalculator.calculate_bollinger_squeeze(data, window, num_std, bands=bands)
+
+@indicator('volume_profile')
+def _volume_profile(registry, data, period=20, price_bins=10):
+    return VolumeProfileCalculator.calculate_volume_profile(data, period, price_bins)
+
+@indicator('atr_series')
+def _atr_series(registry, data, period=14):
+    return TechnicalIndicators.calculate_atr_series(data, period)
+
+@indicator('atr')
+def _atr(registry, data, period=14):
+    if len(data) < period:
+        return TechnicalIndicators.calculate_atr(data, period)
+    return TechnicalIndicators.calculate_atr(data, period, series=registry.get(data, 'atr_series', period=period))
+
+@indicator('ichimoku_series')
+def _ichimoku_series(registry, data):
+    return TechnicalIndicators.calculate_ichimoku_series(data)
+
+@indicator('ichimoku')
+def _ichimoku(registry, data):
+    if len(data) < 52:
+        return TechnicalIndicators.calculate_ichimoku_cloud(data)
+    return TechnicalIndicators.calculate_ichimoku_cloud(data, series=registry.get(data, 'ichimoku_series'))
+
+@indicator('fibonacci_levels')
+def _fibonacci_levels(registry, data, period=60):
+    return TechnicalIndicators.calculate_fibonacci_levels(data, period)
@@ -0,0 +1,39 @@
+from collections.abc import Mapping
+
+class LazyIndicatorValues(Mapping):
+    """
+    Read-only indicator_values mapping whose entries are computed on first read.
+    loaders maps each key to a zero-argument function; its result is cached, so an
+    indicator costs nothing until a rule or consumer reads it and is computed at most
+    once. values holds entries that are already known. `in` never computes anything;
+    iterating (dict(), printing) reads every entry and gives the eager layout.
+    Loaders close over the price data, so the mapping can't be pickled; pass dict(values).
+    """
+    def __init__(self, loaders, values=None):
+        self._loaders = loaders
+        self._values = dict(values) if values else {}
+        self._keys = list(loaders) + [key for key in self._values if key not in loaders]
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value = self._values[key] = self._loaders[key]()
+        return value
+
+    def __contains__(self, key):
+        return key in self._values or key in self._loaders
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def computed(self):
+        """Keys evaluated so far (known values included)"""
+        return [key for key in self._keys if key in self._values]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
@@ -1,7 +1,11 @@
+import os
 from data_fetcher import DataFetcher
+from data_providers import provider_from_spec
+from ohlcv_cache import OHLCVCache
 from signal_generator import SignalGenerator
 from backtester import Backtester
 from report_generator import ReportGenerator
+from profiler import default_profiler
 
 def main():
     print("=== 🎯 INDONESIA STOCK ANALYSIS SYSTEM ===")
@@ -11,14 +15,24 @@ def main():
     # Get user input
     stock_code = input("Enter Indonesian stock code (e.g., BBCA, BBRI, TLKM): ").strip().upper()
     
+    # Data source: yfinance by default, IDX_DATA_PROVIDER=local:/path or synthetic for offline runs
+    provider = provider_from_spec(os.environ.get("IDX_DATA_PROVIDER"))
+    # IDX_PROFILE=/path/idx.prom records time, calls and allocations per stage and indicator
+    profile_path = os.environ.get("IDX_PROFILE")
+    if profile_path:
+        default_profiler.enable()
+    stage = default_profiler.measure
+    
     try:
         # Fetch data
         print(f"📥 Fetching data for {stock_code}...")
-        data = DataFetcher.fetch_stock_data(stock_code, "1y")
+        with stage('stage', 'fetch'):
+            data = DataFetcher.fetch_stock_data(stock_code, "1y", cache=OHLCVCache(), provider=provider)
         
         # Validate data with detailed checks
         print("🔍 Validating data quality...")
-        DataFetcher.validate_data(data, stock_code)
+        with stage('stage', 'validate'):
+            DataFetcher.validate_data(data, stock_code)
         
         # Get data info
         data_info = DataFetcher.get_data_info(data)
@@ -29,31 +43,38 @@ def main():
         # Generate signal
         print("🔍 Analyzing market conditions with 13 indicators...")
         signal_gen = SignalGenerator()
-        signal_result = signal_gen.generate_signal(data)
+        with stage('stage', 'signal'):
+            signal_result = signal_gen.generate_signal(data)
         
         # Generate trading plan (only for BUY signals)
         trading_plan = None
-        if "BUY" in signal_result[0]:
-            trading_plan = signal_gen.generate_trading_plan(signal_result[0], data['Close'].iloc[-1], signal_result[4])
+        if "BUY" in signal_result.signal:
+            with stage('stage', 'plan'):
+                trading_plan = signal_gen.generate_trading_plan(signal_result.signal, data['Close'].iloc[-1],
+                                                                signal_result.indicator_values)
         
         # Run backtest
         print("📈 Running backtest with realistic execution...")
         backtester = Backtester(initial_capital = 600000, entry_level_confidence = 65)
-        trades, final_capital = backtester.run_backtest(data)
-        # trades, final_capital = backtester.run_backtest_dynamic_stop(data)
-        
-        performance = backtester.calculate_performance(trades)
+        with stage('stage', 'backtest'):
+            trades, final_capital = backtester.run_backtest(data)
+            # trades, final_capital = backtester.run_backtest_dynamic_stop(data)
+            
+            equity = backtester.equity_curve(data, trades)
+            performance = backtester.calculate_performance(trades, equity)
         
         # Generate comprehensive report
         print("📊 Generating professional analysis report...")
         report_gen = ReportGenerator()
-        report = report_gen.generate_comprehensive_report(data, signal_result, trading_plan, performance, trades)
+        with stage('stage', 'report'):
+            report = report_gen.generate_comprehensive_report(data, signal_result, trading_plan, performance, trades)
 
         # Generate PnL graphs (NEW)
         print("📈 Generating performance graphs...")
         if trades:  # Only generate if we have trades
-            pnl_chart_path = report_gen.generate_pnl_graph(trades, stock_code)
-            analysis_chart_path = report_gen.generate_simple_pnl_graph(trades, stock_code)
+            with stage('stage', 'report'):
+                pnl_chart_path = report_gen.generate_pnl_graph(trades, stock_code)
+                analysis_chart_path = report_gen.generate_simple_pnl_graph(trades, stock_code)
             
             if pnl_chart_path:
                 print(f"📊 PnL Chart: {pnl_chart_path}")
@@ -61,7 +82,8 @@ def main():
                 print(f"📈 Analysis Chart: {analysis_chart_path}")
         
         # Display final report
-        report_gen.print_report(report, stock_code)
+        with stage('stage', 'report'):
+            report_gen.print_report(report, stock_code)
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -72,5 +94,9 @@ def main():
         print("4. Check if market is open (Indonesian trading hours)")
         print("5. Update yfinance: pip install yfinance --upgrade")
 
+    if profile_path:
+        default_profiler.disable()
+        print(f"⏱️  Profile written: {default_profiler.write_prometheus(profile_path)}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
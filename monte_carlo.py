@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from trade_log import TradeLog
+
+class TradeBootstrap:
+    """
+    Monte Carlo bootstrap of a backtest's trades. Each trade's P&L is turned into a return
+    on the capital it was sized from, then paths of the same length are drawn with
+    replacement as one index matrix and compounded from the initial capital. Gives the
+    spread of total return and max drawdown the single backtest path hides, plus the
+    chance of losing ruin_drawdown_pct of peak equity. Paths run in chunks of chunk_paths
+    so memory stays bounded.
+    """
+    PERCENTILES = (5, 25, 50, 75, 95)
+
+    def __init__(self, paths=10000, seed=None, ruin_drawdown_pct=50, chunk_paths=20000):
+        self.paths = paths
+        self.seed = seed
+        self.ruin_drawdown_pct = ruin_drawdown_pct
+        self.chunk_paths = chunk_paths
+
+    @staticmethod
+    def trade_returns(trades, initial_capital):
+        """P&L of each trade as a fraction of the capital before it (trades in exit order)"""
+        pnl = TradeLog.from_records(trades).column('pnl').astype(float)
+        capital_before = initial_capital + np.concatenate([[0.0], np.cumsum(pnl)[:-1]])
+        return pnl / capital_before
+
+    def run(self, trades, initial_capital=10000000):
+        """
+        Bootstrap a run_backtest trade log. Returns a dict with the per-path arrays
+        ('total_return_pct', 'max_drawdown_pct', 'win_rate'), their 'percentiles'
+        (DataFrame, one row per metric), 'risk_of_ruin_pct' and the number of 'paths'.
+        """
+        returns = self.trade_returns(trades, initial_capital)
+        n = len(returns)
+        if n == 0:
+            return {}
+
+        rng = np.random.default_rng(self.seed)
+        total_return = np.empty(self.paths)
+        max_drawdown = np.empty(self.paths)
+        win_rate = np.empty(self.paths)
+        ruined = np.empty(self.paths, dtype=bool)
+
+        for start in range(0, self.paths, self.chunk_paths):
+            stop = min(start + self.chunk_paths, self.paths)
+            sampled = returns[rng.integers(0, n, size=(stop - start, n))]
+            # Equity after each trade, starting from 1 (initial capital)
+            equity = np.cumprod(1 + sampled, axis=1)
+            peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1)
+            drawdown = 1 - equity / peak
+
+            total_return[start:stop] = (equity[:, -1] - 1) * 100
+            max_drawdown[start:stop] = drawdown.max(axis=1) * 100
+            win_rate[start:stop] = (sampled > 0).mean(axis=1) * 100
+            ruined[start:stop] = max_drawdown[start:stop] >= self.ruin_drawdown_pct
+
+        distributions = {
+            'total_return_pct': total_return,
+            'max_drawdown_pct': max_drawdown,
+            'win_rate': win_rate
+        }
+        percentiles = pd.DataFrame([np.percentile(values, self.PERCENTILES) for values in distributions.values()],
+                                   index=list(distributions), columns=[f'p{p}' for p in self.PERCENTILES])
+        percentiles['mean'] = [values.mean() for values in distributions.values()]
+
+        return {
+            **distributions,
+            'percentiles': percentiles,
+            'risk_of_ruin_pct': ruined.mean() * 100,
+            'paths': self.paths
+        }
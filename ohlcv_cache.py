@@ -0,0 +1,177 @@
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+
+class OHLCVCache:
+    """
+    Persistent per-ticker OHLCV store (one Parquet file per ticker, plus a small JSON
+    sidecar recording how far back the history has been downloaded). Falls back to
+    pickle files when no Parquet engine (pyarrow/fastparquet) is installed.
+    """
+    PERIOD_OFFSETS = {
+        'd': lambda n: pd.DateOffset(days=n),
+        'wk': lambda n: pd.DateOffset(weeks=n),
+        'mo': lambda n: pd.DateOffset(months=n),
+        'y': lambda n: pd.DateOffset(years=n),
+    }
+
+    def __init__(self, cache_dir='data_cache', file_format=None):
+        self.cache_dir = cache_dir
+        self.file_format = file_format or self._default_format()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _default_format():
+        for engine in ('pyarrow', 'fastparquet'):
+            try:
+                __import__(engine)
+                return 'parquet'
+            except ImportError:
+                continue
+        return 'pickle'
+
+    def _path(self, symbol):
+        extension = 'parquet' if self.file_format == 'parquet' else 'pkl'
+        return os.path.join(self.cache_dir, f"{symbol}.{extension}")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self.cache_dir, f"{symbol}.json")
+
+    def _atomic_write(self, path, write):
+        """Write to a temp file in the same directory, then rename over the target"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp_')
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, symbol):
+        """Cached frame for symbol, or None if nothing is stored yet"""
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        if self.file_format == 'parquet':
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def load_meta(self, symbol):
+        path = self._meta_path(symbol)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, symbol, data, covered_from=None):
+        """Atomically replace the cached frame (and coverage metadata) for symbol"""
+        if self.file_format == 'parquet':
+            self._atomic_write(self._path(symbol), lambda p: data.to_parquet(p))
+        else:
+            self._atomic_write(self._path(symbol), lambda p: data.to_pickle(p))
+
+        if covered_from is not None:
+            meta = {'covered_from': covered_from, 'last_date': str(data.index.max().date())}
+            self._atomic_write(self._meta_path(symbol), lambda p: self._write_json(p, meta))
+
+    @staticmethod
+    def _write_json(path, payload):
+        with open(path, 'w') as f:
+            json.dump(payload, f)
+
+    def append(self, symbol, new_data, covered_from=None):
+        """
+        Merge new bars into the cache. Overlapping dates take the new values, so
+        re-downloading the last cached bar replaces a partial intraday candle.
+        Only append bars on the same adjustment basis as the cache: an auto-adjusted
+        source re-adjusts the whole history on every split or dividend, so check the
+        delta with adjustment_changed first and save() a full re-download instead.
+        """
+        cached = self.load(symbol)
+        meta = self.load_meta(symbol)
+        if cached is not None and not cached.empty:
+            merged = pd.concat([cached, new_data])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        else:
+            merged = new_data.sort_index()
+
+        if covered_from is None:
+            covered_from = meta.get('covered_from')
+        elif meta.get('covered_from') is not None:
+            covered_from = self._earliest(covered_from, meta['covered_from'])
+
+        self.save(symbol, merged, covered_from)
+        return merged
+
+    @staticmethod
+    def delta_start(cached):
+        """
+        Date to request new bars from: the bar before the last cached one, so the delta
+        overlaps one settled session (the last may have been a partial intraday candle)
+        """
+        return cached.index[-2] if len(cached) > 1 else cached.index[-1]
+
+    @staticmethod
+    def adjustment_changed(cached, new_data, rtol=1e-5):
+        """
+        Whether new_data is on a different split/dividend adjustment basis than cached:
+        the delta reports a split or dividend, or a settled overlapping session (any but
+        the last cached one) closes differently beyond rounding
+        """
+        for column in ('Stock Splits', 'Dividends'):
+            if column in new_data and (new_data[column].fillna(0) != 0).any():
+                return True
+        settled = cached.index[:-1].intersection(new_data.index)
+        if len(settled) == 0:
+            return False
+        return not np.allclose(new_data.loc[settled, 'Close'].to_numpy(dtype=float),
+                               cached.loc[settled, 'Close'].to_numpy(dtype=float), rtol=rtol, atol=0, equal_nan=True)
+
+    @staticmethod
+    def _earliest(a, b):
+        if 'max' in (a, b):
+            return 'max'
+        return min(a, b)
+
+    @classmethod
+    def period_start(cls, period, end=None):
+        """
+        First date a yfinance-style period ('5d', '6mo', '2y', 'ytd', 'max') covers,
+        as an ISO date string, or 'max' for the whole history.
+        """
+        end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end).normalize()
+        if period == 'max':
+            return 'max'
+        if period == 'ytd':
+            return str(pd.Timestamp(year=end.year, month=1, day=1).date())
+
+        for suffix, offset in cls.PERIOD_OFFSETS.items():
+            if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+                return str((end - offset(int(period[:-len(suffix)]))).date())
+
+        raise ValueError(f"Unsupported period: {period}")
+
+    def covers(self, symbol, period):
+        """True if the cache already holds the full history a period asks for"""
+        covered_from = self.load_meta(symbol).get('covered_from')
+        if covered_from is None:
+            return False
+        start = self.period_start(period)
+        if covered_from == 'max':
+            return True
+        return start != 'max' and covered_from <= start
+
+    @classmethod
+    def slice_period(cls, data, period):
+        """Rows of a cached frame that fall inside period"""
+        start = cls.period_start(period)
+        if start == 'max':
+            return data
+        start = pd.Timestamp(start)
+        if data.index.tz is not None:
+            start = start.tz_localize(data.index.tz)
+        return data[data.index >= start]
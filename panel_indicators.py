@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def build_panel(stock_data, fields=PANEL_FIELDS):
+    """
+    Align per-ticker OHLCV frames (e.g. DataFetcher.fetch_many output) on one date index.
+    Returns (dates, tickers, {field: 2D float array of shape (dates, tickers)}); a ticker
+    has NaN on dates before its listing and on days it was suspended.
+    """
+    tickers = list(stock_data)
+    dates = pd.DatetimeIndex([])
+    for data in stock_data.values():
+        dates = dates.union(data.index)
+    arrays = {}
+    for field in fields:
+        columns = [stock_data[ticker][field].reindex(dates).to_numpy(dtype=float) for ticker in tickers]
+        arrays[field] = np.column_stack(columns) if columns else np.empty((len(dates), 0))
+    return dates, tickers, arrays
+
+
+class PanelCompaction:
+    """
+    Moves each ticker's valid bars to the top of its column (order kept) so rolling windows
+    run over the ticker's own trading days, exactly like the per-ticker DataFrame would,
+    and scatters results back to the original dates with NaN where the ticker had no bar.
+    """
+    def __init__(self, close):
+        self.valid = ~np.isnan(close)
+        # Stable sort puts valid rows (False == 0 after inversion) first, in date order
+        self.order = np.argsort(~self.valid, axis=0, kind='stable')
+        self.counts = self.valid.sum(axis=0)
+        self.compact_valid = np.arange(close.shape[0])[:, None] < self.counts[None, :]
+
+    def compact(self, values):
+        compacted = np.take_along_axis(np.asarray(values, dtype=float), self.order, axis=0)
+        return np.where(self.compact_valid, compacted, np.nan)
+
+    def expand(self, values):
+        expanded = np.full(values.shape, np.nan)
+        np.put_along_axis(expanded, self.order, np.where(self.compact_valid, values, np.nan), axis=0)
+        return expanded
+
+
+def _rolling(values, window, reducer, **kwargs):
+    """Trailing-window reduction along dates; NaN until the window is full or while it holds a NaN"""
+    result = np.full(values.shape, np.nan)
+    if window <= values.shape[0]:
+        windows = sliding_window_view(values, window, axis=0)
+        result[window - 1:] = reducer(windows, axis=-1, **kwargs)
+    return result
+
+def _shift(values, periods):
+    """DataFrame.shift along dates"""
+    result = np.full(values.shape, np.nan)
+    if periods > 0:
+        result[periods:] = values[:-periods]
+    elif periods < 0:
+        result[:periods] = values[-periods:]
+    else:
+        result[:] = values
+    return result
+
+def _ewm(values, span):
+    """ewm(span, adjust=False).mean() on compacted columns (NaN only after each ticker's last bar)"""
+    alpha = 2.0 / (span + 1)
+    result = np.empty(values.shape)
+    result[0] = values[0]
+    # Recursive, so one vector step per date across every ticker
+    for i in range(1, values.shape[0]):
+        result[i] = alpha * values[i] + (1 - alpha) * result[i - 1]
+    return result
+
+
+class PanelIndicators:
+    """
+    TechnicalIndicators / BollingerBandsCalculator for a whole universe at once.
+    Inputs are aligned 2D arrays (dates x tickers, see build_panel); outputs are full
+    series of the same shape, NaN where the ticker had no bar. Column j matches the
+    per-ticker function run on that ticker's frame with its missing days dropped.
+    Pass a PanelCompaction built from the Close panel to share it between calls.
+    """
+    @staticmethod
+    def _compaction(close, compaction):
+        return compaction if compaction is not None else PanelCompaction(close)
+
+    @staticmethod
+    def calculate_sma(close, window, compaction=None):
+        """Simple Moving Average"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        return compaction.expand(_rolling(compaction.compact(close), window, np.mean))
+
+    @staticmethod
+    def calculate_ema(close, window, compaction=None):
+        """Exponential Moving Average"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        return compaction.expand(_ewm(compaction.compact(close), window))
+
+    @staticmethod
+    def calculate_rsi(close, window=14, compaction=None):
+        """RSI; 50 where undefined, as calculate_rsi does"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        compact_close = compaction.compact(close)
+        delta = compact_close - _shift(compact_close, 1)
+        # Series.where turns the first (NaN) delta into 0, keep that
+        gain = _rolling(np.where(delta > 0, delta, 0.0), window, np.mean)
+        loss = _rolling(np.where(delta < 0, -delta, 0.0), window, np.mean)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + gain / loss))
+        rsi = np.where(np.isnan(rsi), 50.0, rsi)
+        return compaction.expand(rsi)
+
+    @staticmethod
+    def calculate_macd(close, compaction=None):
+        """MACD; returns (macd, signal, histogram)"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        compact_close = compaction.compact(close)
+        macd = _ewm(compact_close, 12) - _ewm(compact_close, 26)
+        signal = _ewm(macd, 9)
+        return compaction.expand(macd), compaction.expand(signal), compaction.expand(macd - signal)
+
+    @staticmethod
+    def calculate_stochastic(high, low, close, k_period=14, d_period=3, compaction=None):
+        """Stochastic Oscillator; returns (%K, %D), 50 for tickers with fewer than k_period bars"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        lowest = _rolling(compaction.compact(low), k_period, np.min)
+        highest = _rolling(compaction.compact(high), k_period, np.max)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = 100 * ((compaction.compact(close) - lowest) / (highest - lowest))
+        d = _rolling(k, d_period, np.mean)
+        short_history = compaction.counts < k_period
+        k[:, short_history] = 50.0
+        d[:, short_history] = 50.0
+        return compaction.expand(k), compaction.expand(d)
+
+    @staticmethod
+    def calculate_true_range(high, low, close, compaction=None):
+        """True range against the previous bar's close (high - low on a ticker's first bar)"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        compact_high = compaction.compact(high)
+        compact_low = compaction.compact(low)
+        previous_close = _shift(compaction.compact(close), 1)
+        # fmax skips the missing previous close, like the row-wise max in calculate_atr
+        tr = np.fmax(compact_high - compact_low, np.abs(compact_high - previous_close))
+        tr = np.fmax(tr, np.abs(compact_low - previous_close))
+        return compaction.expand(tr)
+
+    @staticmethod
+    def calculate_atr(high, low, close, period=14, compaction=None):
+        """Average True Range series (calculate_atr returns the last value of this, 0 while warming up)"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        tr = compaction.compact(PanelIndicators.calculate_true_range(high, low, close, compaction))
+        return compaction.expand(_rolling(tr, period, np.mean))
+
+    @staticmethod
+    def calculate_bollinger_bands(close, window=20, num_std=2, compaction=None):
+        """
+        Bollinger Bands series; returns (lower, upper, middle) with the same support/resistance
+        position adjustments as calculate_bollinger_bands
+        """
+        compaction = PanelIndicators._compaction(close, compaction)
+        compact_close = compaction.compact(close)
+        middle = _rolling(compact_close, window, np.mean)
+        std = _rolling(compact_close, window, np.std, ddof=1)
+        upper = middle + (std * num_std)
+        lower = middle - (std * num_std)
+        lower = np.where(lower > compact_close, compact_close * 0.98, lower)
+        upper = np.where((upper != 0) & (upper < compact_close), compact_close * 1.02, upper)
+        return compaction.expand(lower), compaction.expand(upper), compaction.expand(middle)
+
+    @staticmethod
+    def calculate_bollinger_squeeze(lower, upper, middle):
+        """Squeeze flag per bar from calculate_bollinger_bands output (band width under 4%)"""
+        valid = ~(np.isnan(lower) | np.isnan(upper) | np.isnan(middle))
+        valid &= (lower != 0) & (upper != 0) & (middle != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return valid & ((upper - lower) / middle < 0.04)
+
+    @staticmethod
+    def calculate_ichimoku_cloud(high, low, close, compaction=None):
+        """Ichimoku component series as a dictionary of panels (spans shifted 26 bars forward)"""
+        compaction = PanelIndicators._compaction(close, compaction)
+        compact_high = compaction.compact(high)
+        compact_low = compaction.compact(low)
+
+        def midpoint(window):
+            return (_rolling(compact_high, window, np.max) + _rolling(compact_low, window, np.min)) / 2
+
+        tenkan_sen = midpoint(9)
+        kijun_sen = midpoint(26)
+        senkou_span_a = _shift((tenkan_sen + kijun_sen) / 2, 26)
+        senkou_span_b = _shift(midpoint(52), 26)
+        with np.errstate(invalid='ignore'):
+            # Python max()/min() keep the first argument unless the second compares strictly greater/smaller
+            cloud_top = np.where(senkou_span_b > senkou_span_a, senkou_span_b, senkou_span_a)
+            cloud_bottom = np.where(senkou_span_b < senkou_span_a, senkou_span_b, senkou_span_a)
+        return {
+            'tenkan_sen': compaction.expand(tenkan_sen),
+            'kijun_sen': compaction.expand(kijun_sen),
+            'senkou_span_a': compaction.expand(senkou_span_a),
+            'senkou_span_b': compaction.expand(senkou_span_b),
+            'chikou_span': compaction.expand(_shift(compaction.compact(close), -26)),
+            'cloud_top': compaction.expand(cloud_top),
+            'cloud_bottom': compaction.expand(cloud_bottom)
+        }
@@ -0,0 +1,89 @@
+import itertools
+import numpy as np
+import pandas as pd
+from backtester import Backtester
+from trade_log import TradeLog
+
+class ParameterSweep:
+    """
+    Grid search over Backtester exit/entry parameters. Signals are computed once
+    per ticker and every configuration is simulated against the same arrays
+    (all configurations side by side in one pass, see Backtester.simulate_fixed_exits).
+    """
+    PARAMETERS = ('take_profit_pct', 'stop_loss_pct', 'max_hold_days', 'entry_level_confidence')
+
+    def __init__(self, backtester=None):
+        self.backtester = backtester or Backtester()
+
+    def build_grid(self, take_profit_pct=None, stop_loss_pct=None, max_hold_days=None, entry_level_confidence=None):
+        """Every combination of the given values; parameters left out keep the run_backtest defaults"""
+        defaults = {
+            'take_profit_pct': [3.0],
+            'stop_loss_pct': [1.5],
+            'max_hold_days': [10],
+            'entry_level_confidence': [self.backtester.entry_level_confidence],
+        }
+        given = {
+            'take_profit_pct': take_profit_pct,
+            'stop_loss_pct': stop_loss_pct,
+            'max_hold_days': max_hold_days,
+            'entry_level_confidence': entry_level_confidence,
+        }
+        values = [list(given[name]) if given[name] is not None else defaults[name] for name in self.PARAMETERS]
+        return [dict(zip(self.PARAMETERS, combo)) for combo in itertools.product(*values)]
+
+    def simulate(self, data, grid, signals=None):
+        """(trades, final_capital) of one ticker for every configuration in grid"""
+        if signals is None:
+            signals = self.backtester.signal_generator.generate_signals(data)
+        columns = [[config[name] for config in grid] for name in self.PARAMETERS]
+        return self.backtester.simulate_fixed_exits(data, signals, *columns)
+
+    def run(self, universe, grid, sort_by='total_return_pct'):
+        """
+        Sweep grid over a single DataFrame or a {ticker: DataFrame} dict.
+        Returns one row per configuration, best `sort_by` first. Every ticker is
+        simulated on its own initial_capital, so trade statistics (win rate, profit
+        factor, average win/loss...) are pooled over all trades, while returns and
+        drawdowns are computed per ticker and aggregated: total_return_pct and
+        max_drawdown_pct are the mean over tickers (a ticker without trades counts as
+        0), with median_return_pct and worst_drawdown_pct alongside.
+        """
+        if isinstance(universe, pd.DataFrame):
+            universe = {'': universe}
+
+        ticker_trades = [[] for _ in grid]
+        for stock_code, data in universe.items():
+            try:
+                results = self.simulate(data, grid)
+            except Exception as e:
+                print(f"⚠️  Warning: Sweep skipped {stock_code}: {e}")
+                continue
+            for k, (trades, _) in enumerate(results):
+                ticker_trades[k].append(trades)
+
+        rows = []
+        for config, logs in zip(grid, ticker_trades):
+            trades = TradeLog.concat(logs).sorted_by('exit_date')
+            performance = self.backtester.calculate_performance(trades) or {'total_trades': 0}
+            # Pooled P&L has no single capital base or equity path; these come per ticker below
+            for key in ('exit_reasons', 'final_capital', 'max_drawdown', 'total_return_pct', 'max_drawdown_pct'):
+                performance.pop(key, None)
+
+            per_ticker = [self.backtester.calculate_performance(log) or {} for log in logs]
+            returns = np.array([result.get('total_return_pct', 0.0) for result in per_ticker])
+            drawdowns = np.array([result.get('max_drawdown_pct', 0.0) for result in per_ticker])
+            if len(per_ticker):
+                performance.update({
+                    'tickers': len(per_ticker),
+                    'total_return_pct': returns.mean(),
+                    'median_return_pct': np.median(returns),
+                    'max_drawdown_pct': drawdowns.mean(),
+                    'worst_drawdown_pct': drawdowns.max(),
+                })
+            rows.append({**config, **performance})
+
+        results = pd.DataFrame(rows)
+        if sort_by in results:
+            results = results.sort_values(sort_by, ascending=False, na_position='last', kind='stable')
+        return results.reset_index(drop=True)
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from backtester import Backtester, NANOSECONDS_PER_DAY
+from signal_reasons import reason_text
+from trade_log import TradeLog
+
+class PortfolioBacktester:
+    """
+    Fixed-percentage exit backtest of a whole universe sharing one pool of capital.
+    Steps through the union of all tickers' dates; on each date open positions are
+    checked for exits (same rules as Backtester.run_backtest), then concurrent BUY
+    signals are filled highest confidence first until max_positions are open or cash
+    runs out. Each position gets 80% (confidence >= 75) or 60% of an equal
+    1/max_positions share of equity. Works from precomputed generate_signals arrays.
+    """
+    def __init__(self, initial_capital=10000000, entry_level_confidence=65, max_positions=5,
+                 take_profit_pct=3.0, stop_loss_pct=1.5, max_hold_days=10, backtester=None):
+        self.initial_capital = initial_capital
+        self.entry_level_confidence = entry_level_confidence
+        self.max_positions = max_positions
+        self.take_profit_pct = take_profit_pct
+        self.stop_loss_pct = stop_loss_pct
+        self.max_hold_days = max_hold_days
+        self.backtester = backtester or Backtester(initial_capital, entry_level_confidence)
+        self.equity_curve = None
+
+    def align(self, universe, signals=None, start_index=100):
+        """
+        Per-ticker prices and previous-bar signals on the union date index (dates x tickers).
+        A ticker's "previous bar" is its own previous trading day, so listings and suspensions
+        never shift its signals; bars before its own start_index never trade.
+        """
+        signals = signals or {}
+        tickers = list(universe)
+        dates = pd.DatetimeIndex([])
+        for data in universe.values():
+            dates = dates.union(data.index)
+
+        fields = {name: [] for name in ['open', 'close', 'signal', 'confidence', 'buy_confidence',
+                                        'sell_confidence', 'reason_codes', 'rsi']}
+        for stock_code in tickers:
+            data = universe[stock_code]
+            ticker_signals = signals.get(stock_code)
+            if ticker_signals is None:
+                ticker_signals = self.backtester.signal_generator.generate_signals(data)
+
+            def on_dates(values, fill):
+                return pd.Series(values, index=data.index).reindex(dates, fill_value=fill).to_numpy()
+
+            def previous_bar(values, fill):
+                shifted = pd.Series(values, index=data.index).shift(1, fill_value=fill)
+                shifted.iloc[:start_index] = fill
+                return shifted.reindex(dates, fill_value=fill).to_numpy()
+
+            fields['open'].append(on_dates(data['Open'].to_numpy(dtype=float), np.nan))
+            fields['close'].append(on_dates(data['Close'].to_numpy(dtype=float), np.nan))
+            fields['signal'].append(previous_bar(ticker_signals['signal'], "HOLD"))
+            for name in ['confidence', 'buy_confidence', 'sell_confidence', 'reason_codes']:
+                fields[name].append(previous_bar(np.asarray(ticker_signals[name], dtype=np.int64), 0))
+            fields['rsi'].append(previous_bar(np.asarray(ticker_signals['rsi'], dtype=float), np.nan))
+
+        arrays = {name: np.column_stack(columns) if columns else np.empty((len(dates), 0))
+                  for name, columns in fields.items()}
+        return dates, tickers, arrays
+
+    def run(self, universe, signals=None):
+        """
+        Simulate the portfolio over a {ticker: DataFrame} universe; signals optionally maps
+        tickers to precomputed generate_signals output. Returns (TradeLog, final_capital);
+        trades carry the Backtester fields plus 'stock'. The daily mark-to-market
+        equity (Backtester.equity_curve layout, without 'shares') is kept in self.equity_curve.
+        """
+        dates, tickers, a = self.align(universe, signals)
+        n_dates, n_tickers = a['close'].shape
+        date_list = dates.tolist()
+        stamps = dates.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        opens, closes = a['open'], a['close']
+        signal, confidence = a['signal'], a['confidence']
+        # Last known close per ticker, for marking positions on days the ticker did not trade
+        marks = pd.DataFrame(closes).ffill().to_numpy()
+
+        tp = self.take_profit_pct
+        sl = self.stop_loss_pct
+        cash = float(self.initial_capital)
+        position = np.zeros(n_tickers, dtype=np.int64)
+        entry_price = np.zeros(n_tickers)
+        entry_bar = np.zeros(n_tickers, dtype=np.int64)
+        entry_confidence = np.zeros(n_tickers, dtype=np.int64)
+        equity = np.empty(n_dates)
+        invested = np.empty(n_dates)
+        trades = TradeLog({'stock': object})
+
+        def close_position(k, bar, exit_price, exit_reason, entry_signal):
+            nonlocal cash
+            self.backtester._record_trade(trades, date_list, entry_bar[k], bar, entry_price[k], exit_price,
+                                          position[k], entry_confidence[k], exit_reason, entry_signal,
+                                          stock=tickers[k])
+            cash += position[k] * exit_price
+            position[k] = 0
+            entry_price[k] = 0
+            entry_confidence[k] = 0
+
+        for i in range(n_dates):
+            traded = ~np.isnan(closes[i])
+
+            # === EXIT LOGIC (C-to-C exits, then the bearish signal exit) ===
+            holding = (position > 0) & traded
+            if holding.any():
+                current_close = closes[i]
+                with np.errstate(invalid='ignore'):
+                    hit_take_profit = holding & (current_close >= entry_price * (1 + tp / 100))
+                    hit_stop_loss = holding & ~hit_take_profit & (current_close <= entry_price * (1 - sl / 100))
+                hit_max_hold = holding & ~hit_take_profit & ~hit_stop_loss & \
+                    ((stamps[i] - stamps[entry_bar]) // NANOSECONDS_PER_DAY >= self.max_hold_days)
+                hit_signal = holding & ~hit_take_profit & ~hit_stop_loss & ~hit_max_hold & \
+                    (signal[i] == "SELL") & (confidence[i] >= 50)
+
+                for k in np.flatnonzero(hit_take_profit | hit_stop_loss | hit_max_hold | hit_signal):
+                    if hit_take_profit[k]:
+                        exit_reason = f"Take Profit ({tp}%)"
+                    elif hit_stop_loss[k]:
+                        exit_reason = f"Stop Loss ({sl}%)"
+                    elif hit_max_hold[k]:
+                        exit_reason = f"Max Hold ({self.max_hold_days} days)"
+                    else:
+                        exit_reason = "Bearish signal exit (Aggressive 50%)"
+                    entry_signal = reason_text(signal[i, k], a['buy_confidence'][i, k], a['sell_confidence'][i, k],
+                                               a['reason_codes'][i, k], a['rsi'][i, k])
+                    close_position(k, i, current_close[k], exit_reason, entry_signal)
+
+            # === ENTRY LOGIC: highest confidence first, limited by free slots and cash ===
+            candidates = np.flatnonzero((signal[i] == "BUY") & (confidence[i] >= self.entry_level_confidence) &
+                                        (position == 0) & traded)
+            free_slots = self.max_positions - np.count_nonzero(position)
+            if len(candidates) and free_slots > 0:
+                candidates = candidates[np.argsort(-confidence[i, candidates], kind='stable')][:free_slots]
+                portfolio_value = cash + np.nansum(position * marks[i - 1]) if i else cash
+                for k in candidates:
+                    position_size = 0.8 if confidence[i, k] >= 75 else 0.6
+                    budget = min(portfolio_value * position_size / self.max_positions, cash)
+                    shares = int(budget // opens[i, k])
+                    if shares <= 0:
+                        continue
+                    position[k] = shares
+                    entry_price[k] = opens[i, k]  # Execute at the open
+                    entry_bar[k] = i
+                    entry_confidence[k] = confidence[i, k]
+                    cash -= shares * opens[i, k]
+
+            invested[i] = np.nansum(position * marks[i])
+            equity[i] = cash + invested[i]
+
+        # Close open positions at each ticker's last close
+        for k in np.flatnonzero(position > 0):
+            last_bar = np.flatnonzero(~np.isnan(closes[:, k]))[-1]
+            close_position(k, last_bar, closes[last_bar, k], 'End of backtest period', 'Forced exit')
+
+        self.equity_curve = pd.DataFrame({'equity': equity, 'exposure': invested / equity}, index=dates)
+        return trades.sorted_by('exit_date'), cash
@@ -0,0 +1,111 @@
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+class Profiler:
+    """
+    Optional wall time, call count and allocated bytes per indicator and per pipeline
+    stage (fetch, validate, signal, plan, backtest, report). Disabled, a measured call
+    costs one attribute check. Allocated bytes are the tracemalloc peak above the level
+    at entry, so they are only counted while tracing, which also slows the code down;
+    compare runs profiled the same way. Measurements nest and are inclusive: MACD's
+    figures contain the EMAs it computed through the registry.
+    """
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.stats = {}   # (kind, name) -> [calls, seconds, allocated_bytes]
+        self._peaks = []  # Highest traced memory seen so far inside each open measurement
+        self._started_tracing = False
+
+    def enable(self):
+        self.enabled = True
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self):
+        self.stats.clear()
+
+    def measure(self, kind, name):
+        """Context manager adding one call of (kind, name); a no-op while disabled"""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(kind, name)
+
+    @contextmanager
+    def _measure(self, kind, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            start_memory, peak = tracemalloc.get_traced_memory()
+            # reset_peak below would lose the enclosing measurement's peak, so keep it
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(start_memory)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            allocated = 0
+            if tracing:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                allocated = peak - start_memory
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+            entry = self.stats.setdefault((kind, name), [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += allocated
+
+    def to_dict(self):
+        """{kind: {name: {'calls', 'seconds', 'allocated_bytes'}}}, slowest first"""
+        result = {}
+        for (kind, name), (calls, seconds, allocated) in sorted(self.stats.items(), key=lambda item: -item[1][1]):
+            result.setdefault(kind, {})[name] = {'calls': calls, 'seconds': seconds, 'allocated_bytes': allocated}
+        return result
+
+    def merge(self, snapshot):
+        """Add a to_dict() snapshot, e.g. one sent back by a worker process"""
+        for kind, entries in snapshot.items():
+            for name, figures in entries.items():
+                entry = self.stats.setdefault((kind, name), [0, 0.0, 0])
+                entry[0] += figures['calls']
+                entry[1] += figures['seconds']
+                entry[2] += figures['allocated_bytes']
+
+    def to_prometheus(self, prefix='idx_profile'):
+        """Prometheus text exposition format, one counter per figure labelled by kind and name"""
+        metrics = [
+            ('calls_total', 0, "Calls measured"),
+            ('seconds_total', 1, "Wall time in seconds"),
+            ('allocated_bytes_total', 2, "Peak traced allocation above entry, summed over calls"),
+        ]
+        lines = []
+        for suffix, position, help_text in metrics:
+            metric = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}, per indicator and pipeline stage")
+            lines.append(f"# TYPE {metric} counter")
+            for (kind, name), figures in sorted(self.stats.items()):
+                lines.append(f'{metric}{{kind="{kind}",name="{name}"}} {figures[position]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix='idx_profile'):
+        """Write to_prometheus() atomically (a textfile collector may read it at any moment)"""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(temporary, path)
+        return path
+
+
+# Shared by the indicator registry, SignalGenerator and the entry points; off unless enabled
+default_profiler = Profiler()
@@ -1,5 +1,7 @@
 import pandas as pd
 from technical_indicators import TechnicalIndicators
+from indicator_registry import default_registry
+from trade_log import TradeLog, trade_frame
 from prettytable import PrettyTable
 import matplotlib
 # Set the backend to Agg (non-interactive) before importing pyplot
@@ -11,27 +13,26 @@ import numpy as np
 from datetime import datetime
 
 class ReportGenerator:
-    def __init__(self):
+    def __init__(self, registry=None):
         self.indicators = TechnicalIndicators()
+        self.registry = registry if registry is not None else default_registry
     
     def generate_comprehensive_report(self, data, signal_result, trading_plan, backtest_results, trades):
         current_price = data['Close'].iloc[-1]
         current_date = data.index[-1]
         
-        signal, reason, confidence, confidence_reasons, indicator_values = signal_result
-        
-        # Calculate Fibonacci levels for report
-        fib_levels, swing_high, swing_low, fib_range = self.indicators.calculate_fibonacci_levels(data)
+        # Fibonacci levels for report (already computed by the signal run on this frame)
+        fib_levels, swing_high, swing_low, fib_range = self.registry.get(data, 'fibonacci_levels')
         
         report = {
             'stock_data': data,
             'current_price': current_price,
             'current_date': current_date,
-            'signal': signal,
-            'reason': reason,
-            'confidence': confidence,
-            'confidence_reasons': confidence_reasons,
-            'indicator_values': indicator_values,
+            'signal': signal_result.signal,
+            'confidence': signal_result.confidence,
+            # SignalResult: reason text is rendered from its reason bits by print_report
+            'signal_result': signal_result,
+            'indicator_values': signal_result.indicator_values,
             'fib_levels': fib_levels,
             'swing_high': swing_high,
             'swing_low': swing_low,
@@ -50,7 +51,7 @@ class ReportGenerator:
         print(f"🏢 Stock: {stock_code} | 📅 Date: {report['current_date'].strftime('%Y-%m-%d')}")
         print(f"💰 Current Price: {report['current_price']:,.0f} IDR")
         print(f"📊 Signal: {report['signal']} | 🔒 Confidence: {report['confidence']}%")
-        print(f"📝 Reason: {report['reason']}")
+        print(f"📝 Reason: {report['signal_result'].reason}")
         
         # # Technical Indicators Summary
         # print(f"\n--- 📈 TECHNICAL INDICATORS SUMMARY ---")
@@ -289,6 +290,12 @@ class ReportGenerator:
             perf_table.add_row(["Profit Factor", f"{perf['profit_factor']:.2f}", "🟢 EXCELLENT" if perf['profit_factor'] >= 2.0 else "🟢 GOOD" if perf['profit_factor'] >= 1.5 else "🔴 POOR"])
             perf_table.add_row(["Avg Hold Days", f"{perf['avg_hold_days']:.1f}", "📅"])
             perf_table.add_row(["Max Drawdown", f"{perf['max_drawdown_pct']:.1f}%", "🟢 LOW" if perf['max_drawdown_pct'] < 10 else "🔴 HIGH"])
+            if 'sharpe_ratio' in perf:
+                perf_table.add_row(["Equity Drawdown (MTM)", f"{perf['equity_max_drawdown_pct']:.1f}% / {perf['max_drawdown_duration']}d", "🟢 LOW" if perf['equity_max_drawdown_pct'] < 10 else "🔴 HIGH"])
+                perf_table.add_row(["Sharpe Ratio", f"{perf['sharpe_ratio']:.2f}", "🟢 GOOD" if perf['sharpe_ratio'] >= 1 else "🔴 POOR"])
+                perf_table.add_row(["Sortino Ratio", f"{perf['sortino_ratio']:.2f}", "🟢 GOOD" if perf['sortino_ratio'] >= 1.5 else "🔴 POOR"])
+                perf_table.add_row(["Volatility (Annual)", f"{perf['volatility_pct']:.1f}%", "📊"])
+                perf_table.add_row(["Time in Market", f"{perf['time_in_market_pct']:.1f}%", "⏱️"])
             
             print(perf_table)
             
@@ -448,7 +455,7 @@ class ReportGenerator:
         
         # Confidence Builders
         print(f"\n--- 🎯 CONFIDENCE BUILDERS ---")
-        confidence_reasons = report['confidence_reasons']
+        confidence_reasons = report['signal_result'].conditions
         for reason in confidence_reasons[:8]:  # Show top 8 reasons
             print(f"✅ {reason}")
         
@@ -476,23 +483,26 @@ class ReportGenerator:
         if not recent_trades:
             return
             
-        winning_trades = [t for t in recent_trades if t['pnl'] > 0]
-        losing_trades = [t for t in recent_trades if t['pnl'] < 0]
+        recent_trades = TradeLog.from_records(recent_trades)
+        pnl = recent_trades.column('pnl')
+        pnl_pct = recent_trades.column('pnl_pct')
+        winning = pnl > 0
+        losing = pnl < 0
         
-        total_return = sum(t['pnl'] for t in recent_trades)
-        avg_hold_days = sum(t['hold_days'] for t in recent_trades) / len(recent_trades)
+        total_return = pnl.sum()
+        avg_hold_days = recent_trades.column('hold_days').mean()
         
         print(f"\n📊 RECENT TRADE SUMMARY:")
         print(f"   📈 Total Return: {total_return:>12,.0f} IDR")
-        print(f"   🎯 Win Rate:     {len(winning_trades)/len(recent_trades)*100:>11.1f}%")
+        print(f"   🎯 Win Rate:     {winning.mean()*100:>11.1f}%")
         print(f"   📅 Avg Hold Days: {avg_hold_days:>10.1f}")
         
-        if winning_trades:
-            avg_win = sum(t['pnl_pct'] for t in winning_trades) / len(winning_trades)
+        if winning.any():
+            avg_win = pnl_pct[winning].mean()
             print(f"   📊 Avg Win:       {avg_win:>11.1f}%")
         
-        if losing_trades:
-            avg_loss = sum(t['pnl_pct'] for t in losing_trades) / len(losing_trades)
+        if losing.any():
+            avg_loss = pnl_pct[losing].mean()
             print(f"   📉 Avg Loss:      {avg_loss:>11.1f}%")
     
     def generate_pnl_graph(self, trades, stock_code, save_path='pnl_charts'):
@@ -509,7 +519,7 @@ class ReportGenerator:
                 os.makedirs(save_path)
             
             # Convert trades to DataFrame for easier processing
-            df_trades = pd.DataFrame(trades)
+            df_trades = trade_frame(trades)
             df_trades = df_trades.sort_values('exit_date')
             
             # Create figure with subplots
@@ -623,7 +633,7 @@ class ReportGenerator:
             if not os.path.exists(save_path):
                 os.makedirs(save_path)
             
-            df_trades = pd.DataFrame(trades)
+            df_trades = trade_frame(trades)
             df_trades = df_trades.sort_values('exit_date')
             
             # Simple plot with minimal features
@@ -1,13 +1,29 @@
 from technical_indicators import TechnicalIndicators
 from volume_profile import VolumeProfileCalculator
 from bollinger_bands import BollingerBandsCalculator
+from indicator_frame import IndicatorFrame
+from indicator_registry import default_registry
+from signal_reasons import SignalReason
+from indicator_values import LazyIndicatorValues
+from signal_result import SignalResult
+import functools
+import math
 import numpy as np, pandas as pd
 
 class SignalGenerator:
-    def __init__(self):
+    # Longest plain window the latest-bar indicators read (SMA100; Ichimoku needs 52 + 26, Fibonacci 60)
+    LIVE_MIN_BARS = 100
+    # Weight the dropped history may still carry in the slowest EMA (EMA50) in live mode
+    LIVE_EMA_TOLERANCE = 1e-4
+
+    def __init__(self, registry=None):
         self.indicators = TechnicalIndicators()
         self.volume_calculator = VolumeProfileCalculator()
         self.bollinger_calculator = BollingerBandsCalculator()
+        # Indicator memo shared with Backtester / ReportGenerator working on the same frame
+        self.registry = registry if registry is not None else default_registry
+        # Measures the registry's indicators plus the live-path sections and the rule scoring
+        self.profiler = self.registry.profiler
     
     def generate_signal(self, data):
         """
@@ -16,42 +32,394 @@ class SignalGenerator:
         to be validated by a Volume Surge. Aims to filter out low-conviction Stop-Outs.
         """
         if len(data) < 100:
-            return "HOLD", "Insufficient data", 0, ["Insufficient data"], {}
+            return SignalResult.insufficient_data()
+
+        values = self.calculate_indicator_values(data)
+        with self.profiler.measure('indicator', 'signal_rules'):
+            return self.score_indicator_values(values)
+
+    @staticmethod
+    def live_window(tolerance=LIVE_EMA_TOLERANCE, ema_span=50):
+        """
+        Bars generate_signal_live keeps: enough for every rolling window, and enough for an
+        EMA seeded at the first kept bar to carry at most `tolerance` of its seed error
+        ((1 - alpha)^n <= tolerance; 231 bars for EMA50 at the default 1e-4)
+        """
+        alpha = 2.0 / (ema_span + 1)
+        ema_bars = math.ceil(math.log(tolerance) / math.log(1 - alpha))
+        return max(SignalGenerator.LIVE_MIN_BARS, ema_bars)
+
+    def generate_signal_live(self, data, tolerance=LIVE_EMA_TOLERANCE):
+        """
+        generate_signal for the latest bar only, for live rescans. Reads the trailing
+        live_window bars and computes just the last value of each indicator with NumPy
+        instead of full-history rolling series. SMA, RSI, Stochastic, Bollinger, volume
+        profile, ATR, Ichimoku and Fibonacci values are the same; EMA/MACD values differ
+        from the full-history ones by at most tolerance x |EMA - Close| at the cut, far
+        below one IDX tick at the default 1e-4.
+        """
+        if len(data) < 100:
+            return SignalResult.insufficient_data()
+
+        values = self.calculate_live_indicator_values(data, tolerance)
+        with self.profiler.measure('indicator', 'signal_rules'):
+            return self.score_indicator_values(values)
+
+    def generate_signal_at(self, frame, i):
+        """
+        Same result as generate_signal(data.iloc[:i+1]) but reads bar i of a
+        precomputed IndicatorFrame instead of recomputing the whole prefix.
+        """
+        if i + 1 < 100:
+            return SignalResult.insufficient_data()
+
+        return self.score_indicator_values(frame.row(i))
+
+    def generate_signals(self, data, frame=None):
+        """
+        Vectorized generate_signal for every bar of the history at once. The same
+        rules are evaluated as boolean arrays over an IndicatorFrame, so bar i
+        scores exactly like generate_signal(data.iloc[:i+1]).
+        Returns a dict of arrays: signal, confidence, buy_confidence,
+        sell_confidence, reason_codes (SignalReason bitmask) and rsi.
+        """
+        if frame is None:
+            frame = self.registry.get(data, 'indicator_frame')
+        c = frame.columns
+
+        def col(name):
+            return c[name].to_numpy(dtype=float)
+
+        def truthy(values):
+            # Scalar rules treat None (NaN here) and 0 as "level not available"
+            return ~np.isnan(values) & (values != 0)
+
+        n = len(c)
+        price = col('current_price')
+        rsi = col('rsi')
+        sma_5, sma_10, sma_20, sma_50, sma_100 = (col(f'sma_{w}') for w in [5, 10, 20, 50, 100])
+        ema_50 = col('ema_50')
+        macd, macd_signal = col('macd'), col('macd_signal')
+        stochastic_k, stochastic_d = col('stochastic_k'), col('stochastic_d')
+        bb_support, bb_resistance = col('bb_support'), col('bb_resistance')
+        volume_resistance = col('volume_resistance')
+        squeeze = c['bb_squeeze'].to_numpy(dtype=bool)
+        current_volume, avg_volume = col('current_volume'), col('avg_volume')
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            volume_surge = (avg_volume > 0) & (current_volume / avg_volume > 1.8)
+
+            # ===== CORE TREND & CONDITIONS =====
+            long_term_uptrend = (price > sma_50) & (sma_50 > sma_100)
+            medium_term_uptrend = (price > sma_20) & (sma_20 > sma_50)
+            long_term_downtrend = (price < sma_50) & (sma_50 < sma_100)
+            medium_term_downtrend = (price < sma_20) & (sma_20 < sma_50)
+            macd_bullish = macd > macd_signal
+            macd_crossing_up_from_neg = macd_bullish & (macd_signal < 0)
+
+            is_below_short_ma = price < sma_10
+            is_at_ma_support = np.zeros(n, dtype=bool)
+            for ma_value in [sma_20, sma_50, ema_50]:
+                is_at_ma_support |= np.abs(price - ma_value) / price <= 0.02
+            is_at_bb_support = truthy(bb_support) & (price <= bb_support * 1.02)
+            is_at_dip_support = is_at_ma_support | is_at_bb_support
+
+            is_at_resistance = (truthy(volume_resistance) & (price >= volume_resistance * 0.98)) | \
+                               (truthy(bb_resistance) & (price >= bb_resistance * 0.98))
+            is_extended = (price > sma_5) & (sma_5 > sma_10) & (sma_10 > sma_20)
+            is_overbought = (rsi > 70) | (stochastic_k > 80)
+            is_oversold = (rsi < 30) | (stochastic_k < 20)
+            is_reversal_confirmation = (rsi > 30) & (rsi < 50) & (stochastic_k > stochastic_d)
+            is_extended_bullish = is_extended & (price > sma_5)
+
+        reason_codes = np.zeros(n, dtype=np.int64)
+
+        def fire(condition, flag):
+            reason_codes[condition] |= int(flag)
+
+        # ===== BUY CONFIDENCE =====
+        dip_setup = is_at_dip_support & is_below_short_ma
+        macd_bullish_only = macd_bullish & ~macd_crossing_up_from_neg
+        buy_confidence = (
+            30 * long_term_uptrend + 10 * medium_term_uptrend +
+            35 * dip_setup + 5 * (dip_setup & is_at_ma_support) + 20 * (dip_setup & is_reversal_confirmation) +
+            25 * macd_crossing_up_from_neg + 10 * macd_bullish_only +
+            10 * volume_surge + 5 * squeeze
+        ).astype(np.int64)
+        fire(long_term_uptrend, SignalReason.LONG_TERM_UPTREND)
+        fire(medium_term_uptrend, SignalReason.MED_TERM_UPTREND)
+        fire(dip_setup, SignalReason.DIP_SUPPORT)
+        fire(dip_setup & is_at_ma_support, SignalReason.MA_SUPPORT)
+        fire(dip_setup & is_reversal_confirmation, SignalReason.REVERSAL_CONFIRMED)
+        fire(macd_crossing_up_from_neg, SignalReason.MACD_CROSS_UP)
+        fire(macd_bullish_only, SignalReason.MACD_BULLISH)
+        fire(volume_surge, SignalReason.VOLUME_SURGE)
+        fire(squeeze, SignalReason.BOLLINGER_SQUEEZE)
+
+        # --- BUY PENALTIES ---
+        buy_confidence[is_overbought] = 0
+        fire(is_overbought, SignalReason.BUY_VETO_OVERBOUGHT)
+        buy_confidence -= 45 * is_extended
+        fire(is_extended, SignalReason.CHASING_PENALTY)
+        falling_knife = is_at_bb_support & is_oversold
+        buy_confidence -= 15 * falling_knife
+        fire(falling_knife, SignalReason.FALLING_KNIFE_PENALTY)
+
+        # --- VOLUME CONFIRMATION VETO ---
+        volume_veto = (buy_confidence > 0) & (buy_confidence < 80) & ~volume_surge
+        buy_confidence[volume_veto] = 0
+        fire(volume_veto, SignalReason.BUY_VETO_NO_VOLUME)
+
+        # ===== SELL CONFIDENCE (raging bull vetoes every other sell rule) =====
+        is_raging_bull = long_term_uptrend & medium_term_uptrend & macd_bullish
+        active = ~is_raging_bull
+        fire(is_raging_bull, SignalReason.SELL_VETO_RAGING_BULL)
+        medium_only = medium_term_downtrend & ~long_term_downtrend
+        macd_bearish = ~macd_bullish
+        sell_confidence = (
+            50 * long_term_downtrend + 15 * medium_only +
+            40 * is_overbought + 25 * is_at_resistance + 15 * macd_bearish
+        ).astype(np.int64)
+        fire(active & long_term_downtrend, SignalReason.LONG_TERM_DOWNTREND)
+        fire(active & medium_only, SignalReason.MED_TERM_DOWNTREND)
+        fire(active & is_overbought, SignalReason.OVERBOUGHT)
+        fire(active & is_at_resistance, SignalReason.AT_RESISTANCE)
+        fire(active & macd_bearish, SignalReason.MACD_BEARISH)
+        sell_confidence[is_oversold] = 0
+        fire(active & is_oversold, SignalReason.SELL_VETO_OVERSOLD)
+        sell_confidence -= 25 * is_at_dip_support
+        fire(active & is_at_dip_support, SignalReason.DIP_SUPPORT_PENALTY)
+        protective = is_extended_bullish & (sell_confidence > 40)
+        sell_confidence[protective] = 40
+        fire(active & protective, SignalReason.PROTECTIVE_VETO)
+        sell_confidence[is_raging_bull] = 0
+
+        # Clamp confidence values
+        buy_confidence = np.clip(buy_confidence, 0, 100)
+        sell_confidence = np.clip(sell_confidence, 0, 100)
+
+        # ===== FINAL SIGNAL =====
+        signal_threshold = 50
+        signal = np.full(n, "HOLD", dtype=object)
+        signal[(buy_confidence > sell_confidence) & (buy_confidence >= signal_threshold)] = "BUY"
+        signal[(sell_confidence > buy_confidence) & (sell_confidence >= signal_threshold)] = "SELL"
+        confidence = np.maximum(buy_confidence, sell_confidence)
+
+        # Bars without 100 candles of history return the "Insufficient data" HOLD
+        warmup = np.arange(n) < 99
+        signal[warmup] = "HOLD"
+        buy_confidence[warmup] = 0
+        sell_confidence[warmup] = 0
+        confidence[warmup] = 0
+        reason_codes[warmup] = int(SignalReason.INSUFFICIENT_DATA)
+
+        return {
+            'signal': signal,
+            'confidence': confidence,
+            'buy_confidence': buy_confidence,
+            'sell_confidence': sell_confidence,
+            'reason_codes': reason_codes,
+            'rsi': rsi
+        }
+
+    def calculate_indicator_values(self, data):
+        """
+        Latest-bar value of every indicator the signal rules read, as a LazyIndicatorValues:
+        each indicator is fetched from the registry the first time a rule or consumer reads it
+        """
+        registry = self.registry
 
+        # Every series comes from the registry, so MACD reuses EMA12/26 and later
+        # consumers of the same frame (backtest, report) reuse all of them
+        def last(name, position=None, **params):
+            def load():
+                value = registry.get(data, name, **params)
+                if position is not None:
+                    value = value[position]
+                return value.iloc[-1]
+            return load
+
+        def part(name, position):
+            return lambda: registry.get(data, name)[position]
+
+        return LazyIndicatorValues({
+            'current_price': lambda: data['Close'].iloc[-1],
+            'rsi': last('rsi'),
+            **{f'sma_{window}': last('sma', window=window) for window in IndicatorFrame.SMA_WINDOWS},
+            **{f'ema_{window}': last('ema', window=window) for window in IndicatorFrame.EMA_WINDOWS},
+            'macd': last('macd'), 'macd_signal': last('macd_signal'), 'macd_histogram': last('macd_histogram'),
+            'stochastic_k': last('stochastic', 0), 'stochastic_d': last('stochastic', 1),
+            'volume_support': part('volume_profile', 0), 'volume_resistance': part('volume_profile', 1),
+            'poc': part('volume_profile', 2),
+            'bb_support': part('bollinger_bands', 0), 'bb_resistance': part('bollinger_bands', 1),
+            'bb_middle': part('bollinger_bands', 2), 'bb_squeeze': lambda: registry.get(data, 'bollinger_squeeze'),
+            'current_volume': lambda: data['Volume'].iloc[-1],
+            'avg_volume': lambda: data['Volume'].tail(20).mean(),
+            'atr': lambda: registry.get(data, 'atr'),
+            'ichimoku': lambda: registry.get(data, 'ichimoku'),
+            'fib_levels': part('fibonacci_levels', 0)
+        })
+
+    def calculate_live_indicator_values(self, data, tolerance=LIVE_EMA_TOLERANCE):
+        """
+        calculate_indicator_values from the trailing live_window bars (see generate_signal_live),
+        also lazy: each indicator's last value is computed with NumPy when first read
+        """
+        tail = data.tail(self.live_window(tolerance))
+        close = tail['Close'].to_numpy(dtype=float)
+        high = tail['High'].to_numpy(dtype=float)
+        low = tail['Low'].to_numpy(dtype=float)
+        volume = tail['Volume'].to_numpy(dtype=float)
         current_price = data['Close'].iloc[-1]
-        
-        # ===== 1. CALCULATE ALL INDICATORS (Stable Configuration) =====
-        rsi = self.indicators.calculate_rsi(data).iloc[-1]
-        sma_5 = self.indicators.calculate_sma(data, 5).iloc[-1]
-        sma_10 = self.indicators.calculate_sma(data, 10).iloc[-1]
-        sma_20 = self.indicators.calculate_sma(data, 20).iloc[-1]
-        sma_50 = self.indicators.calculate_sma(data, 50).iloc[-1]
-        sma_100 = self.indicators.calculate_sma(data, 100).iloc[-1]
-        ema_50 = self.indicators.calculate_ema(data, 50).iloc[-1]
-        ema_5 = self.indicators.calculate_ema(data, 5).iloc[-1]
-        ema_10 = self.indicators.calculate_ema(data, 10).iloc[-1]
-        ema_20 = self.indicators.calculate_ema(data, 20).iloc[-1]
-        
-        macd, macd_signal, macd_histogram = self.indicators.calculate_macd(data)
-        current_macd = macd.iloc[-1]
-        current_macd_signal = macd_signal.iloc[-1]
-        current_macd_histogram = macd_histogram.iloc[-1] if hasattr(macd_histogram, 'iloc') else macd_histogram 
-        
-        stochastic_k, stochastic_d = self.indicators.calculate_stochastic(data)
-        current_stochastic_k = stochastic_k.iloc[-1]
-        current_stochastic_d = stochastic_d.iloc[-1]
+        last = len(close) - 1
 
-        volume_support, volume_resistance, poc = self.volume_calculator.calculate_volume_profile(data)
-        bb_support, bb_resistance, bb_middle = self.bollinger_calculator.calculate_bollinger_bands(data)
-        squeeze = self.bollinger_calculator.calculate_bollinger_squeeze(data)
-        
-        current_volume = data['Volume'].iloc[-1]
-        avg_volume = data['Volume'].tail(20).mean()
+        def ema(values, span):
+            # ewm(span, adjust=False) seeded at the first kept bar
+            alpha = 2.0 / (span + 1)
+            result = np.empty(len(values))
+            result[0] = values[0]
+            for i in range(1, len(values)):
+                result[i] = alpha * values[i] + (1 - alpha) * result[i - 1]
+            return result
+
+        def midpoint(window, end):
+            # (highest high + lowest low) / 2 over the window ending at position end
+            if end - window + 1 < 0:
+                return np.nan
+            return (high[end - window + 1:end + 1].max() + low[end - window + 1:end + 1].min()) / 2
+
+        def lazy(name):
+            # Computed once, on first read, with the NumPy warnings the NaN-tolerant rules expect silenced
+            def wrap(compute):
+                @functools.cache
+                def load():
+                    with self.profiler.measure('indicator', f'live.{name}'), \
+                            np.errstate(invalid='ignore', divide='ignore'):
+                        return compute()
+                return load
+            return wrap
+
+        # ===== TREND & MOMENTUM =====
+        @lazy('rsi')
+        def rsi():
+            delta = np.diff(close[-15:])
+            value = 100 - (100 / (1 + np.where(delta > 0, delta, 0).mean() / np.where(delta < 0, -delta, 0).mean()))
+            return 50 if np.isnan(value) else value
+
+        @lazy('macd')
+        def macd():
+            macd_line = ema(close, 12) - ema(close, 26)
+            current_macd, current_macd_signal = macd_line[-1], ema(macd_line, 9)[-1]
+            return current_macd, current_macd_signal, current_macd - current_macd_signal
+
+        @lazy('stochastic')
+        def stochastic():
+            windows = np.lib.stride_tricks.sliding_window_view
+            lowest = windows(low[-16:], 14).min(axis=1)
+            highest = windows(high[-16:], 14).max(axis=1)
+            stochastic_k = 100 * ((close[-3:] - lowest) / (highest - lowest))
+            return stochastic_k[-1], stochastic_k.mean()
+
+        # ===== BOLLINGER BANDS (same adjustments as calculate_bollinger_bands) =====
+        @lazy('bollinger_bands')
+        def bollinger():
+            bb_middle = close[-20:].mean()
+            bb_std = close[-20:].std(ddof=1)
+            bb_support = bb_middle - (bb_std * 2)
+            bb_resistance = bb_middle + (bb_std * 2)
+            bb_support, bb_resistance, bb_middle = (None if np.isnan(value) else value
+                                                    for value in (bb_support, bb_resistance, bb_middle))
+            if bb_support and bb_support > current_price:
+                bb_support = current_price * 0.98
+            if bb_resistance and bb_resistance < current_price:
+                bb_resistance = current_price * 1.02
+            squeeze = self.bollinger_calculator.calculate_bollinger_squeeze(
+                tail, bands=(bb_support, bb_resistance, bb_middle))
+            return bb_support, bb_resistance, bb_middle, squeeze
+
+        # ===== VOLUME =====
+        @lazy('volume_profile')
+        def volume_profile():
+            return self.volume_calculator.calculate_volume_profile_arrays(high[-20:], low[-20:], volume[-20:], close[-1])
+
+        # ===== ATR =====
+        @lazy('atr')
+        def atr():
+            previous_close = close[-15:-1]
+            true_range = np.fmax(high[-14:] - low[-14:], np.abs(high[-14:] - previous_close))
+            true_range = np.fmax(true_range, np.abs(low[-14:] - previous_close))
+            value = true_range.mean()
+            return 0 if np.isnan(value) else value
+
+        # ===== ICHIMOKU (spans at the last bar were computed 26 bars earlier) =====
+        @lazy('ichimoku')
+        def ichimoku():
+            tenkan_sen, previous_tenkan = midpoint(9, last), midpoint(9, last - 1)
+            kijun_sen, previous_kijun = midpoint(26, last), midpoint(26, last - 1)
+            senkou_span_a = (midpoint(9, last - 26) + midpoint(26, last - 26)) / 2
+            senkou_span_b = midpoint(52, last - 26)
+            cloud_top = max(senkou_span_a, senkou_span_b)
+            cloud_bottom = min(senkou_span_a, senkou_span_b)
+            return {
+                'tenkan_sen': tenkan_sen,
+                'kijun_sen': kijun_sen,
+                'senkou_span_a': senkou_span_a,
+                'senkou_span_b': senkou_span_b,
+                'chikou_span': np.nan,
+                'cloud_top': cloud_top,
+                'cloud_bottom': cloud_bottom,
+                'cloud_bullish': senkou_span_a > senkou_span_b,
+                'price_above_cloud': current_price > cloud_top,
+                'price_below_cloud': current_price < cloud_bottom,
+                'price_in_cloud': cloud_bottom <= current_price <= cloud_top,
+                'tk_cross_bullish': tenkan_sen > kijun_sen and previous_tenkan <= previous_kijun,
+                'tk_cross_bearish': tenkan_sen < kijun_sen and previous_tenkan >= previous_kijun,
+                'valid': True
+            }
+
+        @lazy('fibonacci_levels')
+        def fib_levels():
+            return self.indicators.calculate_fibonacci_levels(tail)[0]
+
+        return LazyIndicatorValues({
+            'rsi': rsi,
+            **{f'sma_{window}': lazy(f'sma_{window}')(lambda window=window: close[-window:].mean())
+               for window in IndicatorFrame.SMA_WINDOWS},
+            **{f'ema_{window}': lazy(f'ema_{window}')(lambda window=window: ema(close, window)[-1])
+               for window in IndicatorFrame.EMA_WINDOWS},
+            'macd': lambda: macd()[0], 'macd_signal': lambda: macd()[1], 'macd_histogram': lambda: macd()[2],
+            'stochastic_k': lambda: stochastic()[0], 'stochastic_d': lambda: stochastic()[1],
+            'volume_support': lambda: volume_profile()[0], 'volume_resistance': lambda: volume_profile()[1],
+            'poc': lambda: volume_profile()[2],
+            'bb_support': lambda: bollinger()[0], 'bb_resistance': lambda: bollinger()[1],
+            'bb_middle': lambda: bollinger()[2], 'bb_squeeze': lambda: bollinger()[3],
+            'current_volume': lambda: data['Volume'].iloc[-1],
+            'avg_volume': lambda: data['Volume'].tail(20).mean(),
+            'atr': atr, 'ichimoku': ichimoku, 'fib_levels': fib_levels
+        }, {'current_price': current_price})
+
+    def score_indicator_values(self, values):
+        """
+        Apply the signal rules to the values returned by calculate_indicator_values.
+        Only what the rules need is read (resistance levels only when a sell rule can use
+        them), so with a lazy mapping the indicators nobody reads are never computed.
+        Returns a SignalResult: the rules that fired are SignalReason bits, rendered as
+        text only when its reason/conditions are read, and its indicator_values reads
+        the rest through from `values` on demand.
+        """
+        current_price = values['current_price']
+        rsi = values['rsi']
+        sma_5, sma_10, sma_20 = values['sma_5'], values['sma_10'], values['sma_20']
+        sma_50, sma_100 = values['sma_50'], values['sma_100']
+        ema_50 = values['ema_50']
+        current_macd = values['macd']
+        current_macd_signal = values['macd_signal']
+        current_stochastic_k = values['stochastic_k']
+        current_stochastic_d = values['stochastic_d']
+        bb_support = values['bb_support']
+        squeeze = values['bb_squeeze']
+        current_volume, avg_volume = values['current_volume'], values['avg_volume']
         volume_surge = avg_volume > 0 and current_volume / avg_volume > 1.8 # Volume Surge (1.8x avg)
-        
-        atr = self.indicators.calculate_atr(data)
-        ichimoku = self.indicators.calculate_ichimoku_cloud(data)
-        fib_levels, swing_high, swing_low, fib_range = self.indicators.calculate_fibonacci_levels(data)
 
         # ===== 2. DEFINE CORE TREND & CONDITIONS (Stable Logic) =====
 
@@ -73,8 +441,6 @@ class SignalGenerator:
         is_at_bb_support = bb_support and current_price <= bb_support * 1.02
         is_at_dip_support = is_at_ma_support or is_at_bb_support
 
-        is_at_resistance = (volume_resistance and current_price >= volume_resistance * 0.98) or \
-                                (bb_resistance and current_price >= bb_resistance * 0.98)
         is_extended = current_price > sma_5 > sma_10 > sma_20
         is_overbought = rsi > 70 or current_stochastic_k > 80
         is_oversold = rsi < 30 or current_stochastic_k < 20
@@ -86,160 +452,134 @@ class SignalGenerator:
         
         buy_confidence = 0
         sell_confidence = 0
-        buy_reasons_raw = []
-        sell_reasons_raw = []
+        codes = SignalReason.NONE  # Rules fired; the text is rendered only when displayed
 
         # --- BUY CONFIDENCE LOGIC (Stable Weights + Ichimoku) ---
 
         if long_term_uptrend:
             buy_confidence += 30 
-            buy_reasons_raw.append("Long-term uptrend (+30)")
+            codes |= SignalReason.LONG_TERM_UPTREND
             
         if medium_term_uptrend:
             buy_confidence += 10 
-            buy_reasons_raw.append("Med-term uptrend (+10)")
+            codes |= SignalReason.MED_TERM_UPTREND
                 
         if is_at_dip_support and is_below_short_ma:
             buy_confidence += 35 
-            buy_reasons_raw.append("KEY: At Dip Support & Pulled Back (+35)")
+            codes |= SignalReason.DIP_SUPPORT
             
             if is_at_ma_support:
                 buy_confidence += 5 
-                buy_reasons_raw.append("MA Support Hit (+5)")
+                codes |= SignalReason.MA_SUPPORT
                 
             if is_reversal_confirmation:
                 buy_confidence += 20 
-                buy_reasons_raw.append("Reversal Confirmed (RSI/Stoch) (+20)")
+                codes |= SignalReason.REVERSAL_CONFIRMED
                 
         # ----------------------------------------
             
         if macd_crossing_up_from_neg:
             buy_confidence += 25
-            buy_reasons_raw.append("MACD Cross-up from Negative (+25)")
+            codes |= SignalReason.MACD_CROSS_UP
         elif macd_bullish:
             buy_confidence += 10 
-            buy_reasons_raw.append("MACD bullish (+10)")
+            codes |= SignalReason.MACD_BULLISH
                 
         if volume_surge:
             buy_confidence += 10
-            buy_reasons_raw.append("Volume surge (+10)")
+            codes |= SignalReason.VOLUME_SURGE
                 
         if squeeze:
             buy_confidence += 5 
-            buy_reasons_raw.append("Bollinger squeeze (+5)")
+            codes |= SignalReason.BOLLINGER_SQUEEZE
                 
         # --- BUY PENALTIES ---
         if is_overbought:
             buy_confidence = 0
-            buy_reasons_raw.append("BUY VETO: Overbought (-100)")
+            codes |= SignalReason.BUY_VETO_OVERBOUGHT
             
         if is_extended:
             buy_confidence -= 45
-            buy_reasons_raw.append("Chasing Penalty: Price Over-extended (-45)")
+            codes |= SignalReason.CHASING_PENALTY
             
         if is_at_bb_support and is_oversold:
             buy_confidence -= 15
-            buy_reasons_raw.append("Oversold/Falling Knife Penalty (-15)")
+            codes |= SignalReason.FALLING_KNIFE_PENALTY
 
         # **NEW: VOLUME CONFIRMATION VETO**
         # If the buy signal is not strong (under 80%) AND lacks volume confirmation, VETO.
         pre_veto_confidence = buy_confidence
         if pre_veto_confidence > 0 and pre_veto_confidence < 80 and not volume_surge:
             buy_confidence = 0 
-            buy_reasons_raw.append(f"BUY VETO: Low Confidence ({pre_veto_confidence}%) Lacks Volume Confirmation")
+            codes |= SignalReason.BUY_VETO_NO_VOLUME
 
         # --- SELL CONFIDENCE LOGIC (Retaining Protective Filter) ---
         is_raging_bull = long_term_uptrend and medium_term_uptrend and macd_bullish
 
         if is_raging_bull:
             sell_confidence = 0 
-            sell_reasons_raw.append("SELL VETO: Raging Bull Uptrend (0)")
+            codes |= SignalReason.SELL_VETO_RAGING_BULL
         else:
+            # Bands first: they were computed for the support rule, the volume profile may not be needed
+            is_at_resistance = self._near_resistance(values, 'bb_resistance') or \
+                               self._near_resistance(values, 'volume_resistance')
+
             if long_term_downtrend:
                 sell_confidence += 50
-                sell_reasons_raw.append("Long-term downtrend (+50)")
+                codes |= SignalReason.LONG_TERM_DOWNTREND
             elif medium_term_downtrend:
                 sell_confidence += 15
-                sell_reasons_raw.append("Med-term downtrend (+15)")
+                codes |= SignalReason.MED_TERM_DOWNTREND
 
             if is_overbought:
                 sell_confidence += 40
-                sell_reasons_raw.append(f"Overbought (RSI {rsi:.1f}) (+40)")
+                codes |= SignalReason.OVERBOUGHT
                 
             if is_at_resistance:
                 sell_confidence += 25
-                sell_reasons_raw.append("At resistance (+25)")
+                codes |= SignalReason.AT_RESISTANCE
                 
             if not macd_bullish:
                 sell_confidence += 15
-                sell_reasons_raw.append("MACD Bearish/Flat (+15)")
+                codes |= SignalReason.MACD_BEARISH
                 
             if is_oversold:
                 sell_confidence = 0
-                sell_reasons_raw.append("SELL VETO: Oversold (-100)")
+                codes |= SignalReason.SELL_VETO_OVERSOLD
             if is_at_dip_support:
                 sell_confidence -= 25
-                sell_reasons_raw.append("At Dip Support Penalty (-25)")
+                codes |= SignalReason.DIP_SUPPORT_PENALTY
                 
             if is_extended_bullish and sell_confidence > 40:
                 sell_confidence = 40 
-                sell_reasons_raw.append("PROTECTIVE VETO: Strong Bullish Extension (Cap to 40)")
+                codes |= SignalReason.PROTECTIVE_VETO
 
         # Clamp confidence values
         buy_confidence = min(max(buy_confidence, 0), 100)
         sell_confidence = min(max(sell_confidence, 0), 100)
         
-        # ===== 4. FINAL SIGNAL DETERMINATION & REASON GENERATION (Stable Threshold) =====
+        # ===== 4. FINAL SIGNAL DETERMINATION (Stable Threshold) =====
         
         signal = "HOLD"
         confidence = max(buy_confidence, sell_confidence)
         signal_threshold = 50 
         
-        final_buy_conditions = [r for r in buy_reasons_raw if "+" in r] 
-        final_sell_conditions = [r for r in sell_reasons_raw if "+" in r]
-        
-        reason = f"No clear setup (Buy: {buy_confidence}% | Sell: {sell_confidence}%)"
-        
         if buy_confidence > sell_confidence and buy_confidence >= signal_threshold:
             signal = "BUY"
             confidence = buy_confidence
-            reason = " | ".join(final_buy_conditions)
-            if "BUY VETO" in buy_reasons_raw: 
-                reason = f"BUY VETO: {reason}"
-                signal = "HOLD"
-                
         elif sell_confidence > buy_confidence and sell_confidence >= signal_threshold:
             signal = "SELL"
             confidence = sell_confidence
-            reason = " | ".join(final_sell_conditions)
-            if "SELL VETO" in sell_reasons_raw or "PROTECTIVE VETO" in sell_reasons_raw:
-                reason = f"SELL VETO (Protected/Oversold): {reason}"
-                signal = "HOLD"
-        else:
-            if buy_confidence > sell_confidence:
-                reason += " - Bullish bias"
-            elif sell_confidence > buy_confidence:
-                reason += " - Bearish bias"
-
-        # ===== 5. STORE INDICATOR VALUES (Corrected to include all variables) =====
-        indicator_values = {
-            'rsi': rsi, 'sma_20': sma_20, 'sma_50': sma_50, 'sma_5': sma_5, 'sma_10': sma_10, 'sma_100': sma_100,
-            'ema_5': ema_5, 'ema_10': ema_10, 'ema_20': ema_20, 'ema_50': ema_50,
-            'macd': current_macd, 'macd_signal': current_macd_signal, 'macd_histogram': current_macd_histogram, 'macd_bullish': macd_bullish,
-            'stochastic_k': current_stochastic_k, 'stochastic_d': current_stochastic_d,
-            'bb_upper': bb_resistance, 'bb_lower': bb_support, 'bb_support': bb_support, 'bb_resistance': bb_resistance, 'bb_squeeze': squeeze,
-            'volume_ratio': (current_volume / avg_volume) if avg_volume > 0 else 1,
-            'volume_support': volume_support, 'volume_resistance': volume_resistance, 'poc': poc,
-            'atr': atr, 'ichimoku': ichimoku, 'fib_levels': fib_levels,
-            'buy_confidence': buy_confidence, 'sell_confidence': sell_confidence, 
-            'long_term_uptrend': long_term_uptrend, 'is_at_dip_support': is_at_dip_support, 
-            'is_overbought': is_overbought, 'is_extended': is_extended,
-            'is_extended_bullish': is_extended_bullish,
-            'volume_surge': volume_surge # New Veto Logic
-        }
 
-        return signal, reason, confidence, final_buy_conditions + final_sell_conditions, indicator_values
+        return SignalResult(signal, confidence, buy_confidence, sell_confidence, int(codes), float(rsi),
+                            pre_veto_confidence, bool(is_at_dip_support), values)
+
 
+    @staticmethod
+    def _near_resistance(values, name):
+        """Price within 2% under an available resistance level"""
+        level = values[name]
+        return bool(level) and values['current_price'] >= level * 0.98
 
     def find_support_level(self, data, lookback=20):
         """Find recent support level using swing lows"""
@@ -0,0 +1,108 @@
+from enum import IntFlag
+
+class SignalReason(IntFlag):
+    """
+    One bit per rule SignalGenerator can fire. Declaration order is the order
+    the rules append their reason text, so rendering a mask reproduces the
+    reason lists of the scalar path.
+    """
+    NONE = 0
+    INSUFFICIENT_DATA = 1 << 0
+
+    # BUY rules
+    LONG_TERM_UPTREND = 1 << 1
+    MED_TERM_UPTREND = 1 << 2
+    DIP_SUPPORT = 1 << 3
+    MA_SUPPORT = 1 << 4
+    REVERSAL_CONFIRMED = 1 << 5
+    MACD_CROSS_UP = 1 << 6
+    MACD_BULLISH = 1 << 7
+    VOLUME_SURGE = 1 << 8
+    BOLLINGER_SQUEEZE = 1 << 9
+    BUY_VETO_OVERBOUGHT = 1 << 10
+    CHASING_PENALTY = 1 << 11
+    FALLING_KNIFE_PENALTY = 1 << 12
+    BUY_VETO_NO_VOLUME = 1 << 13
+
+    # SELL rules
+    SELL_VETO_RAGING_BULL = 1 << 14
+    LONG_TERM_DOWNTREND = 1 << 15
+    MED_TERM_DOWNTREND = 1 << 16
+    OVERBOUGHT = 1 << 17
+    AT_RESISTANCE = 1 << 18
+    MACD_BEARISH = 1 << 19
+    SELL_VETO_OVERSOLD = 1 << 20
+    DIP_SUPPORT_PENALTY = 1 << 21
+    PROTECTIVE_VETO = 1 << 22
+
+BUY_REASONS = (
+    SignalReason.LONG_TERM_UPTREND | SignalReason.MED_TERM_UPTREND | SignalReason.DIP_SUPPORT |
+    SignalReason.MA_SUPPORT | SignalReason.REVERSAL_CONFIRMED | SignalReason.MACD_CROSS_UP |
+    SignalReason.MACD_BULLISH | SignalReason.VOLUME_SURGE | SignalReason.BOLLINGER_SQUEEZE |
+    SignalReason.BUY_VETO_OVERBOUGHT | SignalReason.CHASING_PENALTY |
+    SignalReason.FALLING_KNIFE_PENALTY | SignalReason.BUY_VETO_NO_VOLUME
+)
+
+SELL_REASONS = (
+    SignalReason.SELL_VETO_RAGING_BULL | SignalReason.LONG_TERM_DOWNTREND |
+    SignalReason.MED_TERM_DOWNTREND | SignalReason.OVERBOUGHT | SignalReason.AT_RESISTANCE |
+    SignalReason.MACD_BEARISH | SignalReason.SELL_VETO_OVERSOLD |
+    SignalReason.DIP_SUPPORT_PENALTY | SignalReason.PROTECTIVE_VETO
+)
+
+# Text of every rule; '{rsi}' and '{pre_veto}' are filled in when rendered
+REASON_TEXT = {
+    SignalReason.INSUFFICIENT_DATA: "Insufficient data",
+    SignalReason.LONG_TERM_UPTREND: "Long-term uptrend (+30)",
+    SignalReason.MED_TERM_UPTREND: "Med-term uptrend (+10)",
+    SignalReason.DIP_SUPPORT: "KEY: At Dip Support & Pulled Back (+35)",
+    SignalReason.MA_SUPPORT: "MA Support Hit (+5)",
+    SignalReason.REVERSAL_CONFIRMED: "Reversal Confirmed (RSI/Stoch) (+20)",
+    SignalReason.MACD_CROSS_UP: "MACD Cross-up from Negative (+25)",
+    SignalReason.MACD_BULLISH: "MACD bullish (+10)",
+    SignalReason.VOLUME_SURGE: "Volume surge (+10)",
+    SignalReason.BOLLINGER_SQUEEZE: "Bollinger squeeze (+5)",
+    SignalReason.BUY_VETO_OVERBOUGHT: "BUY VETO: Overbought (-100)",
+    SignalReason.CHASING_PENALTY: "Chasing Penalty: Price Over-extended (-45)",
+    SignalReason.FALLING_KNIFE_PENALTY: "Oversold/Falling Knife Penalty (-15)",
+    SignalReason.BUY_VETO_NO_VOLUME: "BUY VETO: Low Confidence ({pre_veto}%) Lacks Volume Confirmation",
+    SignalReason.SELL_VETO_RAGING_BULL: "SELL VETO: Raging Bull Uptrend (0)",
+    SignalReason.LONG_TERM_DOWNTREND: "Long-term downtrend (+50)",
+    SignalReason.MED_TERM_DOWNTREND: "Med-term downtrend (+15)",
+    SignalReason.OVERBOUGHT: "Overbought (RSI {rsi:.1f}) (+40)",
+    SignalReason.AT_RESISTANCE: "At resistance (+25)",
+    SignalReason.MACD_BEARISH: "MACD Bearish/Flat (+15)",
+    SignalReason.SELL_VETO_OVERSOLD: "SELL VETO: Oversold (-100)",
+    SignalReason.DIP_SUPPORT_PENALTY: "At Dip Support Penalty (-25)",
+    SignalReason.PROTECTIVE_VETO: "PROTECTIVE VETO: Strong Bullish Extension (Cap to 40)",
+}
+
+def reason_list(codes, rsi=0.0, pre_veto=0, mask=~SignalReason.NONE):
+    """Render every rule set in `codes` (restricted to `mask`) in firing order"""
+    codes = int(codes) & int(mask)
+    return [text.format(rsi=rsi, pre_veto=pre_veto) for flag, text in REASON_TEXT.items() if codes & flag]
+
+def reason_conditions(codes, rsi=0.0):
+    """The confidence-adding conditions, as in the 4th element of generate_signal's result"""
+    if int(codes) & SignalReason.INSUFFICIENT_DATA:
+        return ["Insufficient data"]
+    buy = [r for r in reason_list(codes, rsi, mask=BUY_REASONS) if "+" in r]
+    sell = [r for r in reason_list(codes, rsi, mask=SELL_REASONS) if "+" in r]
+    return buy + sell
+
+def reason_text(signal, buy_confidence, sell_confidence, codes, rsi=0.0):
+    """The one-line reason string generate_signal returns for a scored bar"""
+    if int(codes) & SignalReason.INSUFFICIENT_DATA:
+        return "Insufficient data"
+
+    if signal == "BUY":
+        return " | ".join(r for r in reason_list(codes, rsi, mask=BUY_REASONS) if "+" in r)
+    if signal == "SELL":
+        return " | ".join(r for r in reason_list(codes, rsi, mask=SELL_REASONS) if "+" in r)
+
+    reason = f"No clear setup (Buy: {buy_confidence}% | Sell: {sell_confidence}%)"
+    if buy_confidence > sell_confidence:
+        reason += " - Bullish bias"
+    elif sell_confidence > buy_confidence:
+        reason += " - Bearish bias"
+    return reason
@@ -0,0 +1,102 @@
+import functools
+from signal_reasons import SignalReason, reason_list, reason_conditions, reason_text
+from indicator_values import LazyIndicatorValues
+
+class SignalResult:
+    """
+    One scored bar: signal, confidences and the SignalReason bitmask of the rules that
+    fired, in fixed slots. No text is built while scoring; reason and conditions are
+    rendered from the bitmask when read, and indicator_values is a view over the values
+    the bar was scored from. Unpacks and indexes like the former 5-tuple
+    (signal, reason, confidence, conditions, indicator_values).
+    """
+    __slots__ = ('signal', 'confidence', 'buy_confidence', 'sell_confidence', 'reason_codes',
+                 'rsi', 'pre_veto_confidence', 'at_dip_support', 'values')
+
+    # indicator_values entries read through from the scored values (name -> source)
+    INDICATORS = {
+        'rsi': 'rsi', 'sma_20': 'sma_20', 'sma_50': 'sma_50', 'sma_5': 'sma_5', 'sma_10': 'sma_10', 'sma_100': 'sma_100',
+        'ema_5': 'ema_5', 'ema_10': 'ema_10', 'ema_20': 'ema_20', 'ema_50': 'ema_50',
+        'macd': 'macd', 'macd_signal': 'macd_signal', 'macd_histogram': 'macd_histogram',
+        'stochastic_k': 'stochastic_k', 'stochastic_d': 'stochastic_d',
+        'bb_upper': 'bb_resistance', 'bb_lower': 'bb_support', 'bb_support': 'bb_support',
+        'bb_resistance': 'bb_resistance', 'bb_squeeze': 'bb_squeeze',
+        'volume_support': 'volume_support', 'volume_resistance': 'volume_resistance', 'poc': 'poc',
+        'atr': 'atr', 'ichimoku': 'ichimoku', 'fib_levels': 'fib_levels'
+    }
+    # Positions of the former tuple layout
+    TUPLE_FIELDS = ('signal', 'reason', 'confidence', 'conditions', 'indicator_values')
+
+    def __init__(self, signal, confidence, buy_confidence=0, sell_confidence=0, reason_codes=0,
+                 rsi=0.0, pre_veto_confidence=0, at_dip_support=False, values=None):
+        self.signal = signal
+        self.confidence = confidence
+        self.buy_confidence = buy_confidence
+        self.sell_confidence = sell_confidence
+        self.reason_codes = reason_codes
+        self.rsi = rsi
+        self.pre_veto_confidence = pre_veto_confidence
+        self.at_dip_support = at_dip_support
+        self.values = values
+
+    @classmethod
+    def insufficient_data(cls):
+        """HOLD for a history shorter than the 100 bars the rules need"""
+        return cls("HOLD", 0, reason_codes=int(SignalReason.INSUFFICIENT_DATA))
+
+    @property
+    def reason(self):
+        """One-line reason, e.g. 'Long-term uptrend (+30) | Volume surge (+10)'"""
+        return reason_text(self.signal, self.buy_confidence, self.sell_confidence, self.reason_codes, self.rsi)
+
+    @property
+    def conditions(self):
+        """The confidence-adding conditions of both sides"""
+        return reason_conditions(self.reason_codes, self.rsi)
+
+    def reasons(self):
+        """Every rule that fired, penalties and vetoes included, in firing order"""
+        return reason_list(self.reason_codes, self.rsi, self.pre_veto_confidence)
+
+    @property
+    def indicator_values(self):
+        """
+        Indicator values plus the scored conditions the trading plan and report read.
+        The conditions follow from the reason bits (each one fires exactly when its
+        condition holds); indicators are read from the scored values on demand.
+        """
+        if self.values is None:
+            return {}
+        values, codes = self.values, self.reason_codes
+
+        def volume_ratio():
+            current_volume, avg_volume = values['current_volume'], values['avg_volume']
+            return (current_volume / avg_volume) if avg_volume > 0 else 1
+
+        loaders = {name: functools.partial(values.__getitem__, source) for name, source in self.INDICATORS.items()}
+        loaders['volume_ratio'] = volume_ratio
+        is_extended = bool(codes & SignalReason.CHASING_PENALTY)
+        return LazyIndicatorValues(loaders, {
+            'macd_bullish': bool(codes & (SignalReason.MACD_CROSS_UP | SignalReason.MACD_BULLISH)),
+            'buy_confidence': self.buy_confidence, 'sell_confidence': self.sell_confidence,
+            'long_term_uptrend': bool(codes & SignalReason.LONG_TERM_UPTREND),
+            'is_at_dip_support': self.at_dip_support,
+            'is_overbought': bool(codes & SignalReason.BUY_VETO_OVERBOUGHT), 'is_extended': is_extended,
+            # Extended already means price above SMA5
+            'is_extended_bullish': is_extended,
+            'volume_surge': bool(codes & SignalReason.VOLUME_SURGE)
+        })
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self.TUPLE_FIELDS)
+
+    def __getitem__(self, position):
+        return getattr(self, self.TUPLE_FIELDS[position])
+
+    def __len__(self):
+        return len(self.TUPLE_FIELDS)
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(signal={self.signal!r}, confidence={self.confidence}, "
+                f"buy={self.buy_confidence}, sell={self.sell_confidence}, "
+                f"reasons={SignalReason(self.reason_codes)!r})")
@@ -0,0 +1,320 @@
+import math
+from collections import deque
+
+NAN = float('nan')
+
+class RollingSum:
+    """Sum of the last `window` values; NaN until the window is full or while it holds a NaN"""
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.nan_count = 0
+        self.updates_since_resum = 0
+
+    def update(self, value):
+        self.values.append(value)
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+
+        # Re-sum once per window so add/subtract rounding error can't build up (amortised O(1))
+        self.updates_since_resum += 1
+        if self.updates_since_resum >= self.window:
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+            self.updates_since_resum = 0
+
+        if self.nan_count == 0 and len(self.values) == self.window:
+            return self.total
+        return NAN
+
+    def mean(self, value):
+        total = self.update(value)
+        return total / self.window if not math.isnan(total) else NAN
+
+
+class RollingExtreme:
+    """Rolling max (or min) over the last `window` values using a monotonic deque"""
+    def __init__(self, window, is_max=True):
+        self.window = window
+        self.is_max = is_max
+        self.items = deque()  # (index, value), values monotonic from the front
+        self.count = 0
+
+    def update(self, value):
+        index = self.count
+        self.count += 1
+        if self.is_max:
+            while self.items and self.items[-1][1] <= value:
+                self.items.pop()
+        else:
+            while self.items and self.items[-1][1] >= value:
+                self.items.pop()
+        self.items.append((index, value))
+        while self.items[0][0] <= index - self.window:
+            self.items.popleft()
+        return self.items[0][1] if self.count >= self.window else NAN
+
+
+class StreamingSMA:
+    """Incremental TechnicalIndicators.calculate_sma"""
+    def __init__(self, window):
+        self.rolling = RollingSum(window)
+        self.value = NAN
+
+    def update(self, close):
+        self.value = self.rolling.mean(close)
+        return self.value
+
+
+class StreamingEMA:
+    """Incremental TechnicalIndicators.calculate_ema (pandas ewm, adjust=False)"""
+    def __init__(self, window):
+        self.alpha = 2.0 / (window + 1)
+        self.value = NAN
+
+    def update(self, close):
+        if math.isnan(self.value):
+            self.value = close
+        else:
+            old_weight = 1.0 - self.alpha
+            self.value = (old_weight * self.value + self.alpha * close) / (old_weight + self.alpha)
+        return self.value
+
+
+class StreamingRSI:
+    """Incremental TechnicalIndicators.calculate_rsi (simple rolling average of gains and losses)"""
+    def __init__(self, window=14):
+        self.window = window
+        self.gains = RollingSum(window)
+        self.losses = RollingSum(window)
+        self.previous_close = None
+        self.count = 0
+        self.value = 50.0
+
+    def update(self, close):
+        delta = NAN if self.previous_close is None else close - self.previous_close
+        self.previous_close = close
+        self.count += 1
+
+        gain = self.gains.mean(delta if delta > 0 else 0.0)
+        loss = self.losses.mean(-delta if delta < 0 else 0.0)
+
+        if self.count < self.window or math.isnan(gain) or math.isnan(loss) or (gain == 0 and loss == 0):
+            self.value = 50.0
+        elif loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - (100 / (1 + gain / loss))
+        return self.value
+
+
+class StreamingMACD:
+    """Incremental TechnicalIndicators.calculate_macd; update returns (macd, signal, histogram)"""
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+
+class StreamingStochastic:
+    """Incremental TechnicalIndicators.calculate_stochastic; update returns (%K, %D)"""
+    def __init__(self, k_period=14, d_period=3):
+        self.k_period = k_period
+        self.highest = RollingExtreme(k_period, is_max=True)
+        self.lowest = RollingExtreme(k_period, is_max=False)
+        self.d = RollingSum(d_period)
+        self.count = 0
+        self.value = (50.0, 50.0)
+
+    def update(self, high, low, close):
+        self.count += 1
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        price_range = highest - lowest
+        if math.isnan(price_range):
+            k = NAN
+        elif price_range == 0:
+            k = NAN if close == lowest else math.copysign(math.inf, close - lowest)
+        else:
+            k = 100 * ((close - lowest) / price_range)
+        d = self.d.mean(k)
+        self.value = (k, d) if self.count >= self.k_period else (50.0, 50.0)
+        return self.value
+
+
+class StreamingATR:
+    """Incremental TechnicalIndicators.calculate_atr (simple average of true range, 0 while warming up)"""
+    def __init__(self, period=14):
+        self.rolling = RollingSum(period)
+        self.previous_close = None
+        self.value = 0
+
+    def update(self, high, low, close):
+        true_range = high - low
+        if self.previous_close is not None:
+            true_range = max(true_range, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.previous_close = close
+        atr = self.rolling.mean(true_range)
+        self.value = 0 if math.isnan(atr) else atr
+        return self.value
+
+
+class StreamingADX:
+    """Incremental TechnicalIndicators.calculate_adx (rolling sums of TR and +/-DM)"""
+    def __init__(self, period=14):
+        self.tr_sum = RollingSum(period)
+        self.plus_dm_sum = RollingSum(period)
+        self.minus_dm_sum = RollingSum(period)
+        self.dx = RollingSum(period)
+        self.previous = None
+        self.value = NAN
+
+    def update(self, high, low, close):
+        if self.previous is None:
+            true_range, plus_dm, minus_dm = NAN, 0.0, 0.0
+        else:
+            previous_high, previous_low, previous_close = self.previous
+            true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+            up_move = high - previous_high
+            down_move = previous_low - low
+            plus_dm = max(up_move, 0) if up_move > down_move else 0.0
+            minus_dm = max(down_move, 0) if down_move > up_move else 0.0
+        self.previous = (high, low, close)
+
+        tr14 = self.tr_sum.update(true_range)
+        plus_dm14 = self.plus_dm_sum.update(plus_dm)
+        minus_dm14 = self.minus_dm_sum.update(minus_dm)
+        plus_di = 100 * (plus_dm14 / tr14) if tr14 else NAN
+        minus_di = 100 * (minus_dm14 / tr14) if tr14 else NAN
+        di_sum = plus_di + minus_di
+        dx = (abs(plus_di - minus_di) / di_sum) * 100 if di_sum else NAN
+        self.value = self.dx.mean(dx)
+        return self.value
+
+
+class StreamingBollinger:
+    """
+    Incremental BollingerBandsCalculator.calculate_bollinger_bands using a rolling
+    Welford mean/variance; update returns (support, resistance, middle).
+    """
+    def __init__(self, window=20, num_std=2):
+        self.window = window
+        self.num_std = num_std
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates_since_resync = 0
+        self.value = (None, None, None)
+
+    def update(self, close):
+        self.values.append(close)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            # Replace `old` with `close` in a full window
+            old_mean = self.mean
+            self.mean += (close - old) / self.window
+            self.m2 += (close - old) * (close - self.mean + old - old_mean)
+        else:
+            delta = close - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (close - self.mean)
+
+        # Recompute from the window once per `window` updates to stop drift (amortised O(1))
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= self.window:
+            self.mean = math.fsum(self.values) / len(self.values)
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in self.values)
+            self.updates_since_resync = 0
+
+        if len(self.values) < self.window:
+            self.value = (None, None, None)
+            return self.value
+
+        std = math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+        upper = self.mean + (std * self.num_std)
+        lower = self.mean - (std * self.num_std)
+
+        if lower and lower > close:
+            lower = close * 0.98
+        if upper and upper < close:
+            upper = close * 1.02
+
+        self.value = (lower, upper, self.mean)
+        return self.value
+
+    @property
+    def squeeze(self):
+        lower, upper, middle = self.value
+        if not all([lower, upper, middle]):
+            return False
+        return (upper - lower) / middle < 0.04
+
+
+class StreamingIchimoku:
+    """Incremental TechnicalIndicators.calculate_ichimoku_cloud; update returns the same dict (None while warming up)"""
+    def __init__(self, tenkan=9, kijun=26, senkou=52, displacement=26):
+        self.tenkan_high = RollingExtreme(tenkan, True)
+        self.tenkan_low = RollingExtreme(tenkan, False)
+        self.kijun_high = RollingExtreme(kijun, True)
+        self.kijun_low = RollingExtreme(kijun, False)
+        self.senkou_high = RollingExtreme(senkou, True)
+        self.senkou_low = RollingExtreme(senkou, False)
+        self.senkou = senkou
+        # Spans are plotted `displacement` bars ahead, so keep the last displacement+1 raw values
+        self.span_a_history = deque([NAN] * (displacement + 1), maxlen=displacement + 1)
+        self.span_b_history = deque([NAN] * (displacement + 1), maxlen=displacement + 1)
+        self.previous_tk = (NAN, NAN)
+        self.count = 0
+        self.value = None
+
+    def update(self, high, low, close):
+        self.count += 1
+        tenkan_sen = (self.tenkan_high.update(high) + self.tenkan_low.update(low)) / 2
+        kijun_sen = (self.kijun_high.update(high) + self.kijun_low.update(low)) / 2
+        self.span_a_history.append((tenkan_sen + kijun_sen) / 2)
+        self.span_b_history.append((self.senkou_high.update(high) + self.senkou_low.update(low)) / 2)
+        previous_tenkan, previous_kijun = self.previous_tk
+        self.previous_tk = (tenkan_sen, kijun_sen)
+
+        if self.count < self.senkou:
+            self.value = None
+            return self.value
+
+        senkou_span_a = self.span_a_history[0]
+        senkou_span_b = self.span_b_history[0]
+        cloud_top = max(senkou_span_a, senkou_span_b)
+        cloud_bottom = min(senkou_span_a, senkou_span_b)
+
+        self.value = {
+            'tenkan_sen': tenkan_sen,
+            'kijun_sen': kijun_sen,
+            'senkou_span_a': senkou_span_a,
+            'senkou_span_b': senkou_span_b,
+            'chikou_span': NAN,
+            'cloud_top': cloud_top,
+            'cloud_bottom': cloud_bottom,
+            'cloud_bullish': senkou_span_a > senkou_span_b,
+            'price_above_cloud': close > cloud_top,
+            'price_below_cloud': close < cloud_bottom,
+            'price_in_cloud': cloud_bottom <= close <= cloud_top,
+            'tk_cross_bullish': tenkan_sen > kijun_sen and previous_tenkan <= previous_kijun,
+            'tk_cross_bearish': tenkan_sen < kijun_sen and previous_tenkan >= previous_kijun,
+            'valid': True
+        }
+        return self.value
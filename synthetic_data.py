@@ -0,0 +1,52 @@
+import zlib
+import numpy as np
+import pandas as pd
+from idx_market import round_to_tick, auto_rejection_limit, MIN_PRICE
+
+def generate_ohlcv(bars=500, start_price=1000, seed=0, end=None, daily_vol=0.02, drift=0.0003):
+    """
+    Seeded IDX-like daily OHLCV: prices sit on the IDX tick grid, every open/high/low/close
+    stays inside the auto-rejection band of the previous close, and volume is traded in
+    100-share lots. Index is the last `bars` business days up to `end` (default today).
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end).normalize()
+    index = pd.bdate_range(end=end, periods=bars)
+
+    returns = rng.normal(drift, daily_vol, bars)
+    gaps = rng.normal(0, daily_vol / 4, bars)
+    wick_up = np.abs(rng.normal(0, daily_vol / 2, bars))
+    wick_down = np.abs(rng.normal(0, daily_vol / 2, bars))
+    lots = np.maximum(np.round(rng.lognormal(10, 0.7, bars)), 1)
+
+    opens = np.empty(bars)
+    highs = np.empty(bars)
+    lows = np.empty(bars)
+    closes = np.empty(bars)
+    previous_close = float(round_to_tick(start_price))
+
+    # Each bar depends on the previous close through the price limits, so this stays a loop
+    for i in range(bars):
+        limit = auto_rejection_limit(previous_close)
+        ceiling = round_to_tick(previous_close * (1 + limit), 'down')
+        floor = max(round_to_tick(previous_close * (1 - limit), 'up'), MIN_PRICE)
+
+        open_price = min(max(round_to_tick(previous_close * (1 + gaps[i])), floor), ceiling)
+        close_price = min(max(round_to_tick(previous_close * (1 + returns[i])), floor), ceiling)
+        high_price = min(round_to_tick(max(open_price, close_price) * (1 + wick_up[i]), 'up'), ceiling)
+        low_price = max(round_to_tick(min(open_price, close_price) * (1 - wick_down[i]), 'down'), floor)
+
+        opens[i], highs[i], lows[i], closes[i] = open_price, high_price, low_price, close_price
+        previous_close = close_price
+
+    return pd.DataFrame({
+        'Open': opens,
+        'High': highs,
+        'Low': lows,
+        'Close': closes,
+        'Volume': lots * 100
+    }, index=index)
+
+def symbol_seed(symbol, seed=0):
+    """Stable per-symbol seed so every ticker gets its own reproducible series"""
+    return (zlib.crc32(symbol.encode()) + seed) % (2 ** 32)
@@ -48,11 +48,8 @@ class TechnicalIndicators:
         return k, d
     
     @staticmethod
-    def calculate_atr(data, period=14):
-        """Calculate Average True Range"""
-        if len(data) < period:
-            return 0
-        
+    def calculate_atr_series(data, period=14):
+        """Average True Range for every bar (NaN until the window is filled)"""
         high = data['High']
         low = data['Low']
         close = data['Close'].shift(1)
@@ -61,8 +58,18 @@ class TechnicalIndicators:
         tr2 = abs(high - close)
         tr3 = abs(low - close)
         tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(period).mean()
+        return tr.rolling(period).mean()
+    
+    @staticmethod
+    def calculate_atr(data, period=14, series=None):
+        """
+        Calculate Average True Range
+        series: calculate_atr_series output already computed for data
+        """
+        if len(data) < period:
+            return 0
         
+        atr = series if series is not None else TechnicalIndicators.calculate_atr_series(data, period)
         return atr.iloc[-1] if not pd.isna(atr.iloc[-1]) else 0
     
     @staticmethod
@@ -86,16 +93,14 @@ class TechnicalIndicators:
         return fib_levels, swing_high, swing_low, total_range
     
     @staticmethod
-    def calculate_ichimoku_cloud(data):
+    def calculate_ichimoku_series(data):
         """
-        Calculate Ichimoku Cloud components
-        Returns: Dictionary with all Ichimoku components
+        Ichimoku Cloud components for every bar
+        Returns: DataFrame with one column per component, indexed like data
         """
-        if len(data) < 52:
-            return None
-        
         high = data['High']
         low = data['Low']
+        close = data['Close']
         
         # Tenkan-sen (Conversion Line): (9-period high + 9-period low)/2
         tenkan_high = high.rolling(window=9).max()
@@ -116,39 +121,44 @@ class TechnicalIndicators:
         senkou_span_b = ((senkou_high + senkou_low) / 2).shift(26)
         
         # Chikou Span (Lagging Span): Close price shifted -26 periods
-        chikou_span = data['Close'].shift(-26)
-        
-        current_price = data['Close'].iloc[-1]
-        
-        # Determine cloud position and signal
-        cloud_top = max(senkou_span_a.iloc[-1], senkou_span_b.iloc[-1])
-        cloud_bottom = min(senkou_span_a.iloc[-1], senkou_span_b.iloc[-1])
-        
-        cloud_bullish = senkou_span_a.iloc[-1] > senkou_span_b.iloc[-1]
-        price_above_cloud = current_price > cloud_top
-        price_below_cloud = current_price < cloud_bottom
-        price_in_cloud = cloud_bottom <= current_price <= cloud_top
-        
-        # TK cross signal
-        tk_cross_bullish = tenkan_sen.iloc[-1] > kijun_sen.iloc[-1] and tenkan_sen.iloc[-2] <= kijun_sen.iloc[-2]
-        tk_cross_bearish = tenkan_sen.iloc[-1] < kijun_sen.iloc[-1] and tenkan_sen.iloc[-2] >= kijun_sen.iloc[-2]
-        
-        return {
-            'tenkan_sen': tenkan_sen.iloc[-1],
-            'kijun_sen': kijun_sen.iloc[-1],
-            'senkou_span_a': senkou_span_a.iloc[-1],
-            'senkou_span_b': senkou_span_b.iloc[-1],
-            'chikou_span': chikou_span.iloc[-1],
+        chikou_span = close.shift(-26)
+        
+        # Cloud edges keep Span A on ties/NaN, like Python max()/min() with Span A first
+        cloud_top = senkou_span_a.where(~(senkou_span_b > senkou_span_a), senkou_span_b)
+        cloud_bottom = senkou_span_a.where(~(senkou_span_b < senkou_span_a), senkou_span_b)
+        
+        return pd.DataFrame({
+            'tenkan_sen': tenkan_sen,
+            'kijun_sen': kijun_sen,
+            'senkou_span_a': senkou_span_a,
+            'senkou_span_b': senkou_span_b,
+            'chikou_span': chikou_span,
             'cloud_top': cloud_top,
             'cloud_bottom': cloud_bottom,
-            'cloud_bullish': cloud_bullish,
-            'price_above_cloud': price_above_cloud,
-            'price_below_cloud': price_below_cloud,
-            'price_in_cloud': price_in_cloud,
-            'tk_cross_bullish': tk_cross_bullish,
-            'tk_cross_bearish': tk_cross_bearish,
-            'valid': True
-        }
+            'cloud_bullish': senkou_span_a > senkou_span_b,
+            'price_above_cloud': close > cloud_top,
+            'price_below_cloud': close < cloud_bottom,
+            'price_in_cloud': (cloud_bottom <= close) & (close <= cloud_top),
+            # TK cross signal
+            'tk_cross_bullish': (tenkan_sen > kijun_sen) & (tenkan_sen.shift(1) <= kijun_sen.shift(1)),
+            'tk_cross_bearish': (tenkan_sen < kijun_sen) & (tenkan_sen.shift(1) >= kijun_sen.shift(1))
+        }, index=data.index)
+    
+    @staticmethod
+    def calculate_ichimoku_cloud(data, series=None):
+        """
+        Calculate Ichimoku Cloud components
+        series: calculate_ichimoku_series output already computed for data
+        Returns: Dictionary with all Ichimoku components at the last bar
+        """
+        if len(data) < 52:
+            return None
+        
+        ichimoku = series if series is not None else TechnicalIndicators.calculate_ichimoku_series(data)
+        
+        values = {name: ichimoku[name].iloc[-1] for name in ichimoku.columns}
+        values['valid'] = True
+        return values
     
     @staticmethod
     def calculate_adx(data, period=14):
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+class TradeLog:
+    """
+    Column buffers for closed trades: one preallocated NumPy array per field, grown by
+    doubling, so metrics work on whole columns instead of a list of dicts.
+    Still reads like the old list of trade dicts (len, iteration, indexing and slicing
+    return dicts) for the report and chart code.
+    """
+    FIELDS = {
+        'entry_date': 'datetime64[ns]',
+        'exit_date': 'datetime64[ns]',
+        'entry_price': float,
+        'exit_price': float,
+        'shares': np.int64,
+        'pnl': float,
+        'pnl_pct': float,
+        'type': object,
+        'exit_reason': object,
+        'hold_days': np.int64,
+        'entry_confidence': np.int64,
+        'entry_signal': object,
+    }
+
+    def __init__(self, extra_fields=None, capacity=64):
+        """extra_fields: {name: dtype} of columns beyond FIELDS (e.g. 'stock' for portfolio trades)"""
+        self.fields = {**self.FIELDS, **(extra_fields or {})}
+        self.columns = {name: self._empty(dtype, capacity) for name, dtype in self.fields.items()}
+        self.size = 0
+        self.tz = None
+
+    @staticmethod
+    def _empty(dtype, capacity):
+        if dtype == float:
+            return np.full(capacity, np.nan)
+        if dtype is object:
+            return np.full(capacity, None, dtype=object)
+        return np.zeros(capacity, dtype=dtype)
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self, capacity):
+        for name, dtype in self.fields.items():
+            column = self._empty(dtype, capacity)
+            column[:self.size] = self.columns[name][:self.size]
+            self.columns[name] = column
+
+    def append(self, **trade):
+        """Add one trade; fields left out stay NaN / None"""
+        if self.size == len(self.columns['pnl']):
+            self._grow(max(2 * self.size, 64))
+        for name in ('entry_date', 'exit_date'):
+            date = pd.Timestamp(trade.pop(name))
+            if self.tz is None:
+                self.tz = date.tz
+            self.columns[name][self.size] = date.value
+        for name, value in trade.items():
+            self.columns[name][self.size] = value
+        self.size += 1
+
+    def column(self, name):
+        """Filled part of column `name` (a view, do not modify)"""
+        if name in ('entry_date', 'exit_date'):
+            return pd.DatetimeIndex(self.columns[name][:self.size]).tz_localize('UTC').tz_convert(self.tz) \
+                if self.tz is not None else pd.DatetimeIndex(self.columns[name][:self.size])
+        return self.columns[name][:self.size]
+
+    def _row(self, i):
+        trade = {}
+        for name in self.fields:
+            value = self.columns[name][i]
+            if name in ('entry_date', 'exit_date'):
+                value = pd.Timestamp(value.astype(np.int64), tz='UTC').tz_convert(self.tz) if self.tz is not None \
+                    else pd.Timestamp(value)
+            elif isinstance(value, np.generic):
+                value = value.item()
+            trade[name] = value
+        return trade
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("trade index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        return (self._row(i) for i in range(self.size))
+
+    def to_frame(self):
+        """One row per trade, one column per field"""
+        return pd.DataFrame({name: self.column(name) for name in self.fields})
+
+    def take(self, order):
+        """New log with the trades at positions `order`"""
+        log = TradeLog(self._extra_fields(), capacity=max(len(order), 1))
+        for name in self.fields:
+            log.columns[name][:len(order)] = self.columns[name][:self.size][order]
+        log.size = len(order)
+        log.tz = self.tz
+        return log
+
+    def sorted_by(self, name):
+        """Stable sort on one column, like sorted(trades, key=lambda trade: trade[name])"""
+        return self.take(np.argsort(self.columns[name][:self.size], kind='stable'))
+
+    def _extra_fields(self):
+        return {name: dtype for name, dtype in self.fields.items() if name not in self.FIELDS}
+
+    @staticmethod
+    def concat(logs):
+        """One log with every trade of logs, in order (columns are the union of theirs)"""
+        fields = {}
+        for log in logs:
+            fields.update(log._extra_fields())
+        total = sum(len(log) for log in logs)
+        result = TradeLog(fields, capacity=max(total, 1))
+        for log in logs:
+            for name in log.fields:
+                result.columns[name][result.size:result.size + len(log)] = log.columns[name][:len(log)]
+            result.size += len(log)
+            result.tz = result.tz or log.tz
+        return result
+
+    @staticmethod
+    def from_records(trades):
+        """TradeLog from a list of trade dicts (fields outside FIELDS become object columns)"""
+        if isinstance(trades, TradeLog):
+            return trades
+        extra = {name: object for trade in trades for name in trade if name not in TradeLog.FIELDS}
+        log = TradeLog(extra, capacity=max(len(trades), 1))
+        for trade in trades:
+            log.append(**trade)
+        return log
+
+
+def trade_frame(trades):
+    """DataFrame of a TradeLog or a list of trade dicts"""
+    return trades.to_frame() if isinstance(trades, TradeLog) else pd.DataFrame(trades)
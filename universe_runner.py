@@ -0,0 +1,170 @@
+import io
+import os
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from data_fetcher import DataFetcher
+from data_providers import provider_from_spec
+from ohlcv_cache import OHLCVCache
+from signal_generator import SignalGenerator
+from profiler import Profiler, default_profiler
+from signal_reasons import reason_text
+
+def analyze_stock(stock_code, data):
+    """
+    fetch-free part of the main2.py pipeline for one ticker: validate, signal and
+    (for BUY) trading plan. Returns a compact result record; anything the steps
+    print is kept in record['log'] so the parent can show it under the right ticker.
+    """
+    record = {'stock': stock_code, 'error': None, 'trading_plan': None, 'data_info': None}
+    log = io.StringIO()
+    stage = default_profiler.measure
+    try:
+        with contextlib.redirect_stdout(log):
+            with stage('stage', 'validate'):
+                DataFetcher.validate_data(data, stock_code)
+                record['data_info'] = DataFetcher.get_data_info(data)
+                record['data_info'].pop('columns')
+
+            signal_gen = SignalGenerator()
+            with stage('stage', 'signal'):
+                result = signal_gen.generate_signal_live(data)
+            current_price = data['Close'].iloc[-1]
+            if "BUY" in result.signal:
+                with stage('stage', 'plan'):
+                    record['trading_plan'] = signal_gen.generate_trading_plan(result.signal, current_price,
+                                                                              result.indicator_values)
+
+        record.update({
+            'current_price': float(current_price),
+            'signal': result.signal,
+            'confidence': result.confidence,
+            # Reason bits instead of text; main2.py renders the ones it displays (record_reason)
+            'buy_confidence': result.buy_confidence,
+            'sell_confidence': result.sell_confidence,
+            'reason_codes': result.reason_codes,
+            'rsi': result.rsi,
+        })
+    except Exception as e:
+        record['error'] = str(e)
+    record['log'] = log.getvalue()
+    return record
+
+def record_reason(record):
+    """Reason text of an analyze_stock record"""
+    return reason_text(record['signal'], record['buy_confidence'], record['sell_confidence'],
+                       record['reason_codes'], record['rsi'])
+
+def analyze_chunk(stock_codes, period="2y", provider_spec=None, cache_dir='data_cache', profile=False):
+    """
+    Worker task: one batched fetch for a chunk of tickers, then analyze each of them.
+    Returns (records, profile): profile is the chunk's Profiler.to_dict() figures with
+    profile (fetch included, even when the fetch failed), else None.
+    """
+    if profile:
+        default_profiler.reset()
+        default_profiler.enable()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log), default_profiler.measure('stage', 'fetch'):
+            provider = provider_from_spec(provider_spec)
+            cache = OHLCVCache(cache_dir) if cache_dir else None
+            universe_data, fetch_errors = DataFetcher.fetch_many(stock_codes, period, cache=cache, provider=provider)
+    except Exception as e:
+        universe_data, fetch_errors = {}, {code: str(e) for code in stock_codes}
+
+    records = []
+    for stock_code in stock_codes:
+        if stock_code in universe_data:
+            records.append(analyze_stock(stock_code, universe_data[stock_code]))
+        else:
+            records.append({'stock': stock_code, 'error': fetch_errors.get(stock_code, 'unknown error'),
+                            'trading_plan': None, 'log': ''})
+    # Fetch warnings belong to the chunk; hand them to its first ticker
+    if records:
+        records[0]['log'] = log.getvalue() + records[0]['log']
+    snapshot = None
+    if profile:
+        default_profiler.disable()
+        snapshot = default_profiler.to_dict()
+    return records, snapshot
+
+
+class UniverseRunner:
+    """
+    Runs the main2.py analysis for a whole universe on a ProcessPoolExecutor.
+    Tickers are split into chunks (one batched download per chunk); workers send
+    back compact records and a failing ticker or chunk never stalls the others.
+    With profile, every worker profiles its chunks and the figures are summed in
+    self.profiler.
+    """
+    # Fewest tickers per batched download (see _chunk_size)
+    MIN_CHUNK_SIZE = 8
+
+    def __init__(self, max_workers=None, period="2y", provider_spec=None, cache_dir='data_cache', chunk_size=None,
+                 profile=False):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.period = period
+        self.provider_spec = provider_spec
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self.profile = profile
+        self.profiler = Profiler() if profile else None
+
+    def _chunk_size(self, stock_count):
+        if self.chunk_size:
+            return self.chunk_size
+        # A few chunks per worker keeps the pool balanced, capped at the fetcher's batch size.
+        # The MIN_CHUNK_SIZE floor keeps each download batched: a small universe then uses
+        # fewer workers than the pool has, trading analysis parallelism for fewer requests
+        balanced = -(-stock_count // (self.max_workers * 4))
+        return max(1, min(50, max(self.MIN_CHUNK_SIZE, balanced)))
+
+    def run(self, stock_list, on_result=None):
+        """
+        Analyze every ticker; returns the records in stock_list order.
+        on_result(record) is called in the parent as each record arrives.
+        """
+        chunks = list(DataFetcher._chunks(list(stock_list), self._chunk_size(len(stock_list))))
+        records = {}
+        arguments = (self.period, self.provider_spec, self.cache_dir, self.profile)
+
+        if self.max_workers == 1:
+            for chunk in chunks:
+                chunk_records, snapshot = analyze_chunk(chunk, *arguments)
+                self._collect_profile(snapshot)
+                for record in chunk_records:
+                    records[record['stock']] = record
+                    if on_result:
+                        on_result(record)
+            return [records[stock_code] for stock_code in stock_list]
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(analyze_chunk, chunk, *arguments): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_records, snapshot = future.result()
+                except Exception as e:  # Worker crashed (e.g. killed); report the whole chunk as failed
+                    chunk_records = [{'stock': stock_code, 'error': f"Worker failed: {e}", 'trading_plan': None, 'log': ''}
+                                     for stock_code in futures[future]]
+                    snapshot = None
+                self._collect_profile(snapshot)
+                for record in chunk_records:
+                    records[record['stock']] = record
+                    if on_result:
+                        on_result(record)
+
+        return [records[stock_code] for stock_code in stock_list]
+
+    def _collect_profile(self, snapshot):
+        if snapshot and self.profiler is not None:
+            self.profiler.merge(snapshot)
+
+    @staticmethod
+    def summarize(records):
+        """Successful records split into the BUY / SELL / HOLD lists main2.py prints"""
+        results = [r for r in records if r['error'] is None]
+        return {
+            'BUY': [r for r in results if "BUY" in r['signal']],
+            'SELL': [r for r in results if "SELL" in r['signal']],
+            'HOLD': [r for r in results if r['signal'] == "HOLD"],
+        }
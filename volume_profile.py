@@ -1,5 +1,8 @@
+import math
+from collections import deque
 import pandas as pd
 import numpy as np
+from idx_market import tick_index, tick_price
 
 class VolumeProfileCalculator:
     @staticmethod
@@ -10,69 +13,191 @@ class VolumeProfileCalculator:
         """
         if len(data) < period:
             period = len(data)
-        
+
         recent_data = data.tail(period)
-        current_price = recent_data['Close'].iloc[-1]
-        
+        return VolumeProfileCalculator.calculate_volume_profile_arrays(
+            recent_data['High'].to_numpy(dtype=float),
+            recent_data['Low'].to_numpy(dtype=float),
+            recent_data['Volume'].to_numpy(dtype=float),
+            recent_data['Close'].iloc[-1],
+            price_bins
+        )
+
+    @staticmethod
+    def calculate_volume_profile_arrays(highs, lows, volumes, current_price, price_bins=10):
+        """calculate_volume_profile on plain arrays of one window's candles"""
         # Calculate price range
-        range_high = recent_data['High'].max()
-        range_low = recent_data['Low'].min()
+        if np.isnan(highs).all() or np.isnan(lows).all():
+            return None, None, None
+        range_high = np.nanmax(highs)
+        range_low = np.nanmin(lows)
         price_range = range_high - range_low
-        
+
         if price_range == 0:
             return None, None, None
-        
+
         # Create price bins
         bin_size = price_range / price_bins
-        volume_profile = {}
-        
-        # Calculate volume at each price level
-        for i in range(len(recent_data)):
-            high = recent_data['High'].iloc[i]
-            low = recent_data['Low'].iloc[i]
-            volume = recent_data['Volume'].iloc[i]
-            
-            # Skip if invalid data
-            if pd.isna(high) or pd.isna(low) or pd.isna(volume):
-                continue
-            
-            # Determine which bins this candle touches
-            low_bin = int((low - range_low) / bin_size)
-            high_bin = int((high - range_low) / bin_size)
-            
-            # Ensure we have valid bins
-            low_bin = max(0, low_bin)
-            high_bin = min(price_bins - 1, high_bin)
-            
-            bins_touched = max(high_bin - low_bin + 1, 1)
-            volume_per_bin = volume / bins_touched
-            
-            for bin_idx in range(low_bin, high_bin + 1):
-                price_level = range_low + (bin_idx * bin_size) + (bin_size / 2)
-                price_level = round(price_level, 2)
-                
-                if price_level not in volume_profile:
-                    volume_profile[price_level] = 0
-                volume_profile[price_level] += volume_per_bin
-        
-        if not volume_profile:
+        bin_levels = np.round(range_low + (np.arange(price_bins) * bin_size) + (bin_size / 2), 2)
+
+        # Skip candles with invalid data
+        valid = ~(np.isnan(highs) | np.isnan(lows) | np.isnan(volumes))
+        highs, lows, volumes = highs[valid], lows[valid], volumes[valid]
+
+        # Determine which bins each candle touches
+        low_bins = np.maximum(((lows - range_low) / bin_size).astype(np.int64), 0)
+        high_bins = np.minimum(((highs - range_low) / bin_size).astype(np.int64), price_bins - 1)
+        bins_touched = np.maximum(high_bins - low_bins + 1, 1)
+        volume_per_bin = volumes / bins_touched
+
+        # Expand to one (candle, bin) pair per touched bin, in candle-then-bin order
+        counts = np.maximum(high_bins - low_bins + 1, 0)
+        total = counts.sum()
+        if total == 0:
             return None, None, None
-        
+        candles = np.repeat(np.arange(len(counts)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_bins = low_bins[candles] + offsets
+
+        # Bins whose rounded price levels coincide share one bucket, like the dict keys did
+        levels, level_of_bin = np.unique(bin_levels, return_inverse=True)
+        pair_levels = level_of_bin[pair_bins]
+
+        # Sequential np.add.at keeps the per-candle accumulation order of the old loop
+        volume_profile = np.zeros(len(levels))
+        np.add.at(volume_profile, pair_levels, volume_per_bin[candles])
+
+        # Levels in the order they were first touched (breaks volume ties the same way as max() on a dict)
+        first_touch = np.full(len(levels), total)
+        np.minimum.at(first_touch, pair_levels, np.arange(total))
+        touched = np.flatnonzero(first_touch < total)
+        touched = touched[np.argsort(first_touch[touched], kind='stable')]
+        touched_levels = levels[touched]
+        touched_volume = volume_profile[touched]
+
         # Find Point of Control (highest volume)
-        poc_level = max(volume_profile, key=volume_profile.get)
-        
-        # Find support and resistance
-        support_candidates = {}
-        resistance_candidates = {}
-        
-        for price, volume in volume_profile.items():
-            if price < current_price:
-                support_candidates[price] = volume
-            elif price > current_price:
-                resistance_candidates[price] = volume
-        
+        poc_level = touched_levels[np.argmax(touched_volume)]
+
         # Get highest volume levels for support and resistance
-        support = max(support_candidates, key=support_candidates.get) if support_candidates else None
-        resistance = max(resistance_candidates, key=resistance_candidates.get) if resistance_candidates else None
-        
-        return support, resistance, poc_level
\ No newline at end of file
+        below = touched_levels < current_price
+        above = touched_levels > current_price
+        support = touched_levels[below][np.argmax(touched_volume[below])] if below.any() else None
+        resistance = touched_levels[above][np.argmax(touched_volume[above])] if above.any() else None
+
+        return support, resistance, poc_level
+
+    @staticmethod
+    def calculate_volume_profile_series(data, period=20, ticks_per_bin=1):
+        """
+        Rolling volume profile for every bar in one pass (see RollingVolumeProfile).
+        Unlike calculate_volume_profile the bins sit on a fixed IDX tick grid, so the
+        levels are stable from bar to bar. Returns a DataFrame with volume_support,
+        volume_resistance and poc columns (NaN where no level qualifies).
+        """
+        highs = data['High'].to_numpy(dtype=float)
+        lows = data['Low'].to_numpy(dtype=float)
+        closes = data['Close'].to_numpy(dtype=float)
+        volumes = data['Volume'].to_numpy(dtype=float)
+
+        profile = RollingVolumeProfile(period, ticks_per_bin)
+        levels = np.full((len(data), 3), np.nan)
+        for i in range(len(data)):
+            support, resistance, poc = profile.update(highs[i], lows[i], closes[i], volumes[i])
+            levels[i] = [np.nan if value is None else value for value in (support, resistance, poc)]
+
+        return pd.DataFrame(levels, index=data.index, columns=['volume_support', 'volume_resistance', 'poc'])
+
+
+class RollingVolumeProfile:
+    """
+    Volume profile over the last `period` candles on a stable price grid built from
+    IDX tick sizes (`ticks_per_bin` ticks per bin). Each update adds the newest
+    candle's volume and evicts the candle that left the window, so a full history
+    costs one pass instead of rebuilding the profile at every bar. Bins are anchored
+    to the absolute IDX grid (tick_index // ticks_per_bin) and the profile grows as
+    prices reach new bins, so a bar's levels never depend on later candles.
+    """
+    def __init__(self, period=20, ticks_per_bin=1, rebuild_every=250):
+        self.ticks_per_bin = ticks_per_bin
+        self.first_bin = 0          # Absolute bin of profile[0]
+        self.profile = np.zeros(0)
+        self.bin_prices = np.zeros(0)
+
+        self.period = period
+        self.rebuild_every = rebuild_every
+        self.window = deque(maxlen=period)  # (low_bin, high_bin, volume_per_bin) of candles in the window
+        self.updates_since_rebuild = 0
+
+    def _bin_range(self, high, low):
+        """Absolute bins a candle spans; a candle between two grid levels lands on the level above"""
+        low_level = math.ceil(tick_index(low))
+        high_level = max(math.floor(tick_index(high)), low_level)
+        return low_level // self.ticks_per_bin, high_level // self.ticks_per_bin
+
+    def _extend(self, low_bin, high_bin):
+        """Grow the profile to cover absolute bins low_bin..high_bin"""
+        if len(self.profile) == 0:
+            first, last = low_bin, high_bin
+        else:
+            first = min(self.first_bin, low_bin)
+            last = max(self.first_bin + len(self.profile) - 1, high_bin)
+        if first == self.first_bin and last - first + 1 == len(self.profile):
+            return
+        profile = np.zeros(last - first + 1)
+        profile[self.first_bin - first:self.first_bin - first + len(self.profile)] = self.profile
+        # Bin price = midpoint of the grid levels it groups
+        bins = np.arange(first, last + 1)
+        self.bin_prices = (tick_price(bins * self.ticks_per_bin) +
+                           tick_price(bins * self.ticks_per_bin + self.ticks_per_bin - 1)) / 2
+        self.profile = profile
+        self.first_bin = first
+
+    def update(self, high, low, close, volume):
+        """Add one candle (evicting the oldest if the window is full); returns (support, resistance, poc)"""
+        # The deque drops the oldest candle on append; take it first to subtract its volume
+        evicted = self.window[0] if len(self.window) == self.period else None
+        if not (np.isnan(high) or np.isnan(low) or np.isnan(volume)):
+            low_bin, high_bin = self._bin_range(high, low)
+            self._extend(low_bin, high_bin)
+            volume_per_bin = volume / (high_bin - low_bin + 1)
+            self.profile[low_bin - self.first_bin:high_bin - self.first_bin + 1] += volume_per_bin
+            self.window.append((low_bin, high_bin, volume_per_bin))
+        else:
+            self.window.append(None)
+
+        if evicted is not None:
+            low_bin, high_bin, volume_per_bin = evicted
+            self.profile[low_bin - self.first_bin:high_bin - self.first_bin + 1] -= volume_per_bin
+
+        # Rebuild from the window now and then so add/subtract rounding can't accumulate
+        self.updates_since_rebuild += 1
+        if self.updates_since_rebuild >= self.rebuild_every:
+            self._rebuild()
+
+        return self.levels(close)
+
+    def _rebuild(self):
+        self.profile[:] = 0
+        for candle in self.window:
+            if candle is not None:
+                low_bin, high_bin, volume_per_bin = candle
+                self.profile[low_bin - self.first_bin:high_bin - self.first_bin + 1] += volume_per_bin
+        self.updates_since_rebuild = 0
+
+    def levels(self, current_price):
+        """Highest-volume bin below price (support), above price (resistance) and overall (POC)"""
+        # Bins emptied by eviction can keep a rounding residue; treat those as untouched
+        if len(self.profile) == 0:
+            return None, None, None
+        traded = self.profile > self.profile.max() * 1e-9
+        if not traded.any():
+            return None, None, None
+
+        volume = np.where(traded, self.profile, -1.0)
+        poc = self.bin_prices[np.argmax(volume)]
+
+        below = traded & (self.bin_prices < current_price)
+        above = traded & (self.bin_prices > current_price)
+        support = self.bin_prices[np.argmax(np.where(below, volume, -1.0))] if below.any() else None
+        resistance = self.bin_prices[np.argmax(np.where(above, volume, -1.0))] if above.any() else None
+        return support, resistance, poc
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from backtester import Backtester
+from parameter_sweep import ParameterSweep
+from trade_log import TradeLog
+
+def _window(data, signals, start, end):
+    """Bars start..end-1 ready for simulate_fixed_exits(start_index=1): bar start trades on the signal of start-1"""
+    return data.iloc[start - 1:end], {name: values[start - 1:end] for name, values in signals.items()}
+
+def optimize_fold(data, signals, grid, sort_by, initial_capital):
+    """
+    Worker task: simulate every configuration of grid on one train window (all side by
+    side, see Backtester.simulate_fixed_exits) and return (best config, its metrics)
+    """
+    backtester = Backtester(initial_capital)
+    columns = [[config[name] for config in grid] for name in ParameterSweep.PARAMETERS]
+    results = backtester.simulate_fixed_exits(data, signals, *columns, start_index=1)
+
+    best_config, best_performance, best_score = grid[0], {}, None
+    for config, (trades, _) in zip(grid, results):
+        performance = backtester.calculate_performance(trades)
+        score = performance.get(sort_by)
+        if score is not None and (best_score is None or score > best_score):
+            best_config, best_performance, best_score = config, performance, score
+    return best_config, best_performance
+
+
+class WalkForward:
+    """
+    Out-of-sample walk-forward test on top of Backtester. Each ticker's history is split
+    into rolling train/test windows; the grid is optimized on every train window in a
+    process pool and the chosen configuration is traded on the following test window.
+    Test windows run in order with the capital left by the previous one, and their trades
+    are stitched into one equity curve. Signals are computed once per ticker and sliced
+    for every fold. Positions still open at the end of a test window are closed there.
+    """
+    def __init__(self, train_bars=250, test_bars=60, step_bars=None, max_workers=None,
+                 sort_by='total_return_pct', backtester=None):
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step_bars = step_bars or test_bars
+        # Test windows are stitched into one capital path, so they must not overlap
+        if self.step_bars < test_bars:
+            raise ValueError(f"step_bars ({self.step_bars}) must be at least test_bars ({test_bars})")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.sort_by = sort_by
+        self.backtester = backtester or Backtester()
+
+    def folds(self, n, start_index=100):
+        """(train_start, test_start, test_end) bar positions of every fold for an n-bar history"""
+        folds = []
+        train_start = start_index
+        while train_start + self.train_bars < n:
+            test_start = train_start + self.train_bars
+            folds.append((train_start, test_start, min(test_start + self.test_bars, n)))
+            train_start += self.step_bars
+        return folds
+
+    def run(self, universe, grid):
+        """
+        Walk-forward every ticker of a DataFrame or {ticker: DataFrame} universe over grid
+        (see ParameterSweep.build_grid). Returns {ticker: result} where result holds
+        'folds' (one row per fold: windows, chosen parameters, train and test metrics),
+        'trades' (stitched test TradeLog), 'equity' (equity_curve over the test span) and
+        'performance' (calculate_performance of the stitched trades with risk metrics).
+        """
+        if isinstance(universe, pd.DataFrame):
+            universe = {'': universe}
+
+        prepared = {}
+        for stock_code, data in universe.items():
+            # One signal pass per ticker, shared by all of its folds
+            signals = self.backtester.signal_generator.generate_signals(data)
+            prepared[stock_code] = (data, signals, self.folds(len(data)))
+
+        tasks = [(stock_code, k, _window(data, signals, train_start, test_start))
+                 for stock_code, (data, signals, folds) in prepared.items()
+                 for k, (train_start, test_start, _) in enumerate(folds)]
+        arguments = (grid, self.sort_by, self.backtester.initial_capital)
+
+        optimized = {}
+        if self.max_workers == 1:
+            for stock_code, k, (data, signals) in tasks:
+                optimized[stock_code, k] = optimize_fold(data, signals, *arguments)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {(stock_code, k): executor.submit(optimize_fold, data, signals, *arguments)
+                           for stock_code, k, (data, signals) in tasks}
+                optimized = {key: future.result() for key, future in futures.items()}
+
+        return {stock_code: self._test(stock_code, data, signals, folds, optimized)
+                for stock_code, (data, signals, folds) in prepared.items()}
+
+    def _test(self, stock_code, data, signals, folds, optimized):
+        """Trade each fold's chosen configuration on its test window, carrying capital forward"""
+        capital = self.backtester.initial_capital
+        logs = []
+        rows = []
+        for k, (train_start, test_start, test_end) in enumerate(folds):
+            config, train_performance = optimized[stock_code, k]
+            test_data, test_signals = _window(data, signals, test_start, test_end)
+            fold_backtester = Backtester(capital)
+            trades, capital = fold_backtester.simulate_fixed_exits(
+                test_data, test_signals, *[config[name] for name in ParameterSweep.PARAMETERS], start_index=1)[0]
+            logs.append(trades)
+            test_performance = fold_backtester.calculate_performance(trades)
+            rows.append({
+                'train_start': data.index[train_start],
+                'test_start': data.index[test_start],
+                'test_end': data.index[test_end - 1],
+                **config,
+                f'train_{self.sort_by}': train_performance.get(self.sort_by),
+                'test_trades': test_performance.get('total_trades', 0),
+                f'test_{self.sort_by}': test_performance.get(self.sort_by, 0),
+                'capital': capital
+            })
+
+        trades = TradeLog.concat(logs)
+        test_span = data.iloc[folds[0][1]:folds[-1][2]] if folds else data.iloc[:0]
+        equity = self.backtester.equity_curve(test_span, trades)
+        return {
+            'folds': pd.DataFrame(rows),
+            'trades': trades,
+            'equity': equity,
+            'performance': self.backtester.calculate_performance(trades, equity)
+        }